@@ -1,4 +1,14 @@
-from . import users, students, faculty, courses, enrollments
-
-__all__ = ["users", "students", "faculty", "courses", "enrollments"]
+from . import admin, users, students, faculty, courses, enrollments, search, metrics
+from . import waitlist
 
+__all__ = [
+    "admin",
+    "users",
+    "students",
+    "faculty",
+    "courses",
+    "enrollments",
+    "search",
+    "metrics",
+    "waitlist",
+]
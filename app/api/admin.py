@@ -0,0 +1,106 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core import profiler
+from app.core.security import admin_required, principal_cache
+from app.crud.catalog import catalog_cache
+from app.db.database import pool_status
+from app.db.slow_query import slow_query_log
+
+router = APIRouter(
+    prefix="/admin", tags=["Admin"], dependencies=[Depends(admin_required)]
+)
+
+
+@router.get("/db/pool")
+def read_pool_status():
+    """Connection pool occupancy and checkout wait times (admin only)."""
+    return pool_status()
+
+
+@router.get("/db/slow-queries")
+def read_slow_queries():
+    """Slowest statements above the threshold, slowest first (admin only)."""
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "entries": slow_query_log.entries(),
+    }
+
+
+@router.delete("/db/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries():
+    slow_query_log.clear()
+
+
+@router.get("/cache")
+def read_cache_stats():
+    """Hit/miss counters of the in-process caches (admin only)."""
+    return {
+        "principals": principal_cache.stats(),
+        "catalog": catalog_cache.stats(),
+    }
+
+
+@router.post("/profile", response_class=Response)
+async def profile_worker(
+    request: Request,
+    seconds: Optional[float] = Query(
+        None,
+        gt=0,
+        le=profiler.MAX_PROFILE_SECONDS,
+        description="Profile for this many seconds",
+    ),
+    route: Optional[str] = Query(
+        None, description="Route template to profile, e.g. /courses/{course_id}"
+    ),
+    requests: Optional[int] = Query(
+        None, ge=1, le=10_000, description="Requests to ``route`` to profile"
+    ),
+    timeout: float = Query(
+        30.0,
+        gt=0,
+        le=profiler.MAX_PROFILE_SECONDS,
+        description="Longest wait for ``requests`` to arrive",
+    ),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Sampling interval"),
+):
+    """
+    Sample this worker's stacks for ``seconds``, or while the next ``requests``
+    requests to ``route`` run, and return them as collapsed stacks for
+    flamegraph tools (admin only). One session runs at a time.
+    """
+    if (seconds is None) == (route is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass either seconds or route (with requests)",
+        )
+    if route is not None:
+        templates = {getattr(r, "path_format", None) for r in request.app.routes}
+        if route not in templates:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Route not found"
+            )
+    try:
+        session = profiler.start_session(
+            interval_ms / 1000, route=route, requests=requests or 1
+        )
+    except profiler.ProfilerBusy as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    try:
+        if seconds is not None:
+            await asyncio.sleep(seconds)
+        else:
+            await run_in_threadpool(session.done.wait, timeout)
+    finally:
+        await run_in_threadpool(profiler.stop_session, session)
+    return Response(
+        session.collapsed(),
+        media_type="text/plain",
+        headers={
+            "X-Profile-Samples": str(session.samples),
+            "X-Profile-Requests": str(session.requests_seen),
+        },
+    )
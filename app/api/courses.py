@@ -1,20 +1,39 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.orm import Session
 
 from app import schemas, models
-from app.core.security import admin_required
+from app.core.http_cache import (
+    ConditionalRequest,
+    collection_version_stmt,
+    conditional_request,
+)
+from app.core.pagination import paginate, paginate_async
+from app.core.responses import FastJSONResponse
+from app.core.security import (
+    admin_required,
+    admin_required_async,
+    get_current_user,
+    get_current_user_async,
+)
 from app.crud import course as course_crud
-from app.db.database import get_db
+from app.crud import enrollment as enrollment_crud
+from app.crud import faculty as faculty_crud
+from app.crud import waitlist as waitlist_crud
+from app.db.database import get_async_db, get_db
+from app.db.search import SearchMode
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
+# Async twins of the routes, mounted ahead of ``router`` when ASYNC_DB is on.
+async_router = APIRouter(prefix="/courses", tags=["Courses"], include_in_schema=False)
 
 
 @router.post("/", response_model=schemas.CourseRead)
 def create_course(course: schemas.CourseCreate, db: Session = Depends(get_db)):
-    faculty = db.get(models.Faculty, course.faculty_id)
-    if faculty is None:
+    if not faculty_crud.faculty_exists(db, course.faculty_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
         )
@@ -24,31 +43,57 @@ def create_course(course: schemas.CourseCreate, db: Session = Depends(get_db)):
 @router.get("/", response_model=schemas.CourseList)
 def read_courses(
     skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
     name: Optional[str] = Query(None, description="Filter by course name (partial match)"),
     credits: Optional[int] = Query(None, description="Filter by credit count"),
     faculty_id: Optional[int] = Query(None, description="Filter by faculty ID"),
+    match: SearchMode = Query(
+        SearchMode.contains, description="Match the name anywhere or as a prefix"
+    ),
+    cache: ConditionalRequest = Depends(conditional_request),
     db: Session = Depends(get_db),
 ):
-    query = db.query(models.Course)
-    if name:
-        query = query.filter(models.Course.name.ilike(f"%{name}%"))
-    if credits is not None:
-        query = query.filter(models.Course.credits == credits)
-    if faculty_id is not None:
-        query = query.filter(models.Course.faculty_id == faculty_id)
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+    query = course_crud.courses_query(name, credits, faculty_id, match)
+    fingerprint = db.execute(
+        collection_version_stmt(query, models.Course.id, models.Course.version)
+    ).one()
+    not_modified = cache.check(*fingerprint)
+    if not_modified is not None:
+        return not_modified
+    page = paginate(
+        db,
+        query,
+        models.Course.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=course_crud.COURSE_READ_COLUMNS,
+    )
+    return cache.apply(FastJSONResponse(page))
 
 
 @router.get("/{course_id}", response_model=schemas.CourseRead)
-def read_course_by_id(course_id: int, db: Session = Depends(get_db)):
-    course = course_crud.get_course(db, course_id)
+def read_course_by_id(
+    course_id: int,
+    cache: ConditionalRequest = Depends(conditional_request),
+    db: Session = Depends(get_db),
+):
+    course = course_crud.get_course_cached(db, course_id)
     if course is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
         )
+    not_modified = cache.check(course["version"])
+    if not_modified is not None:
+        return not_modified
     return course
 
 
@@ -61,12 +106,53 @@ def update_course(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
         )
-    faculty = db.get(models.Faculty, course.faculty_id)
-    if faculty is None:
+    if not faculty_crud.faculty_exists(db, course.faculty_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
         )
-    return course_crud.update_course(db, db_course, course)
+    try:
+        db_course = course_crud.update_course(db, db_course, course)
+    except StaleDataError:
+        # An enrollment or another edit changed the course since it was read.
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Course was modified concurrently; retry the update",
+        )
+    # A raised capacity opens seats for the waitlist.
+    if waitlist_crud.fill_open_seats(db, course_id):
+        db.refresh(db_course)
+    return db_course
+
+
+@router.put("/{course_id}/grades", response_model=schemas.GradeBatchResult)
+def assign_course_grades(
+    course_id: int,
+    batch: schemas.GradeBatch,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Grade many enrollments of a course at once, in one transaction.
+
+    Each item names an ``enrollment_id`` or a ``student_id``. Items that match
+    no enrollment in this course do not fail the batch; each gets its own
+    status in ``results``.
+    """
+    if current_user.role not in ("admin", "faculty"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only faculty or admin can assign grades.",
+        )
+    if not course_crud.course_exists(db, course_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    results = enrollment_crud.assign_grades(db, course_id, batch.items)
+    updated = sum(
+        1 for r in results if r["status"] == schemas.GradeEntryStatus.updated
+    )
+    return {"updated": updated, "results": results}
 
 
 @router.delete(
@@ -83,3 +169,133 @@ def delete_course(course_id: int, db: Session = Depends(get_db)):
     course_crud.delete_course(db, db_course)
 
 
+@async_router.post("/", response_model=schemas.CourseRead)
+async def create_course_async(
+    course: schemas.CourseCreate, db: AsyncSession = Depends(get_async_db)
+):
+    if not await faculty_crud.faculty_exists_async(db, course.faculty_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
+        )
+    return await course_crud.create_course_async(db, course)
+
+
+@async_router.get("/", response_model=schemas.CourseList)
+async def read_courses_async(
+    skip: int = 0,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
+    name: Optional[str] = Query(None),
+    credits: Optional[int] = Query(None),
+    faculty_id: Optional[int] = Query(None),
+    match: SearchMode = Query(SearchMode.contains),
+    cache: ConditionalRequest = Depends(conditional_request),
+    db: AsyncSession = Depends(get_async_db),
+):
+    query = course_crud.courses_query(name, credits, faculty_id, match)
+    version_stmt = collection_version_stmt(
+        query, models.Course.id, models.Course.version
+    )
+    fingerprint = (await db.execute(version_stmt)).one()
+    not_modified = cache.check(*fingerprint)
+    if not_modified is not None:
+        return not_modified
+    page = await paginate_async(
+        db,
+        query,
+        models.Course.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=course_crud.COURSE_READ_COLUMNS,
+    )
+    return cache.apply(FastJSONResponse(page))
+
+
+@async_router.get("/{course_id}", response_model=schemas.CourseRead)
+async def read_course_by_id_async(
+    course_id: int,
+    cache: ConditionalRequest = Depends(conditional_request),
+    db: AsyncSession = Depends(get_async_db),
+):
+    course = await course_crud.get_course_cached_async(db, course_id)
+    if course is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    not_modified = cache.check(course["version"])
+    if not_modified is not None:
+        return not_modified
+    return course
+
+
+@async_router.put("/{course_id}", response_model=schemas.CourseRead)
+async def update_course_async(
+    course_id: int,
+    course: schemas.CourseCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    db_course = await course_crud.get_course_async(db, course_id)
+    if db_course is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    if not await faculty_crud.faculty_exists_async(db, course.faculty_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
+        )
+    try:
+        db_course = await course_crud.update_course_async(db, db_course, course)
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Course was modified concurrently; retry the update",
+        )
+    if await waitlist_crud.fill_open_seats_async(db, course_id):
+        await db.refresh(db_course)
+    return db_course
+
+
+@async_router.put("/{course_id}/grades", response_model=schemas.GradeBatchResult)
+async def assign_course_grades_async(
+    course_id: int,
+    batch: schemas.GradeBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    if current_user.role not in ("admin", "faculty"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only faculty or admin can assign grades.",
+        )
+    if not await course_crud.course_exists_async(db, course_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    results = await enrollment_crud.assign_grades_async(db, course_id, batch.items)
+    updated = sum(
+        1 for r in results if r["status"] == schemas.GradeEntryStatus.updated
+    )
+    return {"updated": updated, "results": results}
+
+
+@async_router.delete(
+    "/{course_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admin_required_async)],
+)
+async def delete_course_async(course_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_course = await course_crud.get_course_async(db, course_id)
+    if db_course is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    await course_crud.delete_course_async(db, db_course)
@@ -1,51 +1,141 @@
-from typing import List
+from enum import Enum
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.core.security import admin_required, get_current_user
+from app.core.admission import enrollment_admission
+from app.core.export import stream_csv, stream_ndjson
+from app.core.pagination import paginate, paginate_async
+from app.core.responses import FastJSONResponse
+from app.core.security import (
+    admin_required,
+    admin_required_async,
+    get_current_user,
+    get_current_user_async,
+)
+from app.crud import course as course_crud
 from app.crud import enrollment as enrollment_crud
-from app.db.database import get_db
+from app.crud import waitlist as waitlist_crud
+from app.db.database import get_async_db, get_db
+from app.db.group_commit import run_write, run_write_async
 
 router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
+# Async twins of the routes, mounted ahead of ``router`` when ASYNC_DB is on.
+async_router = APIRouter(
+    prefix="/enrollments", tags=["Enrollments"], include_in_schema=False
+)
 
 
-@router.post("/", response_model=schemas.EnrollmentRead)
+@router.post(
+    "/",
+    response_model=schemas.EnrollmentRead,
+    dependencies=[Depends(enrollment_admission)],
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": schemas.WaitlistRead,
+            "description": "Course full; the student was put on its waitlist",
+        }
+    },
+)
 def create_enrollment(
-    enrollment: schemas.EnrollmentCreate, db: Session = Depends(get_db)
+    enrollment: schemas.EnrollmentCreate,
+    waitlist: bool = Query(
+        False, description="Join the course's waitlist instead of failing when full"
+    ),
+    db: Session = Depends(get_db),
 ):
     student = db.get(models.Student, enrollment.student_id)
     if student is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Student not found"
         )
-    course = db.get(models.Course, enrollment.course_id)
-    if course is None:
+    if not course_crud.course_exists(db, enrollment.course_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
         )
-    exists = enrollment_crud.get_existing_enrollment(
-        db, enrollment.student_id, enrollment.course_id
+    already_enrolled = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Student is already enrolled in this course",
     )
-    if exists:
+    try:
+        return run_write(db, enrollment_crud.create_enrollment, enrollment)
+    except IntegrityError:
+        raise already_enrolled
+    except enrollment_crud.CourseFullError:
+        if not waitlist:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Course is full"
+            )
+    if enrollment_crud.get_existing_enrollment(
+        db, enrollment.student_id, enrollment.course_id
+    ):
+        raise already_enrolled
+    try:
+        entry = waitlist_crud.join_waitlist(db, enrollment)
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail="Student is already enrolled in this course",
+            detail="Student is already on the waitlist for this course",
         )
-    return enrollment_crud.create_enrollment(db, enrollment)
+    if isinstance(entry, models.Enrollment):
+        # A seat was freed after the claim above failed.
+        return entry
+    return FastJSONResponse(
+        schemas.WaitlistRead.model_validate(entry).model_dump(),
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=schemas.EnrollmentBulkResult,
+    dependencies=[Depends(enrollment_admission)],
+)
+def create_enrollments_bulk(
+    payload: schemas.EnrollmentBulkCreate, db: Session = Depends(get_db)
+):
+    """
+    Enroll many (student_id, course_id) pairs in one transaction.
+
+    Invalid or duplicate rows do not fail the batch; each item gets its own
+    status in ``results``.
+    """
+    results = enrollment_crud.bulk_create_enrollments(db, payload.items)
+    created = sum(
+        1 for r in results if r["status"] == schemas.BulkEnrollmentStatus.created
+    )
+    return {"created": created, "results": results}
 
 
 @router.get("/", response_model=schemas.EnrollmentList)
 def read_enrollments(
     skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
     db: Session = Depends(get_db),
 ):
-    query = db.query(models.Enrollment)
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+    page = paginate(
+        db,
+        enrollment_crud.enrollments_query(),
+        models.Enrollment.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=enrollment_crud.ENROLLMENT_READ_COLUMNS,
+    )
+    return FastJSONResponse(page)
 
 
 @router.get("/{enrollment_id}", response_model=schemas.EnrollmentRead)
@@ -84,7 +174,7 @@ def update_enrollment_grade(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found"
         )
-    return enrollment_crud.update_grade(db, db_enrollment, grade)
+    return run_write(db, enrollment_crud.update_grade, db_enrollment, grade)
 
 
 @router.delete(
@@ -101,15 +191,35 @@ def delete_enrollment(enrollment_id: int, db: Session = Depends(get_db)):
     enrollment_crud.delete_enrollment(db, db_enrollment)
 
 
+class ReportFormat(str, Enum):
+    json = "json"
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+GRADE_REPORT_FIELDS = (
+    "student_id",
+    "student_name",
+    "student_email",
+    "course_id",
+    "course_name",
+    "grade",
+)
+
+
 @router.get("/reports/course/{course_id}/grades")
 def course_grades_report(
     course_id: int,
+    report_format: ReportFormat = Query(ReportFormat.json, alias="format"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     """
     List all students with their grades for a given course.
     Restricted to faculty and admin roles.
+
+    ``format=csv`` or ``format=ndjson`` streams the rows instead of building
+    a single JSON document, so memory stays flat for any section size.
     """
     if current_user.role not in ("admin", "faculty"):
         raise HTTPException(
@@ -117,10 +227,27 @@ def course_grades_report(
             detail="Only faculty or admin can view course grade reports.",
         )
 
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    course = course_crud.get_course_cached(db, course_id)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
 
+    if report_format is not ReportFormat.json:
+        course_fields = {"course_id": course["id"], "course_name": course["name"]}
+        rows = (
+            {**row._mapping, **course_fields}
+            for row in enrollment_crud.iter_course_grades(db, course_id)
+        )
+        if report_format is ReportFormat.csv:
+            body, media_type = stream_csv(rows, GRADE_REPORT_FIELDS), "text/csv"
+        else:
+            body, media_type = stream_ndjson(rows), "application/x-ndjson"
+        filename = f"course_{course_id}_grades.{report_format.value}"
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
     enrollments = (
         db.query(models.Enrollment, models.Student)
         .join(models.Student, models.Student.id == models.Enrollment.student_id)
@@ -133,17 +260,168 @@ def course_grades_report(
             "student_id": student.id,
             "student_name": student.name,
             "student_email": student.email,
-            "course_id": course.id,
-            "course_name": course.name,
+            "course_id": course["id"],
+            "course_name": course["name"],
             "grade": enrollment.grade,
         }
         for enrollment, student in enrollments
     ]
 
     return {
-        "course_id": course.id,
-        "course_name": course.name,
+        "course_id": course["id"],
+        "course_name": course["name"],
         "total_students": len(records),
         "records": records,
     }
 
+
+@async_router.post(
+    "/",
+    response_model=schemas.EnrollmentRead,
+    dependencies=[Depends(enrollment_admission)],
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": schemas.WaitlistRead,
+            "description": "Course full; the student was put on its waitlist",
+        }
+    },
+)
+async def create_enrollment_async(
+    enrollment: schemas.EnrollmentCreate,
+    waitlist: bool = Query(
+        False, description="Join the course's waitlist instead of failing when full"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    student = await db.get(models.Student, enrollment.student_id)
+    if student is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Student not found"
+        )
+    if not await course_crud.course_exists_async(db, enrollment.course_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    already_enrolled = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Student is already enrolled in this course",
+    )
+    try:
+        return await run_write_async(
+            db, enrollment_crud.create_enrollment, enrollment
+        )
+    except IntegrityError:
+        raise already_enrolled
+    except enrollment_crud.CourseFullError:
+        if not waitlist:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Course is full"
+            )
+    if await enrollment_crud.get_existing_enrollment_async(
+        db, enrollment.student_id, enrollment.course_id
+    ):
+        raise already_enrolled
+    try:
+        entry = await waitlist_crud.join_waitlist_async(db, enrollment)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Student is already on the waitlist for this course",
+        )
+    if isinstance(entry, models.Enrollment):
+        return entry
+    return FastJSONResponse(
+        schemas.WaitlistRead.model_validate(entry).model_dump(),
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@async_router.post(
+    "/bulk",
+    response_model=schemas.EnrollmentBulkResult,
+    dependencies=[Depends(enrollment_admission)],
+)
+async def create_enrollments_bulk_async(
+    payload: schemas.EnrollmentBulkCreate, db: AsyncSession = Depends(get_async_db)
+):
+    results = await enrollment_crud.bulk_create_enrollments_async(db, payload.items)
+    created = sum(
+        1 for r in results if r["status"] == schemas.BulkEnrollmentStatus.created
+    )
+    return {"created": created, "results": results}
+
+
+@async_router.get("/", response_model=schemas.EnrollmentList)
+async def read_enrollments_async(
+    skip: int = 0,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    page = await paginate_async(
+        db,
+        enrollment_crud.enrollments_query(),
+        models.Enrollment.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=enrollment_crud.ENROLLMENT_READ_COLUMNS,
+    )
+    return FastJSONResponse(page)
+
+
+@async_router.get("/{enrollment_id}", response_model=schemas.EnrollmentRead)
+async def read_enrollment_by_id_async(
+    enrollment_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    enrollment = await enrollment_crud.get_enrollment_async(db, enrollment_id)
+    if enrollment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found"
+        )
+    return enrollment
+
+
+@async_router.put("/{enrollment_id}/grade", response_model=schemas.EnrollmentRead)
+async def update_enrollment_grade_async(
+    enrollment_id: int,
+    grade: schemas.GradeAssign,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    if current_user.role not in ("admin", "faculty"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only faculty or admin can assign grades.",
+        )
+    db_enrollment = await enrollment_crud.get_enrollment_async(db, enrollment_id)
+    if db_enrollment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found"
+        )
+    return await run_write_async(
+        db, enrollment_crud.update_grade, db_enrollment, grade
+    )
+
+
+@async_router.delete(
+    "/{enrollment_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admin_required_async)],
+)
+async def delete_enrollment_async(
+    enrollment_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    db_enrollment = await enrollment_crud.get_enrollment_async(db, enrollment_id)
+    if db_enrollment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found"
+        )
+    await enrollment_crud.delete_enrollment_async(db, db_enrollment)
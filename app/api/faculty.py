@@ -1,14 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import schemas
 from app.models.faculty import Faculty
-from app.core.security import admin_required
+from app.core.http_cache import (
+    ConditionalRequest,
+    collection_version_stmt,
+    conditional_request,
+)
+from app.core.pagination import paginate, paginate_async
+from app.core.responses import FastJSONResponse
+from app.core.security import admin_required, admin_required_async
 from app.crud import faculty as faculty_crud
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.db.search import SearchMode
 
 router = APIRouter(prefix="/faculty", tags=["Faculty"])
+# Async twins of the routes, mounted ahead of ``router`` when ASYNC_DB is on.
+async_router = APIRouter(prefix="/faculty", tags=["Faculty"], include_in_schema=False)
 
 
 @router.post("/", response_model=schemas.FacultyRead)
@@ -19,28 +31,56 @@ def create_faculty(faculty: schemas.FacultyCreate, db: Session = Depends(get_db)
 @router.get("/", response_model=schemas.FacultyList)
 def read_faculty(
     skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
     name: Optional[str] = Query(None, description="Filter by name (partial match)"),
     email: Optional[str] = Query(None, description="Filter by email (partial match)"),
+    match: SearchMode = Query(
+        SearchMode.contains, description="Match name/email anywhere or as a prefix"
+    ),
+    cache: ConditionalRequest = Depends(conditional_request),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Faculty)
-    if name:
-        query = query.filter(Faculty.name.ilike(f"%{name}%"))
-    if email:
-        query = query.filter(Faculty.email.ilike(f"%{email}%"))
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+    query = faculty_crud.faculty_query(name, email, match)
+    fingerprint = db.execute(
+        collection_version_stmt(query, Faculty.id, Faculty.version)
+    ).one()
+    not_modified = cache.check(*fingerprint)
+    if not_modified is not None:
+        return not_modified
+    page = paginate(
+        db,
+        query,
+        Faculty.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=faculty_crud.FACULTY_READ_COLUMNS,
+    )
+    return cache.apply(FastJSONResponse(page))
 
 
 @router.get("/{faculty_id}", response_model=schemas.FacultyRead)
-def read_faculty_by_id(faculty_id: int, db: Session = Depends(get_db)):
-    faculty = faculty_crud.get_faculty(db, faculty_id)
+def read_faculty_by_id(
+    faculty_id: int,
+    cache: ConditionalRequest = Depends(conditional_request),
+    db: Session = Depends(get_db),
+):
+    faculty = faculty_crud.get_faculty_cached(db, faculty_id)
     if faculty is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
         )
+    not_modified = cache.check(faculty["version"])
+    if not_modified is not None:
+        return not_modified
     return faculty
 
 
@@ -53,7 +93,15 @@ def update_faculty(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
         )
-    return faculty_crud.update_faculty(db, db_faculty, faculty)
+    try:
+        return faculty_crud.update_faculty(db, db_faculty, faculty)
+    except StaleDataError:
+        # Another edit (or a delete) changed the row since it was read.
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Faculty was modified concurrently; retry the update",
+        )
 
 
 @router.delete(
@@ -69,3 +117,100 @@ def delete_faculty(faculty_id: int, db: Session = Depends(get_db)):
         )
     faculty_crud.delete_faculty(db, db_faculty)
 
+
+@async_router.post("/", response_model=schemas.FacultyRead)
+async def create_faculty_async(
+    faculty: schemas.FacultyCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await faculty_crud.create_faculty_async(db, faculty)
+
+
+@async_router.get("/", response_model=schemas.FacultyList)
+async def read_faculty_async(
+    skip: int = 0,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
+    name: Optional[str] = Query(None),
+    email: Optional[str] = Query(None),
+    match: SearchMode = Query(SearchMode.contains),
+    cache: ConditionalRequest = Depends(conditional_request),
+    db: AsyncSession = Depends(get_async_db),
+):
+    query = faculty_crud.faculty_query(name, email, match)
+    fingerprint = (
+        await db.execute(collection_version_stmt(query, Faculty.id, Faculty.version))
+    ).one()
+    not_modified = cache.check(*fingerprint)
+    if not_modified is not None:
+        return not_modified
+    page = await paginate_async(
+        db,
+        query,
+        Faculty.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=faculty_crud.FACULTY_READ_COLUMNS,
+    )
+    return cache.apply(FastJSONResponse(page))
+
+
+@async_router.get("/{faculty_id}", response_model=schemas.FacultyRead)
+async def read_faculty_by_id_async(
+    faculty_id: int,
+    cache: ConditionalRequest = Depends(conditional_request),
+    db: AsyncSession = Depends(get_async_db),
+):
+    faculty = await faculty_crud.get_faculty_cached_async(db, faculty_id)
+    if faculty is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
+        )
+    not_modified = cache.check(faculty["version"])
+    if not_modified is not None:
+        return not_modified
+    return faculty
+
+
+@async_router.put("/{faculty_id}", response_model=schemas.FacultyRead)
+async def update_faculty_async(
+    faculty_id: int,
+    faculty: schemas.FacultyCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    db_faculty = await faculty_crud.get_faculty_async(db, faculty_id)
+    if db_faculty is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
+        )
+    try:
+        return await faculty_crud.update_faculty_async(db, db_faculty, faculty)
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Faculty was modified concurrently; retry the update",
+        )
+
+
+@async_router.delete(
+    "/{faculty_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admin_required_async)],
+)
+async def delete_faculty_async(
+    faculty_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    db_faculty = await faculty_crud.get_faculty_async(db, faculty_id)
+    if db_faculty is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found"
+        )
+    await faculty_crud.delete_faculty_async(db, db_faculty)
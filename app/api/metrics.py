@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Response
+
+from app.core.admission import enrollment_writes
+from app.core.metrics import render_metrics, sample_lines
+from app.core.security import principal_cache
+from app.crud.catalog import catalog_cache
+from app.db import group_commit
+from app.db.database import pool_status
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_lines() -> list[list[str]]:
+    stats = pool_status()
+    if "checked_out" not in stats:
+        return []
+    return [
+        sample_lines(
+            "db_pool_checked_out",
+            "Connections currently checked out of the pool.",
+            "gauge",
+            [({}, stats["checked_out"])],
+        ),
+        sample_lines(
+            "db_pool_overflow",
+            "Connections open beyond pool_size.",
+            "gauge",
+            [({}, stats["overflow"])],
+        ),
+        sample_lines(
+            "db_pool_checkout_timeouts_total",
+            "Checkouts that gave up after pool_timeout.",
+            "counter",
+            [({}, stats["timeouts"])],
+        ),
+        sample_lines(
+            "db_pool_checkout_wait_seconds_total",
+            "Time spent waiting for a pooled connection.",
+            "counter",
+            [({}, stats["total_wait_ms"] / 1000)],
+        ),
+    ]
+
+
+def _cache_lines() -> list[list[str]]:
+    caches = {"principals": principal_cache, "catalog": catalog_cache}
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    return [
+        sample_lines(
+            f"cache_{field}_total",
+            f"Cache lookups that were {field}.",
+            "counter",
+            [({"cache": name}, values[field]) for name, values in stats.items()],
+        )
+        for field in ("hits", "misses")
+    ]
+
+
+def _admission_lines() -> list[list[str]]:
+    stats = enrollment_writes.stats()
+    gauges = {
+        "active": "Enrollment writes holding a slot.",
+        "queued": "Enrollment writes waiting for a slot.",
+    }
+    counters = {
+        "admitted": "Enrollment writes given a slot.",
+        "rejected": "Enrollment writes refused because the queue was full.",
+        "timed_out": "Enrollment writes refused after waiting too long.",
+    }
+    return [
+        *(
+            sample_lines(f"admission_{field}", doc, "gauge", [({}, stats[field])])
+            for field, doc in gauges.items()
+        ),
+        *(
+            sample_lines(
+                f"admission_{field}_total", doc, "counter", [({}, stats[field])]
+            )
+            for field, doc in counters.items()
+        ),
+    ]
+
+
+def _group_commit_lines() -> list[list[str]]:
+    stats = group_commit.writer.stats()
+    return [
+        sample_lines(
+            "group_commit_batches_total",
+            "Transactions committed by the group-commit writer.",
+            "counter",
+            [({}, stats["batches"])],
+        ),
+        sample_lines(
+            "group_commit_operations_total",
+            "Writes applied by the group-commit writer.",
+            "counter",
+            [({}, stats["operations"])],
+        ),
+    ]
+
+
+@router.get("/metrics", response_class=Response)
+def read_metrics():
+    """Request, database pool, cache and admission metrics in Prometheus format."""
+    body = render_metrics(
+        [
+            *_pool_lines(),
+            *_cache_lines(),
+            *_admission_lines(),
+            *_group_commit_lines(),
+        ]
+    )
+    return Response(body, media_type=PROMETHEUS_CONTENT_TYPE)
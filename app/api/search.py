@@ -0,0 +1,42 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.db.database import get_db
+from app.db.search import SearchMode, ranked_search
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def search_params(
+    q: str = Query(..., min_length=1, description="Text to look for in name/email"),
+    match: SearchMode = Query(SearchMode.contains),
+    limit: int = Query(20, ge=1, le=100),
+) -> dict:
+    return {"term": q, "mode": match, "limit": limit}
+
+
+@router.get("/students", response_model=List[schemas.StudentRead])
+def search_students(
+    params: dict = Depends(search_params), db: Session = Depends(get_db)
+):
+    """Students matching ``q``, most relevant first."""
+    return ranked_search(db, models.Student, **params)
+
+
+@router.get("/faculty", response_model=List[schemas.FacultyRead])
+def search_faculty(
+    params: dict = Depends(search_params), db: Session = Depends(get_db)
+):
+    """Faculty matching ``q``, most relevant first."""
+    return ranked_search(db, models.Faculty, **params)
+
+
+@router.get("/courses", response_model=List[schemas.CourseRead])
+def search_courses(
+    params: dict = Depends(search_params), db: Session = Depends(get_db)
+):
+    """Courses whose name matches ``q``, most relevant first."""
+    return ranked_search(db, models.Course, **params)
@@ -1,44 +1,67 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import models, schemas
+from app import schemas
 from app.models.student import Student
-from app.core.security import admin_required
+from app.core.pagination import paginate, paginate_async
+from app.core.responses import FastJSONResponse
+from app.core.security import admin_required, admin_required_async
+from app.crud import enrollment as enrollment_crud
 from app.crud import student as student_crud
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.db.group_commit import run_write, run_write_async
+from app.db.search import SearchMode
 
 router = APIRouter(prefix="/students", tags=["Students"])
+# Async twins of the routes, mounted ahead of ``router`` when ASYNC_DB is on.
+async_router = APIRouter(
+    prefix="/students", tags=["Students"], include_in_schema=False
+)
 
 
 @router.post(
     "/", response_model=schemas.StudentRead, status_code=status.HTTP_201_CREATED
 )
 def create_student(student: schemas.StudentCreate, db: Session = Depends(get_db)):
-    return student_crud.create_student(db, student)
+    return run_write(db, student_crud.create_student, student)
 
 
 @router.get("/", response_model=schemas.StudentList)
 def read_students(
     skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
     name: Optional[str] = Query(
         None, description="Filter by name (partial match)"
     ),
     email: Optional[str] = Query(
         None, description="Filter by email (partial match)"
     ),
+    match: SearchMode = Query(
+        SearchMode.contains, description="Match name/email anywhere or as a prefix"
+    ),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Student)
-    if name:
-        query = query.filter(Student.name.ilike(f"%{name}%"))
-    if email:
-        query = query.filter(Student.email.ilike(f"%{email}%"))
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+    page = paginate(
+        db,
+        student_crud.students_query(name, email, match),
+        Student.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=student_crud.STUDENT_READ_COLUMNS,
+    )
+    return FastJSONResponse(page)
 
 
 @router.get("/{student_id}", response_model=schemas.StudentRead)
@@ -79,19 +102,84 @@ def delete_student(student_id: int, db: Session = Depends(get_db)):
 
 @router.get("/{student_id}/grades/")
 def get_student_grades(student_id: int, db: Session = Depends(get_db)):
-    enrollments = (
-        db.query(models.Enrollment)
-        .filter(models.Enrollment.student_id == student_id)
-        .all()
+    return enrollment_crud.get_student_grades(db, student_id)
+
+
+@async_router.post(
+    "/", response_model=schemas.StudentRead, status_code=status.HTTP_201_CREATED
+)
+async def create_student_async(
+    student: schemas.StudentCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await run_write_async(db, student_crud.create_student, student)
+
+
+@async_router.get("/", response_model=schemas.StudentList)
+async def read_students_async(
+    skip: int = 0,
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous page's next_cursor"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the exact total (default: only for offset pages)",
+    ),
+    name: Optional[str] = Query(None),
+    email: Optional[str] = Query(None),
+    match: SearchMode = Query(SearchMode.contains),
+    db: AsyncSession = Depends(get_async_db),
+):
+    page = await paginate_async(
+        db,
+        student_crud.students_query(name, email, match),
+        Student.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        columns=student_crud.STUDENT_READ_COLUMNS,
     )
-    return [
-        {
-            "course_id": e.course_id,
-            "course_name": (
-                db.get(models.Course, e.course_id).name if e.course_id else None
-            ),
-            "grade": e.grade,
-        }
-        for e in enrollments
-    ]
+    return FastJSONResponse(page)
+
+
+@async_router.get("/{student_id}", response_model=schemas.StudentRead)
+async def read_student_async(
+    student_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    student = await student_crud.get_student_async(db, student_id)
+    if student is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Student not found"
+        )
+    return student
+
+
+@async_router.put("/{student_id}", response_model=schemas.StudentRead)
+async def update_student_async(
+    student_id: int,
+    student: schemas.StudentCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    db_student = await student_crud.get_student_async(db, student_id)
+    if db_student is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Student not found"
+        )
+    return await student_crud.update_student_async(db, db_student, student)
+
 
+@async_router.delete(
+    "/{student_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admin_required_async)],
+)
+async def delete_student_async(
+    student_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    db_student = await student_crud.get_student_async(db, student_id)
+    if db_student is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Student not found"
+        )
+    await student_crud.delete_student_async(db, db_student)
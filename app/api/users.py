@@ -2,6 +2,7 @@ from datetime import timedelta
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -11,8 +12,9 @@ from app.core.security import (
     admin_required,
     create_access_token,
     get_current_user,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    invalidate_principal,
+    verify_password_async,
 )
 from app.crud import user as user_crud
 from app.db.database import get_db
@@ -22,31 +24,35 @@ auth_router = APIRouter(tags=["Auth"])
 
 
 @router.post("/", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user (admin, faculty, or student).
     """
-    if user_crud.get_user_by_username_or_email(db, user.username, user.email):
+    if await run_in_threadpool(
+        user_crud.get_user_by_username_or_email, db, user.username, user.email
+    ):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username or email already exists.",
         )
-    hashed_pw = get_password_hash(user.password)
-    return user_crud.create_user(db, user, hashed_pw)
+    hashed_pw = await get_password_hash_async(user.password)
+    return await run_in_threadpool(user_crud.create_user, db, user, hashed_pw)
 
 
 @auth_router.post("/token")
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
     """
     User login (returns JWT access token).
     """
-    user = user_crud.get_user_by_username_or_email(db, username=form_data.username)
+    user = await run_in_threadpool(
+        user_crud.get_user_by_username_or_email, db, form_data.username
+    )
     if (
         not user
         or not user.is_active
-        or not verify_password(form_data.password, user.password_hash)
+        or not await verify_password_async(form_data.password, user.password_hash)
     ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -96,7 +102,7 @@ def update_user_role(
 
 
 @router.post("/{user_id}/change-password")
-def change_password(
+async def change_password(
     user_id: int,
     data: schemas.PasswordChangeRequest,
     db: Session = Depends(get_db),
@@ -106,7 +112,7 @@ def change_password(
     Change your password (requires old password).
     Admin can change any user's password.
     """
-    user = user_crud.get_user(db, user_id)
+    user = await run_in_threadpool(user_crud.get_user, db, user_id)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -118,13 +124,13 @@ def change_password(
             detail="Forbidden: you can't change this user's password.",
         )
     if current_user.role != "admin":
-        if not verify_password(data.old_password, user.password_hash):
+        if not await verify_password_async(data.old_password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Old password is incorrect.",
             )
-    new_hashed = get_password_hash(data.new_password)
-    user_crud.set_password(db, user, new_hashed)
+    new_hashed = await get_password_hash_async(data.new_password)
+    await run_in_threadpool(user_crud.set_password, db, user, new_hashed)
     return {"detail": "Password changed successfully."}
 
 
@@ -146,6 +152,8 @@ def update_user_profile(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not allowed to update profile",
         )
+    # Cached principals are keyed by username, which this may change.
+    old_username = user.username
     if user_update.email and user_update.email != user.email:
         if db.query(models.User).filter(models.User.email == user_update.email).first():
             raise HTTPException(
@@ -163,7 +171,7 @@ def update_user_profile(
             )
         user.username = user_update.username
     db.commit()
-    db.refresh(user)
+    invalidate_principal(old_username)
     return user
 
 
@@ -202,6 +210,6 @@ def enable_user(user_id: int, db: Session = Depends(get_db)):
         )
     user.is_active = True
     db.commit()
-    db.refresh(user)
+    invalidate_principal(user.username)
     return user
 
@@ -0,0 +1,41 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.core.security import admin_required
+from app.crud import course as course_crud
+from app.crud import waitlist as waitlist_crud
+from app.db.database import get_db
+
+router = APIRouter(prefix="/waitlist", tags=["Waitlist"])
+
+
+@router.get("/course/{course_id}", response_model=List[schemas.WaitlistRead])
+def read_course_waitlist(
+    course_id: int,
+    skip: int = 0,
+    limit: int = Query(50, le=500),
+    db: Session = Depends(get_db),
+):
+    """The course's waitlist in promotion order, head first."""
+    if not course_crud.course_exists(db, course_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    return waitlist_crud.list_waitlist(db, course_id, skip=skip, limit=limit)
+
+
+@router.delete(
+    "/{entry_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admin_required)],
+)
+def leave_waitlist(entry_id: int, db: Session = Depends(get_db)):
+    db_entry = waitlist_crud.get_entry(db, entry_id)
+    if db_entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Waitlist entry not found"
+        )
+    waitlist_crud.leave_waitlist(db, db_entry)
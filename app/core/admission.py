@@ -0,0 +1,163 @@
+"""
+Admission control for write bursts such as registration opening.
+
+At most ``writers`` requests hold a slot at once. Up to ``queue_size`` more
+wait for one, no more than ``per_user`` of them for the same caller, and
+freed slots go to callers in round-robin order so a client retrying in a
+loop cannot starve everyone else. Requests beyond that, or still waiting
+after ``timeout`` seconds, get a 429 whose Retry-After is estimated from the
+backlog and recent service times.
+
+All state is touched from the event loop only, so it needs no locks.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+# Weight of the newest sample in the moving average of slot hold times.
+SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionController:
+    def __init__(self, writers: int, queue_size: int, per_user: int, timeout: float):
+        self.writers = writers
+        self.queue_size = queue_size
+        self.per_user = per_user
+        self.timeout = timeout
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.service_time = 0.05
+        # Caller key -> its waiters, in the order callers get served.
+        self._waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+        backlog = self.active + self.queued + 1
+        return max(1, math.ceil(backlog * self.service_time / self.writers))
+
+    def _saturated(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many registration requests in progress, retry shortly.",
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+    async def acquire(self, key: str) -> None:
+        if self.active < self.writers and not self.queued:
+            self.active += 1
+            self.admitted += 1
+            return
+        waiters = self._waiting.get(key)
+        if self.queued >= self.queue_size or (
+            waiters is not None and len(waiters) >= self.per_user
+        ):
+            self.rejected += 1
+            raise self._saturated()
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(key, deque()).append(future)
+        self.queued += 1
+        try:
+            done, _ = await asyncio.wait((future,), timeout=self.timeout)
+        except asyncio.CancelledError:
+            # The client went away while queued.
+            self._abandon(key, future)
+            raise
+        if not done:
+            self._abandon(key, future)
+            self.timed_out += 1
+            raise self._saturated()
+        self.admitted += 1
+
+    def _abandon(self, key: str, future: asyncio.Future) -> None:
+        if future.done():
+            # A slot was handed over just as we gave up; pass it on.
+            self._release_slot()
+            return
+        future.cancel()
+        waiters = self._waiting[key]
+        waiters.remove(future)
+        if not waiters:
+            del self._waiting[key]
+        self.queued -= 1
+
+    def release(self, held_seconds: float) -> None:
+        self.service_time += SERVICE_TIME_ALPHA * (held_seconds - self.service_time)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        if not self._waiting:
+            self.active -= 1
+            return
+        # Serve the caller at the front, then send it to the back of the line.
+        key, waiters = next(iter(self._waiting.items()))
+        future = waiters.popleft()
+        if waiters:
+            self._waiting.move_to_end(key)
+        else:
+            del self._waiting[key]
+        self.queued -= 1
+        future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, key: str):
+        await self.acquire(key)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        return {
+            "writers": self.writers,
+            "active": self.active,
+            "queued": self.queued,
+            "queued_callers": len(self._waiting),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "service_time_ms": round(self.service_time * 1000, 3),
+        }
+
+
+def caller_key(request: Request) -> str:
+    """The token subject when a valid bearer token is sent, else the client IP."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+        except JWTError:
+            payload = {}
+        if payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else '-'}"
+
+
+enrollment_writes = AdmissionController(
+    writers=settings.ENROLLMENT_WRITERS,
+    queue_size=settings.ENROLLMENT_QUEUE_SIZE,
+    per_user=settings.ENROLLMENT_QUEUE_PER_USER,
+    timeout=settings.ENROLLMENT_QUEUE_TIMEOUT_SECONDS,
+)
+
+
+async def enrollment_admission(request: Request):
+    """Dependency holding an enrollment write slot for the whole request."""
+    if not settings.ENROLLMENT_ADMISSION_ENABLED:
+        yield
+        return
+    async with enrollment_writes.slot(caller_key(request)):
+        yield
@@ -6,6 +6,70 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Serve the student, faculty, course and enrollment routes (reads and
+    # writes) from async handlers on an AsyncEngine.
+    ASYNC_DB: bool = False
+    # Defaults to DATABASE_URL with its driver swapped (aiosqlite / asyncpg).
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool (ignored for in-memory SQLite, which keeps one connection).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+
+    # PRAGMAs applied to every new SQLite connection.
+    SQLITE_TUNED: bool = True
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB, so ~64 MB
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Authenticated users cached by token subject; 0 disables the cache.
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    # Read-through cache of course/faculty rows. "redis" shares it across
+    # workers (needs the redis package and CATALOG_CACHE_REDIS_URL).
+    CATALOG_CACHE_BACKEND: str = "memory"
+    CATALOG_CACHE_REDIS_URL: str | None = None
+    CATALOG_CACHE_SIZE: int = 4096
+    CATALOG_CACHE_TTL_SECONDS: float = 300.0
+
+    # bcrypt runs on its own threads (it releases the GIL); once workers plus
+    # queue are full, login/registration answer 503 instead of piling up.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    # Probe the bcrypt backend at startup instead of on the first login.
+    PASSWORD_HASH_WARMUP: bool = False
+
+    # Admission control for POST /enrollments/ and /enrollments/bulk: this
+    # many run at once, the rest queue (fairly across callers) up to the
+    # limits below and are refused with 429 + Retry-After beyond them.
+    # Callers are told apart by token subject, else by client IP (so run
+    # uvicorn with --proxy-headers behind a reverse proxy).
+    ENROLLMENT_ADMISSION_ENABLED: bool = True
+    ENROLLMENT_WRITERS: int = 4
+    ENROLLMENT_QUEUE_SIZE: int = 1000
+    ENROLLMENT_QUEUE_PER_USER: int = 100
+    ENROLLMENT_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
+    # Group commit: student creation, enrollment and grading go through one
+    # writer thread that commits up to GROUP_COMMIT_MAX_BATCH writes at once,
+    # waiting at most GROUP_COMMIT_MAX_DELAY_MS for a batch to fill.
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_MAX_BATCH: int = 128
+    GROUP_COMMIT_MAX_DELAY_MS: float = 2.0
+
+    # Per-route latency/DB/size histograms served at /metrics.
+    METRICS_ENABLED: bool = True
+
+    # Statements slower than this are logged and kept for /admin/db/slow-queries
+    # (None disables). EXPLAIN re-runs them, so leave it off unless digging.
+    SLOW_QUERY_THRESHOLD_MS: float | None = 250.0
+    SLOW_QUERY_EXPLAIN: bool = False
+    SLOW_QUERY_LOG_SIZE: int = 50
+
     class Config:
         env_file = ".env"
 
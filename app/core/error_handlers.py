@@ -1,4 +1,5 @@
 from fastapi import Request, FastAPI, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from fastapi.exception_handlers import RequestValidationError
 from fastapi.exceptions import RequestValidationError, HTTPException as FastAPIHTTPException
@@ -11,6 +12,7 @@ def register_error_handlers(app: FastAPI):
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail},
+            headers=exc.headers,
         )
 
     # Handles FastAPI's own HTTPException (rare, but future-proof)
@@ -19,6 +21,7 @@ def register_error_handlers(app: FastAPI):
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail},
+            headers=exc.headers,
         )
 
     # Handles validation errors (like wrong/missing fields)
@@ -26,5 +29,6 @@ def register_error_handlers(app: FastAPI):
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={"detail": exc.errors()},
+            # Validator errors carry the raised exception in "ctx".
+            content={"detail": jsonable_encoder(exc.errors())},
         )
@@ -0,0 +1,39 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Mapping, Sequence
+
+# Rows are encoded and flushed in groups so each chunk written to the socket
+# is a few KB rather than one line.
+ROWS_PER_CHUNK = 500
+
+
+def stream_csv(
+    rows: Iterable[Mapping], fieldnames: Sequence[str]
+) -> Iterator[str]:
+    """Encode ``rows`` as CSV (with a header line) one chunk at a time."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def stream_ndjson(rows: Iterable[Mapping]) -> Iterator[str]:
+    """Encode ``rows`` as newline-delimited JSON one chunk at a time."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(row), default=str))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
@@ -0,0 +1,93 @@
+"""
+Conditional GET support: strong ETags and ``If-None-Match`` -> 304.
+
+Routes opt in by depending on ``conditional_request`` and asking it whether
+the client's copy is current *before* serializing the payload::
+
+    item = load(item_id)
+    not_modified = cache.check(item.version)
+    if not_modified is not None:
+        return not_modified
+    return item
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.sql import Select
+
+from app.db.revisions import revision_stmt
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison as RFC 9110 prescribes for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ConditionalRequest:
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+        self.etag: str | None = None
+
+    @property
+    def headers(self) -> dict:
+        # no-cache: clients may store the body but must revalidate each time.
+        return {"ETag": self.etag, "Cache-Control": "no-cache"}
+
+    def check(self, *parts) -> Response | None:
+        """
+        Derive the ETag from the URL and ``parts`` and return a bodiless 304
+        if the client already has it. Otherwise return None; the ETag is then
+        attached to the route's response (call ``apply`` on responses the
+        route builds itself).
+        """
+        url = self.request.url
+        self.etag = make_etag(url.path, url.query, *parts)
+        self.response.headers.update(self.headers)
+        if etag_matches(self.request.headers.get("if-none-match"), self.etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers
+            )
+        return None
+
+    def apply(self, response: Response) -> Response:
+        if self.etag is not None:
+            response.headers.update(self.headers)
+        return response
+
+
+def conditional_request(request: Request, response: Response) -> ConditionalRequest:
+    return ConditionalRequest(request, response)
+
+
+def collection_version_stmt(stmt: Select, id_column, version_column) -> Select:
+    """
+    Fingerprint of the rows ``stmt`` selects for a list ETag.
+
+    Where the table has a revision counter (app.db.revisions) that counter is
+    the fingerprint: it moves on every write and never repeats. Otherwise it
+    is (count, max id, sum of versions), which can repeat, e.g. when the row
+    with the highest id is deleted and a new row reuses its id.
+    """
+    revision = revision_stmt(id_column.table.name)
+    if revision is not None:
+        return revision
+    rows = stmt.with_only_columns(id_column, version_column).subquery()
+    return select(
+        func.count(),
+        func.max(rows.c[id_column.key]),
+        func.coalesce(func.sum(rows.c[version_column.key]), 0),
+    )
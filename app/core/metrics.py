@@ -0,0 +1,218 @@
+"""
+Request metrics rendered in the Prometheus text exposition format.
+
+``MetricsMiddleware`` times every HTTP request and labels it with the route
+template (``/courses/{course_id}``) rather than the raw path, so the number
+of series stays bounded. Database work is attributed to the request through
+a context variable fed by the engine's cursor events (see app.db.database).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple,
+        labelnames: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0]
+            series[index] += 1
+            series[-1] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        bucket_names = (*self.labelnames, "le")
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            bounds = (*(_number(b) for b in self.buckets), "+Inf")
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                label_str = _labels(bucket_names, (*labels, bound))
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.inc(-amount)
+
+    def render(self) -> list[str]:
+        return sample_lines(self.name, self.documentation, "gauge", [({}, self._value)])
+
+
+def sample_lines(
+    name: str, documentation: str, kind: str, samples: Iterable[tuple[dict, float]]
+) -> list[str]:
+    """Exposition lines for a gauge/counter given ``(labels, value)`` pairs."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels, labels.values())} {_number(value)}")
+    return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body byte.",
+    LATENCY_BUCKETS,
+    ("method", "route", "status"),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed while serving a request.",
+    QUERY_COUNT_BUCKETS,
+    ("method", "route"),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements while serving a request.",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Response body size.",
+    SIZE_BUCKETS,
+    ("method", "route"),
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+
+HISTOGRAMS = (REQUEST_LATENCY, REQUEST_DB_QUERIES, REQUEST_DB_TIME, RESPONSE_SIZE)
+
+
+@dataclass
+class QueryStats:
+    scope: dict | None = None
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def record_query(seconds: float) -> None:
+    """Charge one executed statement to the request being served, if any."""
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+
+
+def route_label(scope) -> str:
+    """Route template matched for ``scope``; unmatched paths share one label."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or "unmatched"
+
+
+def current_route() -> str | None:
+    """Route template of the request being served, if any."""
+    stats = _query_stats.get()
+    if stats is None or stats.scope is None:
+        return None
+    return route_label(stats.scope)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed bodies are measured without buffering."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        stats = QueryStats(scope)
+        token = _query_stats.set(stats)
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            _query_stats.reset(token)
+            method, route = scope["method"], route_label(scope)
+            REQUEST_LATENCY.observe(elapsed, method, route, status_code)
+            REQUEST_DB_QUERIES.observe(stats.count, method, route)
+            REQUEST_DB_TIME.observe(stats.seconds, method, route)
+            RESPONSE_SIZE.observe(size, method, route)
+
+
+def render_metrics(extra: Iterable[list[str]] = ()) -> str:
+    lines = [*IN_FLIGHT.render()]
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    for block in extra:
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
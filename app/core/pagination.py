@@ -0,0 +1,117 @@
+import base64
+import binascii
+import json
+from typing import Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the id of the last row on a page as an opaque cursor token."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor token produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        last_id = None
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return last_id
+
+
+def _count_stmt(stmt: Select) -> Select:
+    return select(func.count()).select_from(stmt.subquery())
+
+
+def _page_stmt(
+    stmt: Select, id_column, skip: int, limit: int, cursor: str | None
+) -> Select:
+    page = stmt.order_by(id_column)
+    if cursor is not None:
+        page = page.where(id_column > decode_cursor(cursor))
+    elif skip:
+        page = page.offset(skip)
+    # Fetch one extra row to know whether another page exists without counting.
+    return page.limit(limit + 1)
+
+
+def _build_page(
+    items: list, limit: int, total: int | None, as_dicts: bool = False
+) -> dict:
+    next_cursor = None
+    if limit > 0 and len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].id)
+    if as_dicts:
+        items = [row._asdict() for row in items]
+    return {"total": total, "items": items, "next_cursor": next_cursor}
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    id_column,
+    *,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+    include_total: bool | None = None,
+    columns: Sequence | None = None,
+) -> dict:
+    """
+    Run ``stmt`` one page at a time, ordered by ``id_column``.
+
+    With a ``cursor`` the page starts right after the row it points to, so
+    the cost stays O(limit) however deep the client scrolls; ``skip`` is
+    ignored. Without one, the legacy OFFSET behaviour is kept.
+
+    The exact ``total`` needs a COUNT over the whole filtered set. It is
+    computed by default for offset pages (backwards compatible) and only on
+    request (``include_total=True``) for cursor pages.
+
+    With ``columns``, only those columns are selected and the items come
+    back as plain dicts keyed by column label, ready to be JSON-encoded
+    without loading ORM objects or validating a model per row.
+    """
+    if include_total is None:
+        include_total = cursor is None
+    page = _page_stmt(stmt, id_column, skip, limit, cursor)
+    total = db.scalar(_count_stmt(stmt)) if include_total else None
+    if columns is None:
+        return _build_page(db.scalars(page).all(), limit, total)
+    rows = db.execute(page.with_only_columns(*columns)).all()
+    return _build_page(rows, limit, total, as_dicts=True)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    stmt: Select,
+    id_column,
+    *,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+    include_total: bool | None = None,
+    columns: Sequence | None = None,
+) -> dict:
+    """Async counterpart of ``paginate``."""
+    if include_total is None:
+        include_total = cursor is None
+    page = _page_stmt(stmt, id_column, skip, limit, cursor)
+    total = await db.scalar(_count_stmt(stmt)) if include_total else None
+    if columns is None:
+        return _build_page((await db.scalars(page)).all(), limit, total)
+    rows = (await db.execute(page.with_only_columns(*columns))).all()
+    return _build_page(rows, limit, total, as_dicts=True)
@@ -0,0 +1,169 @@
+"""
+On-demand sampling profiler for the running worker.
+
+A session starts a daemon thread that snapshots every thread's Python stack
+with ``sys._current_frames()`` at a fixed interval and counts identical
+stacks. The result uses the collapsed-stack format (``a;b;c 42``) read by
+flamegraph.pl, speedscope and friends.
+
+Nothing runs while no session is active: ``ProfilerMiddleware`` only reads a
+module global, and the sampling thread exists only for the session.
+"""
+import sys
+import threading
+from collections import Counter
+
+from starlette.routing import Match
+
+# Longest window or request wait an admin can ask for.
+MAX_PROFILE_SECONDS = 120.0
+
+# Leaf frames of threads parked waiting for work; their stacks are noise.
+IDLE_FRAMES = {
+    ("threading", "Condition.wait"),
+    ("threading", "Event.wait"),
+    ("selectors", "EpollSelector.select"),
+    ("selectors", "KqueueSelector.select"),
+    ("selectors", "PollSelector.select"),
+    ("selectors", "SelectSelector.select"),
+    ("concurrent.futures.thread", "_worker"),
+}
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profiling session is already running."""
+
+
+def _frame_name(frame) -> tuple[str, str]:
+    return frame.f_globals.get("__name__", "?"), frame.f_code.co_qualname
+
+
+def collapse_stack(frame) -> str | None:
+    """``module:function`` names from root to leaf, or None for idle threads."""
+    if _frame_name(frame) in IDLE_FRAMES:
+        return None
+    names = []
+    while frame is not None:
+        module, function = _frame_name(frame)
+        names.append(f"{module}:{function}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfileSession:
+    """
+    Samples all threads every ``interval`` seconds. With ``route`` set it only
+    samples while requests to that route template are in flight, and it is
+    done once ``requests`` of them have finished.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        route: str | None = None,
+        requests: int | None = None,
+    ):
+        self.interval = interval
+        self.route = route
+        self.requests_left = requests
+        self.requests_seen = 0
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self.done = threading.Event()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profiler-sampler", daemon=True
+        )
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            if self.route is not None and self._in_flight == 0:
+                continue
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = collapse_stack(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+
+    def matches(self, scope) -> bool:
+        """Whether ``scope`` is routed to the profiled route template."""
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return getattr(route, "path_format", None) == self.route
+        return False
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.requests_seen += 1
+            self.requests_left -= 1
+            if self.requests_left <= 0:
+                self.done.set()
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+_session: ProfileSession | None = None
+_session_lock = threading.Lock()
+
+
+def current_session() -> ProfileSession | None:
+    return _session
+
+
+def start_session(
+    interval: float, route: str | None = None, requests: int | None = None
+) -> ProfileSession:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            raise ProfilerBusy("A profiling session is already running")
+        session = ProfileSession(interval, route=route, requests=requests)
+        session._thread.start()
+        _session = session
+    return session
+
+
+def stop_session(session: ProfileSession) -> None:
+    global _session
+    session._stop.set()
+    session._thread.join()
+    with _session_lock:
+        if _session is session:
+            _session = None
+
+
+class ProfilerMiddleware:
+    """Counts requests for route-scoped sessions; a no-op when idle."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        session = _session
+        if (
+            session is None
+            or session.route is None
+            or scope["type"] != "http"
+            or not session.matches(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+        session.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session.request_finished()
@@ -0,0 +1,11 @@
+from fastapi.responses import JSONResponse
+
+try:
+    from fastapi.responses import ORJSONResponse
+    import orjson  # noqa: F401  (ORJSONResponse only fails once it renders)
+
+    FastJSONResponse = ORJSONResponse
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    FastJSONResponse = JSONResponse
+
+__all__ = ["FastJSONResponse"]
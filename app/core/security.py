@@ -1,31 +1,62 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
-try:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    pwd_context.hash("test")  # Warm-up to ensure backend available
-    USE_PASSLIB = True
-except Exception:
-    pwd_context = None
-    USE_PASSLIB = False
+# Detached User rows keyed by username (the token ``sub``). Anything that
+# changes a user's role, password or active flag must call
+# ``invalidate_principal`` so revocation is immediate in this process.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+# Per-username count of invalidations. A lookup that misses the cache only
+# stores what it loaded if no invalidation happened in between, otherwise a
+# row read just before a revocation committed could be cached after it.
+_principal_generations: dict[str, int] = {}
+_principal_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _get_pwd_context() -> CryptContext | None:
+    """
+    Probe passlib's bcrypt backend on first use and remember the outcome.
+
+    The probe costs a full bcrypt round, so it is kept out of import time;
+    call ``warmup()`` from startup to pay it before the first login instead.
+    """
+    try:
+        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        pwd_context.hash("test")  # Ensure the backend is actually usable
+        return pwd_context
+    except Exception:
+        return None
+
+
+def warmup() -> None:
+    """Resolve the password hashing backend ahead of the first request."""
+    _get_pwd_context()
 
 
 def get_password_hash(password: str) -> str:
     password_bytes = password.encode("utf-8")[:72]
     password = password_bytes.decode("utf-8", errors="ignore")
-    if not USE_PASSLIB:
+    pwd_context = _get_pwd_context()
+    if pwd_context is None:
         salt = bcrypt.gensalt()
         hashed = bcrypt.hashpw(password.encode(), salt)
         return hashed.decode("utf-8")
@@ -40,7 +71,8 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     pw = plain_password.encode("utf-8")[:72]
     pw = pw.decode("utf-8", errors="ignore")
-    if not USE_PASSLIB:
+    pwd_context = _get_pwd_context()
+    if pwd_context is None:
         return bcrypt.checkpw(pw.encode(), hashed_password.encode())
     try:
         return pwd_context.verify(pw, hashed_password)
@@ -48,6 +80,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(pw.encode(), hashed_password.encode())
 
 
+# bcrypt releases the GIL, so a small thread pool is enough to keep hashing
+# off the request threadpool. The semaphore bounds running + queued jobs.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
+
+async def _run_in_hash_pool(func, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password operations in progress, retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _hash_executor.submit(func, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -60,9 +126,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     )
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> models.User:
+def _authenticate(db: Session, token: str) -> models.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -76,16 +140,49 @@ def get_current_user(
         role: str | None = payload.get("role")
         if username is None or role is None:
             raise credentials_exception
+        user = principal_cache.get(username)
+        if user is not None:
+            return user
+        generation = _principal_generations.get(username, 0)
         user = db.query(models.User).filter(models.User.username == username).first()
         if user is None or not user.is_active:
             raise credentials_exception
+        db.expunge(user)
+        with _principal_lock:
+            if _principal_generations.get(username, 0) == generation:
+                principal_cache.set(username, user)
         return user
     except JWTError:
         raise credentials_exception
 
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> models.User:
+    return _authenticate(db, token)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    """``get_current_user`` for async routes: same checks, on the async session."""
+    return await db.run_sync(_authenticate, token)
+
+
+def invalidate_principal(username: str) -> None:
+    with _principal_lock:
+        _principal_generations[username] = _principal_generations.get(username, 0) + 1
+        principal_cache.delete(username)
+
+
 def admin_required(current_user: models.User = Depends(get_current_user)) -> models.User:
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
     return current_user
 
+
+async def admin_required_async(
+    current_user: models.User = Depends(get_current_user_async),
+) -> models.User:
+    return admin_required(current_user)
+
@@ -1,9 +1,38 @@
+from functools import partial
+from typing import Callable
+
 from sqlalchemy.orm import Session
 
+# Session.info flag set on the group-commit writer's session.
+GROUP_COMMIT_KEY = "group_commit"
+# Session.info list the writer fills per operation with ``after_commit`` calls.
+AFTER_COMMIT_KEY = "after_commit"
+
+
+def commit(db: Session) -> None:
+    """Commit, or only flush inside a group-commit batch (the writer commits)."""
+    if db.info.get(GROUP_COMMIT_KEY):
+        db.flush()
+    else:
+        db.commit()
+
+
+def rollback(db: Session) -> None:
+    """
+    Roll back. Inside a group-commit batch the operation's savepoint is rolled
+    back instead once the exception propagates, so callers must re-raise.
+    """
+    if not db.info.get(GROUP_COMMIT_KEY):
+        db.rollback()
 
-def commit_and_refresh(db: Session, instance):
-    """Helper to commit and refresh a SQLAlchemy instance."""
-    db.commit()
-    db.refresh(instance)
-    return instance
 
+def after_commit(db: Session, fn: Callable, *args) -> None:
+    """
+    Run ``fn(*args)`` once the write just committed with ``commit`` is
+    durable: right away, or inside a group-commit batch after the batch's
+    COMMIT (the writer drops it if the operation or the COMMIT fails).
+    """
+    if db.info.get(GROUP_COMMIT_KEY):
+        db.info[AFTER_COMMIT_KEY].append(partial(fn, *args))
+    else:
+        fn(*args)
@@ -0,0 +1,76 @@
+"""
+Read-through cache for catalog rows (courses and faculty).
+
+Entries are plain column dicts keyed by ``<table>:<id>`` rather than ORM
+instances, so they outlive the session that loaded them and can be stored
+in Redis. Writers call ``invalidate`` once their change is committed.
+"""
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import make_cache
+from app.core.config import settings
+
+catalog_cache = make_cache(
+    settings.CATALOG_CACHE_BACKEND,
+    maxsize=settings.CATALOG_CACHE_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    redis_url=settings.CATALOG_CACHE_REDIS_URL,
+    prefix="catalog:",
+)
+# Per-key count of invalidations. A miss only stores the row it loaded if no
+# invalidation happened in between, otherwise a row read just before a write
+# committed could be cached after that write's invalidation.
+_generations: dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _key(model, row_id: int) -> str:
+    return f"{model.__tablename__}:{row_id}"
+
+
+def get_cached_row(db: Session, model, columns, row_id: int) -> dict | None:
+    """``columns`` of the ``model`` row with id ``row_id``; misses are not cached."""
+    key = _key(model, row_id)
+    row = catalog_cache.get(key)
+    if row is None:
+        generation = _generations.get(key, 0)
+        found = db.execute(select(*columns).where(model.id == row_id)).first()
+        if found is None:
+            return None
+        row = found._asdict()
+        _fill(key, row, generation)
+    return row
+
+
+async def get_cached_row_async(
+    db: AsyncSession, model, columns, row_id: int
+) -> dict | None:
+    key = _key(model, row_id)
+    row = catalog_cache.get(key)
+    if row is None:
+        generation = _generations.get(key, 0)
+        found = (
+            await db.execute(select(*columns).where(model.id == row_id))
+        ).first()
+        if found is None:
+            return None
+        row = found._asdict()
+        _fill(key, row, generation)
+    return row
+
+
+def _fill(key: str, row: dict, generation: int) -> None:
+    with _lock:
+        if _generations.get(key, 0) == generation:
+            catalog_cache.set(key, row)
+
+
+def invalidate(model, row_id: int) -> None:
+    key = _key(model, row_id)
+    with _lock:
+        _generations[key] = _generations.get(key, 0) + 1
+        catalog_cache.delete(key)
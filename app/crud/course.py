@@ -1,17 +1,37 @@
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app import models, schemas
-from app.core.utils import commit_and_refresh
+from app.core.utils import after_commit, commit
+from app.crud import catalog
+from app.db.search import SearchMode, text_filter
+
+# Columns behind schemas.CourseRead, in its field order, for list fast paths.
+COURSE_READ_COLUMNS = (
+    models.Course.name,
+    models.Course.credits,
+    models.Course.capacity,
+    models.Course.id,
+    models.Course.faculty_id,
+    models.Course.enrolled_count,
+    models.Course.seats_remaining.label("seats_remaining"),
+)
+# What the catalog cache keeps per row: the read columns plus the ETag version.
+_CACHED_COLUMNS = (*COURSE_READ_COLUMNS, models.Course.version)
 
 
 def create_course(db: Session, course: schemas.CourseCreate) -> models.Course:
     db_course = models.Course(
         name=course.name,
         credits=course.credits,
+        capacity=course.capacity,
         faculty_id=course.faculty_id,
     )
     db.add(db_course)
-    return commit_and_refresh(db, db_course)
+    commit(db)
+    return db_course
 
 
 def list_courses(db: Session) -> list[models.Course]:
@@ -22,6 +42,46 @@ def get_course(db: Session, course_id: int) -> models.Course | None:
     return db.query(models.Course).filter(models.Course.id == course_id).first()
 
 
+def get_course_cached(db: Session, course_id: int) -> dict | None:
+    """``get_course`` through the catalog cache, as a dict of plain columns."""
+    return catalog.get_cached_row(db, models.Course, _CACHED_COLUMNS, course_id)
+
+
+async def get_course_cached_async(
+    db: AsyncSession, course_id: int
+) -> dict | None:
+    return await catalog.get_cached_row_async(
+        db, models.Course, _CACHED_COLUMNS, course_id
+    )
+
+
+def course_exists(db: Session, course_id: int) -> bool:
+    return get_course_cached(db, course_id) is not None
+
+
+async def get_course_async(
+    db: AsyncSession, course_id: int
+) -> models.Course | None:
+    return await db.get(models.Course, course_id)
+
+
+def courses_query(
+    name: str | None = None,
+    credits: int | None = None,
+    faculty_id: int | None = None,
+    match: SearchMode = SearchMode.contains,
+) -> Select:
+    """SELECT behind the course list filters, shared by sync and async routes."""
+    query = select(models.Course)
+    if name:
+        query = query.where(text_filter(models.Course, "name", name, match))
+    if credits is not None:
+        query = query.where(models.Course.credits == credits)
+    if faculty_id is not None:
+        query = query.where(models.Course.faculty_id == faculty_id)
+    return query
+
+
 def filter_courses(db: Session, faculty_id: int | None = None) -> list[models.Course]:
     query = db.query(models.Course)
     if faculty_id is not None:
@@ -34,11 +94,84 @@ def update_course(
 ) -> models.Course:
     db_course.name = course.name
     db_course.credits = course.credits
+    db_course.capacity = course.capacity
     db_course.faculty_id = course.faculty_id
-    return commit_and_refresh(db, db_course)
+    commit(db)
+    after_commit(db, catalog.invalidate, models.Course, db_course.id)
+    return db_course
 
 
 def delete_course(db: Session, db_course: models.Course) -> None:
+    course_id = db_course.id
     db.delete(db_course)
     db.commit()
+    catalog.invalidate(models.Course, course_id)
+
+
+async def course_exists_async(db: AsyncSession, course_id: int) -> bool:
+    return await get_course_cached_async(db, course_id) is not None
+
 
+async def create_course_async(
+    db: AsyncSession, course: schemas.CourseCreate
+) -> models.Course:
+    return await db.run_sync(create_course, course)
+
+
+async def update_course_async(
+    db: AsyncSession, db_course: models.Course, course: schemas.CourseCreate
+) -> models.Course:
+    return await db.run_sync(update_course, db_course, course)
+
+
+async def delete_course_async(db: AsyncSession, db_course: models.Course) -> None:
+    await db.run_sync(delete_course, db_course)
+
+
+def claim_seat(db: Session, course_id: int) -> bool:
+    """
+    Take one seat with a conditional UPDATE; False if the course is full.
+
+    The row lock taken here serializes concurrent claims on the course, so
+    the count never overshoots the capacity. The version is bumped too:
+    enrolled_count is part of the course's cached representation and ETag.
+    """
+    result = db.execute(
+        update(models.Course)
+        .where(
+            models.Course.id == course_id,
+            or_(
+                models.Course.capacity.is_(None),
+                models.Course.enrolled_count < models.Course.capacity,
+            ),
+        )
+        .values(
+            enrolled_count=models.Course.enrolled_count + 1,
+            version=models.Course.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def release_seat(db: Session, course_id: int) -> None:
+    """Give one seat back (the caller removed an enrollment)."""
+    db.execute(
+        update(models.Course)
+        .where(models.Course.id == course_id, models.Course.enrolled_count > 0)
+        .values(
+            enrolled_count=models.Course.enrolled_count - 1,
+            version=models.Course.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def recount_enrollments():
+    """UPDATE resetting every course's enrolled_count from the enrollments table."""
+    enrolled = (
+        select(func.count())
+        .where(models.Enrollment.course_id == models.Course.id)
+        .scalar_subquery()
+    )
+    return update(models.Course.__table__).values(enrolled_count=enrolled)
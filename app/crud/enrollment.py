@@ -1,7 +1,33 @@
+from collections import Counter
+from typing import Iterator
+
+from sqlalchemy import Row, bindparam, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app import models, schemas
-from app.core.utils import commit_and_refresh
+from app.core.utils import after_commit, commit, rollback
+from app.crud import catalog
+from app.crud import course as course_crud
+from app.crud import waitlist as waitlist_crud
+
+# Columns behind schemas.EnrollmentRead, in its field order, for list fast paths.
+ENROLLMENT_READ_COLUMNS = (
+    models.Enrollment.student_id,
+    models.Enrollment.course_id,
+    models.Enrollment.id,
+    models.Enrollment.grade,
+)
+
+
+class CourseFullError(Exception):
+    """Raised when a course has no seats left."""
+
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit.
+BULK_CHUNK_SIZE = 500
 
 
 def get_enrollment(
@@ -14,6 +40,17 @@ def get_enrollment(
     )
 
 
+async def get_enrollment_async(
+    db: AsyncSession, enrollment_id: int
+) -> models.Enrollment | None:
+    return await db.get(models.Enrollment, enrollment_id)
+
+
+def enrollments_query() -> Select:
+    """SELECT behind the enrollment list, shared by sync and async routes."""
+    return select(models.Enrollment)
+
+
 def list_enrollments(db: Session) -> list[models.Enrollment]:
     return db.query(models.Enrollment).all()
 
@@ -29,6 +66,45 @@ def filter_enrollments(
     return query.all()
 
 
+def get_student_grades(db: Session, student_id: int) -> list[dict]:
+    """Grades for a student with course names resolved in a single query."""
+    rows = db.execute(
+        select(
+            models.Enrollment.course_id,
+            models.Course.name.label("course_name"),
+            models.Enrollment.grade,
+        )
+        .outerjoin(models.Course, models.Course.id == models.Enrollment.course_id)
+        .where(models.Enrollment.student_id == student_id)
+        .order_by(models.Enrollment.id)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def iter_course_grades(
+    db: Session, course_id: int, batch_size: int = 1000
+) -> Iterator[Row]:
+    """
+    Stream (student, grade) rows for a course without materializing them.
+
+    ``yield_per`` makes the driver fetch ``batch_size`` rows at a time (and
+    use a server-side cursor where the backend supports one).
+    """
+    stmt = (
+        select(
+            models.Student.id.label("student_id"),
+            models.Student.name.label("student_name"),
+            models.Student.email.label("student_email"),
+            models.Enrollment.grade,
+        )
+        .join(models.Student, models.Student.id == models.Enrollment.student_id)
+        .where(models.Enrollment.course_id == course_id)
+        .order_by(models.Enrollment.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.execute(stmt)
+
+
 def get_existing_enrollment(
     db: Session, student_id: int, course_id: int
 ) -> models.Enrollment | None:
@@ -42,25 +118,274 @@ def get_existing_enrollment(
     )
 
 
+async def get_existing_enrollment_async(
+    db: AsyncSession, student_id: int, course_id: int
+) -> models.Enrollment | None:
+    return await db.scalar(
+        select(models.Enrollment)
+        .where(
+            models.Enrollment.student_id == student_id,
+            models.Enrollment.course_id == course_id,
+        )
+        .limit(1)
+    )
+
+
 def create_enrollment(
     db: Session, enrollment: schemas.EnrollmentCreate
 ) -> models.Enrollment:
+    """
+    Claim a seat and insert the enrollment in one transaction.
+
+    Raises CourseFullError when no seat is left. Duplicates are rejected by
+    the (student_id, course_id) unique index: IntegrityError is raised after
+    rolling back, which also gives the seat back.
+    """
+    if not course_crud.claim_seat(db, enrollment.course_id):
+        rollback(db)
+        raise CourseFullError(enrollment.course_id)
     db_enrollment = models.Enrollment(
         student_id=enrollment.student_id,
         course_id=enrollment.course_id,
     )
     db.add(db_enrollment)
-    return commit_and_refresh(db, db_enrollment)
+    try:
+        commit(db)
+    except IntegrityError:
+        rollback(db)
+        raise
+    after_commit(db, catalog.invalidate, models.Course, enrollment.course_id)
+    return db_enrollment
+
+
+def _chunks(values: list, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _existing_ids(db: Session, column, ids: set[int]) -> set[int]:
+    found: set[int] = set()
+    for chunk in _chunks(sorted(ids)):
+        found.update(db.scalars(select(column).where(column.in_(chunk))))
+    return found
+
+
+def _lock_seats(db: Session, course_ids: set[int]) -> dict[int, int]:
+    """
+    Free seats of the capped courses among ``course_ids``.
+
+    The version bump comes first so the rows stay write-locked until commit
+    and no other transaction can claim the seats counted here.
+    """
+    seats: dict[int, int] = {}
+    for chunk in _chunks(sorted(course_ids)):
+        db.execute(
+            update(models.Course)
+            .where(models.Course.id.in_(chunk))
+            .values(version=models.Course.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(
+            select(
+                models.Course.id,
+                models.Course.capacity - models.Course.enrolled_count,
+            ).where(models.Course.id.in_(chunk), models.Course.capacity.is_not(None))
+        )
+        seats.update((course_id, free) for course_id, free in rows)
+    return seats
+
+
+def bulk_create_enrollments(
+    db: Session, items: list[schemas.EnrollmentCreate]
+) -> list[dict]:
+    """
+    Validate and insert many enrollments in one transaction.
+
+    Students, courses and already-taken seats are checked with a handful of
+    chunked ``IN`` queries instead of per-row lookups, and the new rows go in
+    as a single executemany. Returns one outcome dict per input item, in order.
+    """
+    try:
+        return _bulk_create_enrollments(db, items)
+    except IntegrityError:
+        # A concurrent writer took one of the seats between our check and the
+        # insert; re-validating reports those rows as duplicates.
+        db.rollback()
+        return _bulk_create_enrollments(db, items)
+
+
+def _bulk_create_enrollments(
+    db: Session, items: list[schemas.EnrollmentCreate]
+) -> list[dict]:
+    student_ids = _existing_ids(
+        db, models.Student.id, {item.student_id for item in items}
+    )
+    course_ids = _existing_ids(db, models.Course.id, {item.course_id for item in items})
+
+    taken: set[tuple[int, int]] = set()
+    requested = {(item.student_id, item.course_id) for item in items}
+    for chunk in _chunks(sorted(student_ids)):
+        rows = db.execute(
+            select(models.Enrollment.student_id, models.Enrollment.course_id).where(
+                models.Enrollment.student_id.in_(chunk)
+            )
+        )
+        taken.update(pair for pair in map(tuple, rows) if pair in requested)
+
+    seats = _lock_seats(db, course_ids)
+    results = []
+    to_insert = []
+    for index, item in enumerate(items):
+        pair = (item.student_id, item.course_id)
+        result = {
+            "index": index,
+            "student_id": item.student_id,
+            "course_id": item.course_id,
+            "enrollment_id": None,
+        }
+        if item.student_id not in student_ids:
+            result["status"] = schemas.BulkEnrollmentStatus.student_not_found
+        elif item.course_id not in course_ids:
+            result["status"] = schemas.BulkEnrollmentStatus.course_not_found
+        elif pair in taken:
+            result["status"] = schemas.BulkEnrollmentStatus.duplicate
+        elif seats.get(item.course_id, 1) <= 0:
+            result["status"] = schemas.BulkEnrollmentStatus.course_full
+        else:
+            taken.add(pair)
+            if item.course_id in seats:
+                seats[item.course_id] -= 1
+            result["status"] = schemas.BulkEnrollmentStatus.created
+            to_insert.append(result)
+        results.append(result)
+
+    if to_insert:
+        new_ids = db.scalars(
+            insert(models.Enrollment).returning(
+                models.Enrollment.id, sort_by_parameter_order=True
+            ),
+            [
+                {"student_id": row["student_id"], "course_id": row["course_id"]}
+                for row in to_insert
+            ],
+        ).all()
+        for row, enrollment_id in zip(to_insert, new_ids):
+            row["enrollment_id"] = enrollment_id
+        added = Counter(row["course_id"] for row in to_insert)
+        courses = models.Course.__table__
+        db.execute(
+            update(courses)
+            .where(courses.c.id == bindparam("course"))
+            .values(enrolled_count=courses.c.enrolled_count + bindparam("added")),
+            [{"course": course_id, "added": n} for course_id, n in added.items()],
+        )
+    db.commit()
+    for course_id in course_ids:
+        catalog.invalidate(models.Course, course_id)
+    return results
 
 
 def update_grade(
     db: Session, db_enrollment: models.Enrollment, grade: schemas.GradeAssign
 ) -> models.Enrollment:
     db_enrollment.grade = grade.grade
-    return commit_and_refresh(db, db_enrollment)
+    commit(db)
+    return db_enrollment
+
+
+def assign_grades(
+    db: Session, course_id: int, entries: list[schemas.GradeEntry]
+) -> list[dict]:
+    """
+    Apply a batch of grades to a course's enrollments in one transaction.
+
+    The section's (enrollment id, student id) pairs are read with one query
+    on the course_id index, and the grades are written as one executemany
+    UPDATE by primary key. Entries that match no enrollment of the course
+    are reported as not_enrolled; a second entry for the same enrollment is
+    reported as duplicate and not applied. Returns one outcome per entry.
+    """
+    section = dict(
+        db.execute(
+            select(models.Enrollment.id, models.Enrollment.student_id).where(
+                models.Enrollment.course_id == course_id
+            )
+        ).all()
+    )
+    by_student = {student_id: key for key, student_id in section.items()}
+
+    results = []
+    grades: dict[int, str] = {}
+    for index, entry in enumerate(entries):
+        if entry.enrollment_id is not None:
+            enrollment_id = entry.enrollment_id
+            if enrollment_id not in section:
+                enrollment_id = None
+        else:
+            enrollment_id = by_student.get(entry.student_id)
+        if enrollment_id is None:
+            status = schemas.GradeEntryStatus.not_enrolled
+        elif enrollment_id in grades:
+            status = schemas.GradeEntryStatus.duplicate
+        else:
+            grades[enrollment_id] = entry.grade.value
+            status = schemas.GradeEntryStatus.updated
+        results.append(
+            {
+                "index": index,
+                "enrollment_id": entry.enrollment_id or enrollment_id,
+                "student_id": section.get(enrollment_id, entry.student_id),
+                "grade": entry.grade,
+                "status": status,
+            }
+        )
+
+    if grades:
+        db.execute(
+            update(models.Enrollment),
+            [{"id": key, "grade": grade} for key, grade in grades.items()],
+        )
+    commit(db)
+    return results
 
 
-def delete_enrollment(db: Session, db_enrollment: models.Enrollment) -> None:
-    db.delete(db_enrollment)
+def delete_enrollment(db: Session, db_enrollment: models.Enrollment) -> int | None:
+    """
+    Delete the enrollment and hand its seat to the head of the course's
+    waitlist, in one transaction. Returns the promoted enrollment's id.
+    """
+    course_id = db_enrollment.course_id
+    deleted = db.execute(
+        delete(models.Enrollment)
+        .where(models.Enrollment.id == db_enrollment.id)
+        .execution_options(synchronize_session=False)
+    )
+    promoted = None
+    # Only the request that actually removed the row releases the seat; the
+    # release locks the course row, so concurrent drops promote one by one.
+    if deleted.rowcount == 1:
+        course_crud.release_seat(db, course_id)
+        promoted = waitlist_crud.promote_next(db, course_id)
     db.commit()
+    catalog.invalidate(models.Course, course_id)
+    return promoted
+
+
+# Async variants: the same transactions, run on the AsyncSession's connection.
+async def bulk_create_enrollments_async(
+    db: AsyncSession, items: list[schemas.EnrollmentCreate]
+) -> list[dict]:
+    return await db.run_sync(bulk_create_enrollments, items)
+
+
+async def assign_grades_async(
+    db: AsyncSession, course_id: int, entries: list[schemas.GradeEntry]
+) -> list[dict]:
+    return await db.run_sync(assign_grades, course_id, entries)
+
+
+async def delete_enrollment_async(
+    db: AsyncSession, db_enrollment: models.Enrollment
+) -> int | None:
+    return await db.run_sync(delete_enrollment, db_enrollment)
 
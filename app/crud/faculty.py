@@ -1,13 +1,23 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app import models, schemas
-from app.core.utils import commit_and_refresh
+from app.core.utils import after_commit, commit
+from app.crud import catalog
+from app.db.search import SearchMode, text_filter
+
+# Columns behind schemas.FacultyRead, in its field order, for list fast paths.
+FACULTY_READ_COLUMNS = (models.Faculty.name, models.Faculty.email, models.Faculty.id)
+_CACHED_COLUMNS = (*FACULTY_READ_COLUMNS, models.Faculty.version)
 
 
 def create_faculty(db: Session, faculty: schemas.FacultyCreate) -> models.Faculty:
     db_faculty = models.Faculty(name=faculty.name, email=faculty.email)
     db.add(db_faculty)
-    return commit_and_refresh(db, db_faculty)
+    commit(db)
+    return db_faculty
 
 
 def list_faculty(db: Session) -> list[models.Faculty]:
@@ -18,15 +28,76 @@ def get_faculty(db: Session, faculty_id: int) -> models.Faculty | None:
     return db.query(models.Faculty).filter(models.Faculty.id == faculty_id).first()
 
 
+def get_faculty_cached(db: Session, faculty_id: int) -> dict | None:
+    """``get_faculty`` through the catalog cache, as a dict of plain columns."""
+    return catalog.get_cached_row(db, models.Faculty, _CACHED_COLUMNS, faculty_id)
+
+
+async def get_faculty_cached_async(
+    db: AsyncSession, faculty_id: int
+) -> dict | None:
+    return await catalog.get_cached_row_async(
+        db, models.Faculty, _CACHED_COLUMNS, faculty_id
+    )
+
+
+def faculty_exists(db: Session, faculty_id: int) -> bool:
+    return get_faculty_cached(db, faculty_id) is not None
+
+
+async def get_faculty_async(
+    db: AsyncSession, faculty_id: int
+) -> models.Faculty | None:
+    return await db.get(models.Faculty, faculty_id)
+
+
+def faculty_query(
+    name: str | None = None,
+    email: str | None = None,
+    match: SearchMode = SearchMode.contains,
+) -> Select:
+    """SELECT behind the faculty list filters, shared by sync and async routes."""
+    query = select(models.Faculty)
+    if name:
+        query = query.where(text_filter(models.Faculty, "name", name, match))
+    if email:
+        query = query.where(text_filter(models.Faculty, "email", email, match))
+    return query
+
+
 def update_faculty(
     db: Session, db_faculty: models.Faculty, faculty: schemas.FacultyCreate
 ) -> models.Faculty:
     db_faculty.name = faculty.name
     db_faculty.email = faculty.email
-    return commit_and_refresh(db, db_faculty)
+    commit(db)
+    after_commit(db, catalog.invalidate, models.Faculty, db_faculty.id)
+    return db_faculty
 
 
 def delete_faculty(db: Session, db_faculty: models.Faculty) -> None:
+    faculty_id = db_faculty.id
     db.delete(db_faculty)
     db.commit()
+    catalog.invalidate(models.Faculty, faculty_id)
+
+
+async def faculty_exists_async(db: AsyncSession, faculty_id: int) -> bool:
+    return await get_faculty_cached_async(db, faculty_id) is not None
+
+
+async def create_faculty_async(
+    db: AsyncSession, faculty: schemas.FacultyCreate
+) -> models.Faculty:
+    return await db.run_sync(create_faculty, faculty)
+
+
+async def update_faculty_async(
+    db: AsyncSession, db_faculty: models.Faculty, faculty: schemas.FacultyCreate
+) -> models.Faculty:
+    return await db.run_sync(update_faculty, db_faculty, faculty)
+
+
+async def delete_faculty_async(db: AsyncSession, db_faculty: models.Faculty) -> None:
+    await db.run_sync(delete_faculty, db_faculty)
 
@@ -1,13 +1,21 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app import models, schemas
-from app.core.utils import commit_and_refresh
+from app.core.utils import commit
+from app.db.search import SearchMode, text_filter
+
+# Columns behind schemas.StudentRead, in its field order, for list fast paths.
+STUDENT_READ_COLUMNS = (models.Student.name, models.Student.email, models.Student.id)
 
 
 def create_student(db: Session, student: schemas.StudentCreate) -> models.Student:
     db_student = models.Student(name=student.name, email=student.email)
     db.add(db_student)
-    return commit_and_refresh(db, db_student)
+    commit(db)
+    return db_student
 
 
 def list_students(db: Session, skip: int = 0, limit: int = 10) -> list[models.Student]:
@@ -18,15 +26,54 @@ def get_student(db: Session, student_id: int) -> models.Student | None:
     return db.query(models.Student).filter(models.Student.id == student_id).first()
 
 
+async def get_student_async(
+    db: AsyncSession, student_id: int
+) -> models.Student | None:
+    return await db.get(models.Student, student_id)
+
+
+def students_query(
+    name: str | None = None,
+    email: str | None = None,
+    match: SearchMode = SearchMode.contains,
+) -> Select:
+    """SELECT behind the student list filters, shared by sync and async routes."""
+    query = select(models.Student)
+    if name:
+        query = query.where(text_filter(models.Student, "name", name, match))
+    if email:
+        query = query.where(text_filter(models.Student, "email", email, match))
+    return query
+
+
 def update_student(
     db: Session, db_student: models.Student, student: schemas.StudentCreate
 ) -> models.Student:
     db_student.name = student.name
     db_student.email = student.email
-    return commit_and_refresh(db, db_student)
+    commit(db)
+    return db_student
 
 
 def delete_student(db: Session, student: models.Student) -> None:
+    """Delete the student and take them off every waitlist."""
+    db.execute(
+        delete(models.Waitlist)
+        .where(models.Waitlist.student_id == student.id)
+        .execution_options(synchronize_session=False)
+    )
     db.delete(student)
     db.commit()
 
+
+# Async writes run the functions above on the AsyncSession's connection via
+# ``run_sync``, so both stacks share one implementation of each write.
+async def update_student_async(
+    db: AsyncSession, db_student: models.Student, student: schemas.StudentCreate
+) -> models.Student:
+    return await db.run_sync(update_student, db_student, student)
+
+
+async def delete_student_async(db: AsyncSession, student: models.Student) -> None:
+    await db.run_sync(delete_student, student)
+
@@ -2,7 +2,8 @@ from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.core.utils import commit_and_refresh
+from app.core.security import invalidate_principal
+from app.core.utils import commit
 
 
 def get_user_by_username_or_email(
@@ -28,7 +29,8 @@ def create_user(db: Session, user: schemas.UserCreate, password_hash: str) -> mo
         is_active=True,
     )
     db.add(db_user)
-    return commit_and_refresh(db, db_user)
+    commit(db)
+    return db_user
 
 
 def list_users(db: Session) -> list[models.User]:
@@ -41,15 +43,21 @@ def get_user(db: Session, user_id: int) -> models.User | None:
 
 def update_role(db: Session, user: models.User, new_role: str) -> models.User:
     user.role = new_role
-    return commit_and_refresh(db, user)
+    commit(db)
+    invalidate_principal(user.username)
+    return user
 
 
 def set_password(db: Session, user: models.User, password_hash: str) -> models.User:
     user.password_hash = password_hash
-    return commit_and_refresh(db, user)
+    commit(db)
+    invalidate_principal(user.username)
+    return user
 
 
 def disable_user(db: Session, user: models.User) -> models.User:
     user.is_active = False
-    return commit_and_refresh(db, user)
+    commit(db)
+    invalidate_principal(user.username)
+    return user
 
@@ -0,0 +1,177 @@
+from sqlalchemy import Row, delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.utils import after_commit, commit
+from app.crud import catalog
+from app.crud import course as course_crud
+
+# Attempts at appending to a queue when concurrent joiners race for the tail.
+JOIN_ATTEMPTS = 3
+
+
+def get_entry(db: Session, entry_id: int) -> models.Waitlist | None:
+    return db.get(models.Waitlist, entry_id)
+
+
+def list_waitlist(
+    db: Session, course_id: int, skip: int = 0, limit: int = 50
+) -> list[models.Waitlist]:
+    """The course's queue, head first."""
+    return db.scalars(
+        select(models.Waitlist)
+        .where(models.Waitlist.course_id == course_id)
+        .order_by(models.Waitlist.position)
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
+
+def _is_queued(db: Session, course_id: int, student_id: int) -> bool:
+    entry_id = db.scalar(
+        select(models.Waitlist.id).where(
+            models.Waitlist.course_id == course_id,
+            models.Waitlist.student_id == student_id,
+        )
+    )
+    return entry_id is not None
+
+
+def join_waitlist(
+    db: Session, entry: schemas.EnrollmentCreate
+) -> models.Waitlist | models.Enrollment:
+    """
+    Append the student to the course's queue, or enroll them if a seat is
+    free after all.
+
+    The tail position is read off the (course_id, position) index inside the
+    INSERT itself. Two joiners racing for the same position trip the unique
+    index and the loser retries; a student already queued for the course
+    gets the IntegrityError, after rolling back.
+
+    The caller's failed seat claim ran in an earlier transaction, and a drop
+    committed since then found no one to promote. So open seats are handed
+    out to the queue, this entry included, in the same transaction as the
+    INSERT. Returns the student's enrollment if they got one, else the entry.
+    """
+    tail = (
+        select(func.coalesce(func.max(models.Waitlist.position), 0) + 1)
+        .where(models.Waitlist.course_id == entry.course_id)
+        .scalar_subquery()
+    )
+    for attempt in range(JOIN_ATTEMPTS):
+        try:
+            # RETURNING the whole row: the computed position is not known
+            # to the ORM otherwise, and reading it later would cost a SELECT.
+            db_entry = db.scalar(
+                insert(models.Waitlist)
+                .values(
+                    course_id=entry.course_id,
+                    student_id=entry.student_id,
+                    position=tail,
+                )
+                .returning(models.Waitlist)
+            )
+        except IntegrityError:
+            db.rollback()
+            if (
+                attempt == JOIN_ATTEMPTS - 1
+                or _is_queued(db, entry.course_id, entry.student_id)
+            ):
+                raise
+            continue
+        promoted = _promote_all(db, entry.course_id)
+        commit(db)
+        if not promoted:
+            return db_entry
+        after_commit(db, catalog.invalidate, models.Course, entry.course_id)
+        enrollment = db.scalar(
+            select(models.Enrollment).where(
+                models.Enrollment.student_id == entry.student_id,
+                models.Enrollment.course_id == entry.course_id,
+            )
+        )
+        return db_entry if enrollment is None else enrollment
+
+
+def leave_waitlist(db: Session, db_entry: models.Waitlist) -> None:
+    db.delete(db_entry)
+    db.commit()
+
+
+def _head(db: Session, course_id: int) -> Row | None:
+    # The join skips entries of deleted students (SQLite does not enforce the
+    # foreign key), which must not take a seat.
+    return db.execute(
+        select(models.Waitlist.id, models.Waitlist.student_id)
+        .join(models.Student, models.Student.id == models.Waitlist.student_id)
+        .where(models.Waitlist.course_id == course_id)
+        .order_by(models.Waitlist.position)
+        .limit(1)
+    ).first()
+
+
+def promote_next(db: Session, course_id: int) -> int | None:
+    """
+    Move the head of the course's queue into a free seat, if there is one.
+
+    Runs inside the caller's transaction and returns the new enrollment's id.
+    The seat is claimed with the same conditional UPDATE as a direct
+    enrollment, which also locks the course row for the rest of the
+    transaction; the guarded DELETE skips a head that another transaction
+    promoted before that lock was taken.
+    """
+    head = _head(db, course_id)
+    if head is None or not course_crud.claim_seat(db, course_id):
+        return None
+    while head is not None:
+        removed = db.execute(
+            delete(models.Waitlist)
+            .where(models.Waitlist.id == head.id)
+            .execution_options(synchronize_session=False)
+        )
+        if removed.rowcount == 1:
+            try:
+                with db.begin_nested():
+                    return db.scalar(
+                        insert(models.Enrollment)
+                        .values(student_id=head.student_id, course_id=course_id)
+                        .returning(models.Enrollment.id)
+                    )
+            except IntegrityError:
+                # Enrolled directly since joining; the stale entry is gone now.
+                pass
+        head = _head(db, course_id)
+    course_crud.release_seat(db, course_id)
+    return None
+
+
+def _promote_all(db: Session, course_id: int) -> list[int]:
+    promoted = []
+    while (enrollment_id := promote_next(db, course_id)) is not None:
+        promoted.append(enrollment_id)
+    return promoted
+
+
+def fill_open_seats(db: Session, course_id: int) -> list[int]:
+    """
+    Promote until the course is full or its queue is empty, e.g. after its
+    capacity was raised. Commits and returns the new enrollment ids.
+    """
+    promoted = _promote_all(db, course_id)
+    db.commit()
+    if promoted:
+        catalog.invalidate(models.Course, course_id)
+    return promoted
+
+
+async def join_waitlist_async(
+    db: AsyncSession, entry: schemas.EnrollmentCreate
+) -> models.Waitlist | models.Enrollment:
+    return await db.run_sync(join_waitlist, entry)
+
+
+async def fill_open_seats_async(db: AsyncSession, course_id: int) -> list[int]:
+    return await db.run_sync(fill_open_seats, course_id)
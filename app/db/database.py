@@ -1,20 +1,117 @@
-from sqlalchemy import create_engine
+import time
+from functools import lru_cache
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import record_query
+from app.db.pool import InstrumentedQueuePool
+from app.db.slow_query import slow_query_log
 
 # Use DATABASE_URL from Settings (env/.env), else fallback to local sqlite by default
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={
-        "check_same_thread": False
+
+def is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and (
+        parsed.database in (None, "", ":memory:")
+        or parsed.query.get("mode") == "memory"
+    )
+
+
+def pool_options(url: str) -> dict:
+    """Pool keyword arguments for ``create_engine`` built from Settings."""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
     }
-    if SQLALCHEMY_DATABASE_URL.startswith("sqlite")
-    else {},
+    if not is_sqlite_memory(url):
+        # In-memory SQLite uses a SingletonThreadPool with no size limits.
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def install_sqlite_pragmas(sync_engine: Engine) -> None:
+    """Tune every new SQLite connection (WAL, relaxed fsync, bigger caches)."""
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS:d}")
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE:d}")
+            cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE:d}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        finally:
+            cursor.close()
+
+
+def install_query_timing(sync_engine: Engine) -> None:
+    """
+    Time every statement once and hand the duration to the per-request
+    metrics and to the slow-query log.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        record_query(elapsed)
+        slow_query_log.observe(conn, statement, parameters, executemany, elapsed)
+
+
+def create_sync_engine(url: str, **pool_overrides) -> Engine:
+    """Engine for ``url`` with the pool from Settings, SQLite tuning and timing."""
+    is_sqlite = url.startswith("sqlite")
+    sync_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        poolclass=None if is_sqlite_memory(url) else InstrumentedQueuePool,
+        **{**pool_options(url), **pool_overrides},
+    )
+    if is_sqlite and settings.SQLITE_TUNED:
+        install_sqlite_pragmas(sync_engine)
+    install_query_timing(sync_engine)
+    return sync_engine
+
+
+engine = create_sync_engine(SQLALCHEMY_DATABASE_URL)
+
+# Committed instances keep their attributes: the INSERT/UPDATE already told
+# us every value (primary keys and server defaults come back via RETURNING),
+# so reading them again after COMMIT would only cost another SELECT.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def dedicated_sessionmaker() -> sessionmaker:
+    """
+    Sessions bound to a one-connection engine of their own, for a single
+    background writer that must not wait on the request pool. In-memory
+    SQLite keeps one database per connection, so there it shares ``engine``.
+    """
+    if is_sqlite_memory(SQLALCHEMY_DATABASE_URL):
+        return SessionLocal
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=create_sync_engine(SQLALCHEMY_DATABASE_URL, pool_size=1, max_overflow=0),
+    )
+
 
 def get_db():
     db = SessionLocal()
@@ -22,3 +119,56 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def pool_status() -> dict:
+    """Checked-out/overflow counts and checkout wait times of the sync pool."""
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if not sep or dialect not in ASYNC_DRIVERS:
+        raise ValueError(
+            f"No async driver known for {scheme!r}; set ASYNC_DATABASE_URL"
+        )
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Build the async engine on first use so the sync-only setup needs no driver."""
+    url = settings.ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(url, **pool_options(url))
+    if url.startswith("sqlite") and settings.SQLITE_TUNED:
+        install_sqlite_pragmas(async_engine.sync_engine)
+    install_query_timing(async_engine.sync_engine)
+    return async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+async def dispose_async_engine() -> None:
+    """
+    Close the async pool's connections, if it was ever built. aiosqlite runs
+    each connection on a non-daemon thread, so an open pool blocks exit.
+    """
+    if get_async_sessionmaker.cache_info().currsize:
+        await get_async_sessionmaker().kw["bind"].dispose()
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,195 @@
+"""
+Group commit: a single writer thread applies the writes of concurrent
+requests in shared transactions, so a burst of N writes pays for one COMMIT
+(one fsync on SQLite) instead of N.
+
+The writer takes the first queued operation, keeps collecting until
+``max_batch`` operations or ``max_delay`` seconds, then runs each one in its
+own SAVEPOINT of a single transaction. A failing operation (a duplicate
+enrollment, say) is rolled back alone and its caller gets the exception; the
+rest of the batch still commits. Results are handed back only once the
+COMMIT succeeded, and if the COMMIT itself fails every caller in the batch
+gets that error.
+
+Operations are ordinary crud functions: ``commit`` only flushes inside a
+batch, ``rollback`` leaves the undo to the savepoint, so the caller must
+re-raise (which the crud functions do), and ``after_commit`` work such as
+cache invalidation is held back until the batch's COMMIT.
+
+The writer has a connection of its own: callers block on it while their
+request session's connection would otherwise stay checked out, so sharing
+the request pool could starve the writer.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.utils import AFTER_COMMIT_KEY, GROUP_COMMIT_KEY
+from app.db.database import dedicated_sessionmaker
+from app.models import Base
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Operation:
+    fn: Callable
+    args: tuple
+    future: Future = field(default_factory=Future)
+
+
+class GroupCommitter:
+    def __init__(
+        self, session_factory: sessionmaker, max_batch: int, max_delay: float
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.operations = 0
+        self._queue: queue.Queue[_Operation | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Queue ``fn(session, *args)`` for the next batch."""
+        self._ensure_started()
+        operation = _Operation(fn, args)
+        self._queue.put(operation)
+        return operation.future
+
+    def run(self, fn: Callable, *args):
+        """``submit`` and wait for the result (or exception) after COMMIT."""
+        return self.submit(fn, *args).result()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(
+                    target=self._run, name="group-commit", daemon=True
+                )
+                thread.start()
+                self._thread = thread
+
+    def stop(self) -> None:
+        """Finish the queued operations and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _collect(self, first: _Operation) -> tuple[list[_Operation], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                operation = self._queue.get(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty:
+                break
+            if operation is None:
+                return batch, True
+            batch.append(operation)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+            self._apply(batch)
+
+    def _apply(self, batch: list[_Operation]) -> None:
+        outcomes = []
+        try:
+            with self.session_factory() as db:
+                db.info[GROUP_COMMIT_KEY] = True
+                if db.bind.dialect.name == "sqlite":
+                    # pysqlite would let the first SAVEPOINT open (and its
+                    # RELEASE commit) the transaction; take the write lock now.
+                    db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+                for operation in batch:
+                    outcomes.append((operation, *self._apply_one(db, operation)))
+                db.commit()
+        except Exception as exc:
+            logger.exception("Group commit of %d operations failed", len(batch))
+            for operation in batch:
+                operation.future.set_exception(exc)
+            return
+        self.batches += 1
+        self.operations += len(batch)
+        for operation, result, error, callbacks in outcomes:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("After-commit callback %r failed", callback)
+            if error is None:
+                operation.future.set_result(result)
+            else:
+                operation.future.set_exception(error)
+
+    @staticmethod
+    def _apply_one(db: Session, operation: _Operation) -> tuple:
+        """(result, error, after-commit callbacks) of one operation."""
+        callbacks = db.info[AFTER_COMMIT_KEY] = []
+        try:
+            with db.begin_nested():
+                # Instances loaded by the request's session move into this one.
+                args = [
+                    db.merge(arg) if isinstance(arg, Base) else arg
+                    for arg in operation.args
+                ]
+                return operation.fn(db, *args), None, callbacks
+        except Exception as exc:
+            return None, exc, []
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "operations": self.operations,
+            "queued": self._queue.qsize(),
+        }
+
+
+writer = GroupCommitter(
+    dedicated_sessionmaker(),
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+    max_delay=settings.GROUP_COMMIT_MAX_DELAY_MS / 1000,
+)
+
+
+def run_write(db: Session, fn: Callable, *args):
+    """
+    Run the write ``fn(session, *args)``: on ``db`` normally, or through the
+    group-commit writer when GROUP_COMMIT_ENABLED is set.
+    """
+    if settings.GROUP_COMMIT_ENABLED:
+        # Check the request's connection back in before waiting on the writer;
+        # ``db`` stays usable and checks one out again on its next query.
+        db.close()
+        return writer.run(fn, *args)
+    return fn(db, *args)
+
+
+async def run_write_async(db: AsyncSession, fn: Callable, *args):
+    """``run_write`` for async routes; waits on the writer without blocking."""
+    if settings.GROUP_COMMIT_ENABLED:
+        await db.close()
+        return await asyncio.wrap_future(writer.submit(fn, *args))
+    return await db.run_sync(fn, *args)
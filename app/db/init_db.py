@@ -1,29 +1,77 @@
 from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
 
+from app.crud.course import recount_enrollments
 from app.db.database import engine
+from app.db.revisions import install_revision_triggers
+from app.db.search import install_search_indexes
 from app.models import Base
 
 
+# Columns added after the first release: table -> {column: DDL fragment}.
+ADDED_COLUMNS = {
+    "users": {"is_active": "BOOLEAN DEFAULT 1 NOT NULL"},
+    "courses": {
+        "version": "INTEGER DEFAULT 1 NOT NULL",
+        "capacity": "INTEGER",
+        "enrolled_count": "INTEGER DEFAULT 0 NOT NULL",
+    },
+    "faculties": {"version": "INTEGER DEFAULT 1 NOT NULL"},
+}
+
+# Statements filling an added column from existing rows.
+BACKFILLS = {("courses", "enrolled_count"): recount_enrollments}
+
+
 def migrate_database():
     """Add missing columns to existing tables."""
     inspector = inspect(engine)
-    try:
-        columns = [col["name"] for col in inspector.get_columns("users")]
-    except Exception:
-        # Users table doesn't exist yet.
-        return
-
-    if "is_active" not in columns:
-        with engine.begin() as conn:
-            conn.execute(
-                text(
-                    "ALTER TABLE users "
-                    "ADD COLUMN is_active BOOLEAN DEFAULT 1 NOT NULL"
-                )
-            )
+    for table, added in ADDED_COLUMNS.items():
+        try:
+            columns = [col["name"] for col in inspector.get_columns(table)]
+        except Exception:
+            # Table doesn't exist yet.
+            continue
+        for name, ddl in added.items():
+            if name not in columns:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                    backfill = BACKFILLS.get((table, name))
+                    if backfill is not None:
+                        conn.execute(backfill())
+
+    create_missing_indexes()
 
 
+def create_missing_indexes():
+    """
+    Create indexes declared on the models but missing from tables that
+    predate them (``create_all`` skips existing tables entirely).
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(bind=engine)
+            except IntegrityError as exc:
+                if not index.unique:
+                    raise
+                # Old rows violate the new constraint. The writes rely on it to
+                # reject duplicates, so don't start without it.
+                columns = ", ".join(column.name for column in index.columns)
+                raise RuntimeError(
+                    f"Cannot create unique index {index.name}: {table.name} has "
+                    f"duplicate rows on ({columns}). Remove the duplicates and "
+                    "restart."
+                ) from exc
+
 def init_db():
     Base.metadata.create_all(bind=engine)
     migrate_database()
-
+    install_search_indexes(engine)
+    install_revision_triggers(engine)
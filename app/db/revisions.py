@@ -0,0 +1,59 @@
+"""
+Per-table revision counters behind the collection ETags.
+
+On SQLite, triggers bump ``table_revisions.revision`` on every INSERT,
+UPDATE and DELETE of a tracked table, whichever path wrote the row (ORM,
+Core statements or the bulk loader). Unlike aggregates over the rows, the
+counter never repeats a value, so a list's ETag cannot come back after the
+list changed. On other backends ``revision_stmt`` returns None and callers
+fall back to their own fingerprint.
+"""
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+from app.models import TableRevision
+
+REVISIONED_TABLES = ("courses", "faculties")
+
+_enabled_tables: set[str] = set()
+
+
+def _trigger_ddl(table_name: str) -> list[str]:
+    bump = (
+        "UPDATE table_revisions SET revision = revision + 1 "
+        f"WHERE table_name = '{table_name}';"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table_name}_revision_{suffix} "
+        f"AFTER {event} ON {table_name} BEGIN {bump} END"
+        for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+    ]
+
+
+def install_revision_triggers(engine: Engine) -> None:
+    """Create the counter rows and the triggers bumping them."""
+    _enabled_tables.clear()
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for table_name in REVISIONED_TABLES:
+            conn.execute(
+                text(
+                    "INSERT OR IGNORE INTO table_revisions (table_name, revision) "
+                    "VALUES (:table_name, 0)"
+                ),
+                {"table_name": table_name},
+            )
+            for ddl in _trigger_ddl(table_name):
+                conn.execute(text(ddl))
+    _enabled_tables.update(REVISIONED_TABLES)
+
+
+def revision_stmt(table_name: str) -> Select | None:
+    """SELECT of the table's revision, or None when it is not tracked."""
+    if table_name not in _enabled_tables:
+        return None
+    return select(TableRevision.revision).where(
+        TableRevision.table_name == table_name
+    )
@@ -0,0 +1,179 @@
+"""
+Text search over names and emails backed by SQLite FTS5 trigram indexes.
+
+Each searchable table gets an external-content ``<table>_fts`` virtual table
+kept in sync by triggers, so substring filters (``name=...``) hit the
+trigram index instead of scanning with ``ILIKE '%term%'``. On other
+backends, or when FTS5 is unavailable, every helper falls back to ILIKE.
+"""
+import logging
+from enum import Enum
+
+from sqlalchemy import column, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Searchable columns per table; the order is the FTS5 column order.
+SEARCH_COLUMNS = {
+    "students": ("name", "email"),
+    "faculties": ("name", "email"),
+    "courses": ("name",),
+}
+
+# Trigram indexes cannot serve patterns with fewer than three characters.
+MIN_INDEXED_TERM = 3
+
+_enabled_tables: set[str] = set()
+
+
+class SearchMode(str, Enum):
+    contains = "contains"
+    prefix = "prefix"
+
+
+def _fts_name(table_name: str) -> str:
+    return f"{table_name}_fts"
+
+
+def _fts_table(table_name: str):
+    return table(
+        _fts_name(table_name),
+        column("rowid"),
+        column("rank"),
+        *(column(name) for name in SEARCH_COLUMNS[table_name]),
+    )
+
+
+def _trigger_ddl(table_name: str) -> list[str]:
+    fts = _fts_name(table_name)
+    cols = SEARCH_COLUMNS[table_name]
+    col_list = ", ".join(cols)
+    new_values = ", ".join(f"new.{c}" for c in cols)
+    old_values = ", ".join(f"old.{c}" for c in cols)
+    insert_new = (
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} "
+        f"BEGIN {delete_old} END",
+        # Only re-index when a searchable column actually changes.
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} "
+        f"ON {table_name} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def drop_search_triggers(conn) -> None:
+    """Drop the sync triggers before a bulk load (see rebuild_search_indexes)."""
+    for table_name in SEARCH_COLUMNS:
+        for suffix in ("ai", "ad", "au"):
+            trigger = f"{_fts_name(table_name)}_{suffix}"
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+
+
+def rebuild_search_indexes(conn) -> None:
+    """Re-read every searchable table into its FTS index and restore triggers."""
+    for table_name in SEARCH_COLUMNS:
+        fts = _fts_name(table_name)
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        for ddl in _trigger_ddl(table_name):
+            conn.execute(text(ddl))
+
+
+def install_search_indexes(engine: Engine) -> None:
+    """Create missing FTS tables and triggers; populate tables created now."""
+    _enabled_tables.clear()
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        with engine.begin() as conn:
+            existing = set(
+                conn.scalars(
+                    text("SELECT name FROM sqlite_master WHERE type = 'table'")
+                )
+            )
+            for table_name, cols in SEARCH_COLUMNS.items():
+                fts = _fts_name(table_name)
+                if fts not in existing:
+                    conn.execute(
+                        text(
+                            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                            f"{', '.join(cols)}, content='{table_name}', "
+                            f"content_rowid='id', tokenize='trigram')"
+                        )
+                    )
+                    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+                for ddl in _trigger_ddl(table_name):
+                    conn.execute(text(ddl))
+    except OperationalError as exc:
+        logger.warning("FTS5 trigram search unavailable, using ILIKE: %s", exc)
+        return
+    _enabled_tables.update(SEARCH_COLUMNS)
+
+
+def _uses_index(table_name: str, term: str) -> bool:
+    return table_name in _enabled_tables and len(term) >= MIN_INDEXED_TERM
+
+
+def _pattern(term: str, mode: SearchMode) -> str:
+    return f"{term}%" if mode is SearchMode.prefix else f"%{term}%"
+
+
+def text_filter(model, column_name: str, term: str, mode: SearchMode):
+    """WHERE clause matching ``term`` in ``model.<column_name>``."""
+    table_name = model.__tablename__
+    pattern = _pattern(term, mode)
+    if not _uses_index(table_name, term):
+        return getattr(model, column_name).ilike(pattern)
+    fts = _fts_table(table_name)
+    return model.id.in_(select(fts.c.rowid).where(fts.c[column_name].like(pattern)))
+
+
+def ranked_search(
+    db: Session,
+    model,
+    term: str,
+    *,
+    mode: SearchMode = SearchMode.contains,
+    limit: int = 20,
+) -> list:
+    """
+    Rows whose searchable columns match ``term``, best bm25 rank first.
+
+    Without a usable index the matches come back in id order instead.
+    """
+    table_name = model.__tablename__
+    cols = SEARCH_COLUMNS[table_name]
+    pattern = _pattern(term, mode)
+    if not _uses_index(table_name, term):
+        stmt = (
+            select(model)
+            .where(or_(*(getattr(model, c).ilike(pattern) for c in cols)))
+            .order_by(model.id)
+        )
+        return db.scalars(stmt.limit(limit)).all()
+
+    fts = _fts_table(table_name)
+    phrase = '"' + term.replace('"', '""') + '"'
+    match = text(f"{_fts_name(table_name)} MATCH :match").bindparams(
+        match=f"{{{' '.join(cols)}}} : {phrase}"
+    )
+    hits = select(fts.c.rowid, fts.c.rank).where(match)
+    if mode is SearchMode.prefix:
+        hits = hits.where(or_(*(fts.c[c].like(pattern) for c in cols)))
+    hits = hits.subquery()
+    stmt = (
+        select(model)
+        .join(hits, hits.c.rowid == model.id)
+        .order_by(hits.c.rank, model.id)
+        .limit(limit)
+    )
+    return db.scalars(stmt).all()
@@ -0,0 +1,122 @@
+"""
+Slow-query log for statements executed through the engines.
+
+Anything slower than the threshold is logged with its parameters, the route
+that issued it and its duration (optionally with the database's query
+plan), and the slowest ``size`` statements are kept for the admin API.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from app.core.config import settings
+from app.core.metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+# Longer parameter lists (bulk inserts) are cut down for the log.
+MAX_PARAMS_REPR = 500
+
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class SlowQuery:
+    duration_ms: float
+    statement: str
+    parameters: str
+    route: str | None
+    executemany: bool
+    recorded_at: float
+    plan: list[str] | None = None
+
+
+def _params_repr(parameters) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_PARAMS_REPR:
+        return text[:MAX_PARAMS_REPR] + "..."
+    return text
+
+
+def explain(conn, statement: str, parameters) -> list[str] | None:
+    """Query plan of ``statement``, read on a separate raw DBAPI cursor."""
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [str(row[-1]) for row in cursor.fetchall()]
+    except Exception:
+        logger.debug("EXPLAIN failed for slow statement", exc_info=True)
+        return None
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float | None, size: int, explain: bool):
+        self.threshold_ms = threshold_ms
+        self.size = size
+        self.explain = explain
+        self._lock = threading.Lock()
+        # Min-heap of (duration, seq, entry): the root is the fastest kept.
+        self._heap: list[tuple[float, int, SlowQuery]] = []
+        self._seq = itertools.count()
+
+    def observe(
+        self, conn, statement: str, parameters, executemany: bool, seconds: float
+    ) -> None:
+        duration_ms = seconds * 1000
+        if self.threshold_ms is None or duration_ms < self.threshold_ms:
+            return
+        entry = SlowQuery(
+            duration_ms=round(duration_ms, 3),
+            statement=statement,
+            parameters=_params_repr(parameters),
+            route=current_route(),
+            executemany=executemany,
+            recorded_at=time.time(),
+        )
+        if self.explain and not executemany:
+            entry.plan = explain(conn, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s params=%s plan=%s",
+            duration_ms,
+            entry.route or "-",
+            statement,
+            entry.parameters,
+            entry.plan,
+        )
+        self.record(entry)
+
+    def record(self, entry: SlowQuery) -> None:
+        if self.size <= 0:
+            return
+        item = (entry.duration_ms, next(self._seq), entry)
+        with self._lock:
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+
+    def entries(self) -> list[dict]:
+        """Kept statements, slowest first."""
+        with self._lock:
+            items = sorted(self._heap, reverse=True)
+        return [asdict(entry) for _, _, entry in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
@@ -1,20 +1,60 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import courses, enrollments, faculty, students, users
+from app.api import (
+    admin,
+    courses,
+    enrollments,
+    faculty,
+    metrics,
+    search,
+    students,
+    users,
+    waitlist,
+)
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.profiler import ProfilerMiddleware
+from app.core.responses import FastJSONResponse
+from app.db import group_commit
+from app.db.database import dispose_async_engine
 from app.db.init_db import init_db
 from app.core.error_handlers import register_error_handlers
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PASSWORD_HASH_WARMUP:
+        await run_in_threadpool(security.warmup)
+    yield
+    await run_in_threadpool(group_commit.writer.stop)
+    await dispose_async_engine()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 init_db()
 
+if settings.ASYNC_DB:
+    # Registered first so they shadow the sync versions of the same routes.
+    app.include_router(students.async_router)
+    app.include_router(faculty.async_router)
+    app.include_router(courses.async_router)
+    app.include_router(enrollments.async_router)
 app.include_router(users.router)
 app.include_router(users.auth_router)
 app.include_router(students.router)
 app.include_router(faculty.router)
 app.include_router(courses.router)
 app.include_router(enrollments.router)
+app.include_router(waitlist.router)
+app.include_router(search.router)
+app.include_router(admin.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 register_error_handlers(app)
 
 origins = [
@@ -32,6 +72,10 @@ app.add_middleware(
     allow_methods=["*"],            
     allow_headers=["*"],            
 )
+app.add_middleware(ProfilerMiddleware)
+if settings.METRICS_ENABLED:
+    # Added last so it is outermost and its timings include CORS handling.
+    app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
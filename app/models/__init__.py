@@ -8,6 +8,17 @@ from .student import Student  # noqa: F401,E402
 from .faculty import Faculty  # noqa: F401,E402
 from .course import Course  # noqa: F401,E402
 from .enrollment import Enrollment  # noqa: F401,E402
+from .waitlist import Waitlist  # noqa: F401,E402
+from .revision import TableRevision  # noqa: F401,E402
 
-__all__ = ["Base", "User", "Student", "Faculty", "Course", "Enrollment"]
+__all__ = [
+    "Base",
+    "User",
+    "Student",
+    "Faculty",
+    "Course",
+    "Enrollment",
+    "Waitlist",
+    "TableRevision",
+]
 
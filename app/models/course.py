@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, case
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from . import Base
@@ -10,8 +11,31 @@ class Course(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     credits = Column(Integer, default=3)
-    faculty_id = Column(Integer, ForeignKey("faculties.id"), nullable=False)
+    faculty_id = Column(Integer, ForeignKey("faculties.id"), nullable=False, index=True)
+    # NULL means no seat limit.
+    capacity = Column(Integer, nullable=True)
+    # Maintained by the enrollment writes; never recount on the request path.
+    enrolled_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped by the ORM on every UPDATE; feeds the HTTP ETags.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     faculty = relationship("Faculty", back_populates="courses")
     enrollments = relationship("Enrollment", back_populates="course")
 
+    __mapper_args__ = {"version_id_col": version}
+
+    @hybrid_property
+    def seats_remaining(self) -> int | None:
+        if self.capacity is None:
+            return None
+        return max(self.capacity - (self.enrolled_count or 0), 0)
+
+    @seats_remaining.inplace.expression
+    @classmethod
+    def _seats_remaining_expression(cls):
+        return case(
+            (cls.capacity.is_(None), None),
+            (cls.enrolled_count >= cls.capacity, 0),
+            else_=cls.capacity - cls.enrolled_count,
+        )
+
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from . import Base
@@ -6,10 +6,14 @@ from . import Base
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    # Also serves lookups by student_id alone (leftmost column).
+    __table_args__ = (
+        Index("ix_enrollments_student_course", "student_id", "course_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False, index=True)
     grade = Column(String, nullable=True)
 
     student = relationship("Student", back_populates="enrollments")
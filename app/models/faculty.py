@@ -10,6 +10,10 @@ class Faculty(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
+    # Bumped by the ORM on every UPDATE; feeds the HTTP ETags.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     courses = relationship("Course", back_populates="faculty")
 
+    __mapper_args__ = {"version_id_col": version}
+
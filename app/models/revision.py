@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+
+from . import Base
+
+
+class TableRevision(Base):
+    """Write counter of one table; see app.db.revisions."""
+
+    __tablename__ = "table_revisions"
+
+    table_name = Column(String, primary_key=True)
+    # Only ever incremented, so a value is never seen twice for one table.
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
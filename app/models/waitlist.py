@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+
+from . import Base
+
+
+class Waitlist(Base):
+    """One student queued for a full course, served in ``position`` order."""
+
+    __tablename__ = "waitlist"
+    __table_args__ = (
+        # The queue itself: the head and the tail are one index probe each.
+        Index("ix_waitlist_course_position", "course_id", "position", unique=True),
+        Index("ix_waitlist_course_student", "course_id", "student_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
+    position = Column(Integer, nullable=False)
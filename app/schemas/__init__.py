@@ -14,9 +14,19 @@ from .enrollment import (
     EnrollmentCreate,
     EnrollmentRead,
     EnrollmentList,
+    EnrollmentBulkCreate,
+    BulkEnrollmentStatus,
+    EnrollmentBulkRowResult,
+    EnrollmentBulkResult,
     GradeAssign,
     GradeEnum,
+    GradeEntry,
+    GradeBatch,
+    GradeEntryStatus,
+    GradeEntryResult,
+    GradeBatchResult,
 )
+from .waitlist import WaitlistRead
 
 __all__ = [
     "UserBase",
@@ -41,7 +51,17 @@ __all__ = [
     "EnrollmentCreate",
     "EnrollmentRead",
     "EnrollmentList",
+    "EnrollmentBulkCreate",
+    "BulkEnrollmentStatus",
+    "EnrollmentBulkRowResult",
+    "EnrollmentBulkResult",
     "GradeAssign",
     "GradeEnum",
+    "GradeEntry",
+    "GradeBatch",
+    "GradeEntryStatus",
+    "GradeEntryResult",
+    "GradeBatchResult",
+    "WaitlistRead",
 ]
 
@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CourseBase(BaseModel):
     name: str
     credits: int = 3
+    capacity: Optional[int] = Field(None, ge=0, description="Seat limit; null = none")
 
 
 class CourseCreate(CourseBase):
@@ -15,10 +16,13 @@ class CourseCreate(CourseBase):
 class CourseRead(CourseBase):
     id: int
     faculty_id: int
+    enrolled_count: int = 0
+    seats_remaining: Optional[int] = None
     model_config = ConfigDict(from_attributes=True)
 
 
 class CourseList(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[CourseRead]
+    next_cursor: Optional[str] = None
 
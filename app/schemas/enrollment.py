@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class EnrollmentBase(BaseModel):
@@ -20,8 +20,32 @@ class EnrollmentRead(EnrollmentBase):
 
 
 class EnrollmentList(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[EnrollmentRead]
+    next_cursor: Optional[str] = None
+
+
+class EnrollmentBulkCreate(BaseModel):
+    items: List[EnrollmentCreate] = Field(..., min_length=1, max_length=50_000)
+
+
+class BulkEnrollmentStatus(str, Enum):
+    created = "created"
+    duplicate = "duplicate"
+    student_not_found = "student_not_found"
+    course_not_found = "course_not_found"
+    course_full = "course_full"
+
+
+class EnrollmentBulkRowResult(EnrollmentBase):
+    index: int
+    status: BulkEnrollmentStatus
+    enrollment_id: Optional[int] = None
+
+
+class EnrollmentBulkResult(BaseModel):
+    created: int
+    results: List[EnrollmentBulkRowResult]
 
 
 class GradeEnum(str, Enum):
@@ -37,3 +61,40 @@ class GradeEnum(str, Enum):
 class GradeAssign(BaseModel):
     grade: GradeEnum
 
+
+
+class GradeEntry(BaseModel):
+    """One grade of a batch, addressed by enrollment or by student."""
+
+    enrollment_id: Optional[int] = None
+    student_id: Optional[int] = None
+    grade: GradeEnum
+
+    @model_validator(mode="after")
+    def one_target(self):
+        if (self.enrollment_id is None) == (self.student_id is None):
+            raise ValueError("Give exactly one of enrollment_id or student_id")
+        return self
+
+
+class GradeBatch(BaseModel):
+    items: List[GradeEntry] = Field(..., min_length=1, max_length=5_000)
+
+
+class GradeEntryStatus(str, Enum):
+    updated = "updated"
+    not_enrolled = "not_enrolled"
+    duplicate = "duplicate"
+
+
+class GradeEntryResult(BaseModel):
+    index: int
+    enrollment_id: Optional[int] = None
+    student_id: Optional[int] = None
+    grade: GradeEnum
+    status: GradeEntryStatus
+
+
+class GradeBatchResult(BaseModel):
+    updated: int
+    results: List[GradeEntryResult]
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, ConfigDict
 
@@ -18,6 +18,7 @@ class FacultyRead(FacultyBase):
 
 
 class FacultyList(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[FacultyRead]
+    next_cursor: Optional[str] = None
 
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, ConfigDict, Field
 
@@ -18,6 +18,7 @@ class StudentRead(StudentBase):
 
 
 class StudentList(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[StudentRead]
+    next_cursor: Optional[str] = None
 
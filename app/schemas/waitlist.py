@@ -0,0 +1,10 @@
+from pydantic import ConfigDict
+
+from .enrollment import EnrollmentBase
+
+
+class WaitlistRead(EnrollmentBase):
+    id: int
+    # Sort key within the course's queue; gaps are left by promotions.
+    position: int
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,327 @@
+"""
+Bulk loader for synthetic data and CSV/NDJSON exports.
+
+Generate a synthetic term, or ingest exported rows for any of the five
+tables (files are matched to tables by name, format by extension)::
+
+    python -m app.tools.seed generate --students 100000 --courses 5000 \\
+        --enrollments 2000000
+    python -m app.tools.seed ingest students=students.csv \\
+        enrollments=enrollments.ndjson
+
+Everything is loaded in one transaction with batched Core INSERTs. The
+secondary indexes and the FTS sync triggers are dropped first and rebuilt
+once at the end, and on SQLite the durability PRAGMAs are relaxed for the
+duration. Prints rows/sec per table as JSON.
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sqlalchemy import Table, inspect, insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.core.security import get_password_hash
+from app.crud.course import recount_enrollments
+from app.db import search
+
+# Parents before children so foreign keys always point at loaded rows.
+TABLES: dict[str, Table] = {
+    "users": models.User.__table__,
+    "faculty": models.Faculty.__table__,
+    "courses": models.Course.__table__,
+    "students": models.Student.__table__,
+    "enrollments": models.Enrollment.__table__,
+}
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_PASSWORD = "password123"
+GRADES = ("A", "A-", "B", "B-", "C", "D", "F")
+SUBJECTS = ("Algebra", "Biology", "Chemistry", "History", "Literature", "Physics")
+
+# PRAGMAs for the load; restored to the engine's tuned defaults afterwards.
+LOAD_PRAGMAS = {
+    "synchronous": "OFF",
+    "cache_size": "-262144",
+    "temp_store": "MEMORY",
+}
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _coerce(table: Table, row: dict) -> dict:
+    """Turn CSV strings into the column's Python type; blanks become NULL."""
+    values = {}
+    for key, value in row.items():
+        if key not in table.c:
+            continue
+        if isinstance(value, str):
+            python_type = table.c[key].type.python_type
+            if value == "":
+                value = None
+            elif python_type is bool:
+                value = value.strip().lower() in ("1", "true", "t", "yes")
+            elif python_type in (int, float):
+                value = python_type(value)
+        values[key] = value
+    return values
+
+
+def read_rows(path: Path, table: Table) -> Iterator[dict]:
+    """Rows of a ``.csv`` or ``.ndjson``/``.jsonl`` file, typed for ``table``."""
+    hashes: dict[str, str] = {}
+    with path.open(newline="", encoding="utf-8") as fh:
+        if path.suffix == ".csv":
+            records = csv.DictReader(fh)
+        elif path.suffix in (".ndjson", ".jsonl"):
+            records = (json.loads(line) for line in fh if line.strip())
+        else:
+            raise ValueError(f"{path}: expected a .csv, .ndjson or .jsonl file")
+        for record in records:
+            # Exports normally carry password_hash; plain passwords get hashed
+            # once per distinct value, which is slow for unique passwords.
+            if table.name == "users" and "password_hash" not in record:
+                password = record.pop("password", DEFAULT_PASSWORD)
+                if password not in hashes:
+                    hashes[password] = get_password_hash(password)
+                record["password_hash"] = hashes[password]
+            yield _coerce(table, record)
+
+
+def generate_rows(
+    counts: dict[str, int], rng: random.Random, password: str = DEFAULT_PASSWORD
+) -> dict[str, Iterator[dict]]:
+    """
+    Synthetic rows per table. Ids are assumed to start at 1 (an empty
+    database); enrollments are spread evenly, each pair unique.
+    """
+    students, courses = counts["students"], counts["courses"]
+    faculty = counts["faculty"]
+    if counts["enrollments"] and not (students and courses):
+        raise ValueError("Enrollments need at least one student and one course")
+    if courses and not faculty:
+        raise ValueError("Courses need at least one faculty member")
+    password_hash = get_password_hash(password)
+
+    def users():
+        for i in range(counts["users"]):
+            role = "admin" if i == 0 else "faculty" if i % 50 == 1 else "student"
+            yield {
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password_hash": password_hash,
+                "role": role,
+            }
+
+    def enrollments():
+        per_student, extra = divmod(counts["enrollments"], students or 1)
+        if per_student + (extra > 0) > courses:
+            raise ValueError("More enrollments than (student, course) pairs")
+        for student_id in range(1, students + 1):
+            taken = per_student + (student_id <= extra)
+            for course_id in rng.sample(range(1, courses + 1), taken):
+                yield {
+                    "student_id": student_id,
+                    "course_id": course_id,
+                    "grade": rng.choice(GRADES + (None,)),
+                }
+
+    return {
+        "users": users(),
+        "faculty": (
+            {"name": f"Prof {i:05d}", "email": f"prof{i}@example.edu"}
+            for i in range(faculty)
+        ),
+        "courses": (
+            {
+                "name": f"{SUBJECTS[i % len(SUBJECTS)]} {100 + i}",
+                "credits": 1 + i % 5,
+                "faculty_id": 1 + i % max(faculty, 1),
+            }
+            for i in range(courses)
+        ),
+        "students": (
+            {"name": f"Student {i:07d}", "email": f"student{i}@example.edu"}
+            for i in range(students)
+        ),
+        "enrollments": enrollments(),
+    }
+
+
+@contextmanager
+def load_pragmas(conn: Connection):
+    """Relax SQLite durability for the load (a crash means reloading anyway)."""
+    if conn.dialect.name != "sqlite":
+        yield
+        return
+    previous = {
+        name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in LOAD_PRAGMAS
+    }
+    for name, value in LOAD_PRAGMAS.items():
+        conn.exec_driver_sql(f"PRAGMA {name}={value}")
+    conn.commit()
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            conn.exec_driver_sql(f"PRAGMA {name}={value}")
+        conn.commit()
+
+
+def _has_search_indexes(conn: Connection) -> bool:
+    if conn.dialect.name != "sqlite":
+        return False
+    return inspect(conn).has_table("students_fts")
+
+
+def _insert_all(
+    conn: Connection, table: Table, rows: Iterable[dict], batch_size: int
+) -> dict:
+    start = time.perf_counter()
+    count = 0
+    for batch in batched(rows, batch_size):
+        conn.execute(insert(table), batch)
+        count += len(batch)
+    seconds = time.perf_counter() - start
+    return {
+        "rows": count,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(count / seconds) if seconds else count,
+    }
+
+
+def load(
+    engine: Engine,
+    sources: dict[str, Iterable[dict]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict:
+    """Insert ``sources`` (table name -> rows) and return per-table timings."""
+    report = {"tables": {}}
+    started = time.perf_counter()
+    indexes = [
+        index
+        for name, table in TABLES.items()
+        if name in sources
+        for index in table.indexes
+    ]
+    rebuild_search = False
+    with engine.connect() as conn, load_pragmas(conn):
+        try:
+            with conn.begin():
+                for index in indexes:
+                    index.drop(conn, checkfirst=True)
+                rebuild_search = _has_search_indexes(conn)
+                if rebuild_search:
+                    search.drop_search_triggers(conn)
+
+                for name, table in TABLES.items():
+                    if name in sources:
+                        report["tables"][name] = _insert_all(
+                            conn, table, sources[name], batch_size
+                        )
+
+                start = time.perf_counter()
+                for index in indexes:
+                    index.create(conn)
+                report["index_seconds"] = round(time.perf_counter() - start, 3)
+                if "courses" in sources or "enrollments" in sources:
+                    # Counted once, with the indexes in place, rather than per inserted row.
+                    start = time.perf_counter()
+                    conn.execute(recount_enrollments())
+                    report["recount_seconds"] = round(time.perf_counter() - start, 3)
+                if rebuild_search:
+                    start = time.perf_counter()
+                    search.rebuild_search_indexes(conn)
+                    report["search_index_seconds"] = round(
+                        time.perf_counter() - start, 3
+                    )
+        except Exception:
+            # pysqlite runs the DROPs outside the transaction, so they survive
+            # the rollback; put the indexes and triggers back before failing.
+            with conn.begin():
+                for index in indexes:
+                    index.create(conn, checkfirst=True)
+                if rebuild_search:
+                    search.rebuild_search_indexes(conn)
+            raise
+
+    total_rows = sum(table["rows"] for table in report["tables"].values())
+    seconds = time.perf_counter() - started
+    report["total_rows"] = total_rows
+    report["total_seconds"] = round(seconds, 3)
+    report["rows_per_second"] = round(total_rows / seconds) if seconds else total_rows
+    return report
+
+
+def parse_sources(specs: list[str]) -> dict[str, Iterable[dict]]:
+    sources = {}
+    for spec in specs:
+        name, sep, path = spec.partition("=")
+        if not sep or name not in TABLES:
+            raise ValueError(
+                f"Expected <table>=<path> with table one of {', '.join(TABLES)}: {spec}"
+            )
+        sources[name] = read_rows(Path(path), TABLES[name])
+    return sources
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.tools.seed", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Load synthetic rows")
+    generate.add_argument("--users", type=int, default=100)
+    generate.add_argument("--faculty", type=int, default=50)
+    generate.add_argument("--courses", type=int, default=500)
+    generate.add_argument("--students", type=int, default=10_000)
+    generate.add_argument("--enrollments", type=int, default=50_000)
+    generate.add_argument("--password", default=DEFAULT_PASSWORD)
+    generate.add_argument("--seed", type=int, default=0)
+
+    ingest = commands.add_parser("ingest", help="Load CSV/NDJSON exports")
+    ingest.add_argument("sources", nargs="+", metavar="TABLE=PATH")
+    args = parser.parse_args(argv)
+
+    from app.db.database import engine
+    from app.db.init_db import init_db
+    from app.db.slow_query import slow_query_log
+
+    init_db()
+    # Index builds over millions of rows are slow by design; don't log them.
+    slow_query_log.threshold_ms = None
+    try:
+        if args.command == "generate":
+            counts = {name: getattr(args, name) for name in TABLES}
+            sources = generate_rows(counts, random.Random(args.seed), args.password)
+        else:
+            sources = parse_sources(args.sources)
+        report = load(engine, sources, batch_size=args.batch_size)
+    except (OSError, ValueError, IntegrityError) as exc:
+        parser.exit(2, f"error: {exc}\n")
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Write throughput with and without group commit.
+
+``--threads`` workers each create ``--writes`` students, first committing one
+transaction per write (the default request path), then through the
+group-commit writer. Runs against a throwaway SQLite file::
+
+    python -m tests.bench.bench_group_commit --threads 32 --writes 200
+    python -m tests.bench.bench_group_commit --synchronous FULL
+
+Prints writes/sec, commits and per-write p50/p99 latency for both modes as JSON.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    samples = sorted(samples)
+    return round(samples[min(len(samples) - 1, int(len(samples) * pct))], 3)
+
+
+def drive(write, threads: int, writes: int) -> dict:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    start_line = threading.Barrier(threads + 1)
+
+    def worker(worker_id: int) -> None:
+        local = []
+        start_line.wait()
+        for i in range(writes):
+            began = time.perf_counter()
+            write(f"w{worker_id}-{i}")
+            local.append((time.perf_counter() - began) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    seconds = time.perf_counter() - start
+    return {
+        "writes": len(latencies),
+        "seconds": round(seconds, 3),
+        "writes_per_second": round(len(latencies) / seconds, 1),
+        "p50_ms": percentile(latencies, 0.50),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=200, help="Per thread")
+    parser.add_argument("--max-batch", type=int, default=128)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    parser.add_argument(
+        "--synchronous",
+        choices=("OFF", "NORMAL", "FULL"),
+        default="NORMAL",
+        help="SQLite PRAGMA synchronous; FULL fsyncs every commit",
+    )
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/writes.db"
+    os.environ.setdefault("SQLITE_BUSY_TIMEOUT_MS", "60000")
+    os.environ.setdefault("DB_POOL_SIZE", str(args.threads + 1))
+
+    from sqlalchemy import event
+
+    from app import schemas
+    from app.crud import student as student_crud
+    from app.db.database import SessionLocal, engine
+    from app.db.group_commit import GroupCommitter
+    from app.db.init_db import init_db
+    from app.db.slow_query import slow_query_log
+
+    @event.listens_for(engine, "connect")
+    def set_synchronous(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"PRAGMA synchronous={args.synchronous}")
+
+    commits = [0]
+
+    @event.listens_for(engine, "commit")
+    def count_commit(conn):
+        commits[0] += 1
+
+    init_db()
+    slow_query_log.threshold_ms = None
+
+    def student(tag: str) -> schemas.StudentCreate:
+        return schemas.StudentCreate(name=tag, email=f"{tag}@{mode}.example.edu")
+
+    report = {"threads": args.threads, "synchronous": args.synchronous}
+
+    mode = "direct"
+
+    def direct(tag: str) -> None:
+        with SessionLocal() as db:
+            student_crud.create_student(db, student(tag))
+
+    commits[0] = 0
+    report[mode] = drive(direct, args.threads, args.writes)
+    report[mode]["commits"] = commits[0]
+
+    mode = "group"
+    writer = GroupCommitter(
+        SessionLocal, max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000
+    )
+    commits[0] = 0
+    report[mode] = drive(
+        lambda tag: writer.run(student_crud.create_student, student(tag)),
+        args.threads,
+        args.writes,
+    )
+    writer.stop()
+    report[mode]["commits"] = commits[0]
+    report["speedup"] = round(
+        report["group"]["writes_per_second"] / report["direct"]["writes_per_second"], 2
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,548 @@
+"""
+Load benchmark: seeds a database and drives representative request mixes.
+
+Scenarios (pick with ``--scenario``, repeatable; default all):
+
+* ``login``        token storms, mostly valid credentials
+* ``catalog``      course/faculty browsing, search and ETag revalidation
+* ``registration`` enrollment bursts, bulk enrollment and grade look-ups
+* ``grades``       faculty grade entry and course grade reports
+* ``admin``        user listing, pool/cache stats and /metrics scrapes
+
+By default the app runs in-process over ``httpx.ASGITransport`` against a
+fresh SQLite file; ``--base-url`` targets a running server instead (seed
+the same ``--database-url`` it uses and pass ``--no-seed`` on reruns)::
+
+    python -m tests.bench.bench_load --preset smoke
+    python -m tests.bench.bench_load --preset default --output run.json
+    python -m tests.bench.bench_load --baseline run.json --max-regression 0.2
+
+Prints throughput and p50/p95/p99 per endpoint as JSON. With
+``--baseline`` it exits 1 when an endpoint's p95 or a scenario's throughput
+regressed by more than ``--max-regression``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+PRESETS = {
+    "smoke": {
+        "students": 2_000,
+        "faculty": 50,
+        "courses": 200,
+        "enrollments": 10_000,
+        "users": 50,
+    },
+    "default": {
+        "students": 100_000,
+        "faculty": 500,
+        "courses": 5_000,
+        "enrollments": 2_000_000,
+        "users": 1_000,
+    },
+}
+
+PASSWORD = "bench-password"
+GRADES = ("A", "A-", "B", "B-", "C", "D", "F")
+SEARCH_TERMS = ("Algebra", "Physics", "Student 0001", "Prof 01", "History", "Lab")
+# app.tools.seed makes user0 an admin and user1 faculty; all share PASSWORD.
+ADMIN_USER, FACULTY_USER = "user0", "user1"
+
+# Ignore p95 moves smaller than this; sub-millisecond endpoints are noisy.
+NOISE_FLOOR_MS = 2.0
+
+
+def seed_database(scale: dict, rng: random.Random) -> dict:
+    """Load ``scale`` rows through the bulk loader; returns its report."""
+    from app.db.database import engine
+    from app.tools import seed
+
+    return seed.load(engine, seed.generate_rows(scale, rng, PASSWORD))
+
+
+@dataclass
+class Call:
+    endpoint: str  # "<METHOD> <route template>", the report key
+    url: str
+    expected: tuple = (200,)
+    kwargs: dict = field(default_factory=dict)
+    token: str | None = None
+    # Remember the response ETag under this course id (for revalidation).
+    etag_for: int | None = None
+
+    @property
+    def method(self) -> str:
+        return self.endpoint.split(" ", 1)[0]
+
+
+@dataclass
+class Context:
+    scale: dict
+    tokens: dict
+    etags: dict = field(default_factory=dict)
+
+    def student(self, rng) -> int:
+        return rng.randint(1, self.scale["students"])
+
+    def course(self, rng) -> int:
+        return rng.randint(1, self.scale["courses"])
+
+    def faculty(self, rng) -> int:
+        return rng.randint(1, self.scale["faculty"])
+
+    def enrollment(self, rng) -> int:
+        return rng.randint(1, self.scale["enrollments"])
+
+
+def login(ctx, rng):
+    user = f"user{rng.randrange(ctx.scale['users'])}"
+    return Call(
+        "POST /token",
+        "/token",
+        kwargs={"data": {"username": user, "password": PASSWORD}},
+    )
+
+
+def login_wrong_password(ctx, rng):
+    user = f"user{rng.randrange(ctx.scale['users'])}"
+    return Call(
+        "POST /token [bad password]",
+        "/token",
+        expected=(400,),
+        kwargs={"data": {"username": user, "password": "wrong"}},
+    )
+
+
+def course_page(ctx, rng):
+    skip = rng.randrange(0, min(ctx.scale["courses"], 2_000), 20)
+    return Call("GET /courses/", f"/courses/?skip={skip}&limit=20")
+
+
+def courses_by_faculty(ctx, rng):
+    return Call(
+        "GET /courses/?faculty_id", f"/courses/?faculty_id={ctx.faculty(rng)}"
+    )
+
+
+def course_detail(ctx, rng):
+    return Call("GET /courses/{course_id}", f"/courses/{ctx.course(rng)}")
+
+
+def course_revalidate(ctx, rng):
+    course_id = rng.randint(1, min(ctx.scale["courses"], 50))
+    etag = ctx.etags.get(course_id)
+    headers = {"If-None-Match": etag} if etag else {}
+    return Call(
+        "GET /courses/{course_id} [If-None-Match]",
+        f"/courses/{course_id}",
+        expected=(200, 304),
+        kwargs={"headers": headers},
+        etag_for=course_id,
+    )
+
+
+def faculty_page(ctx, rng):
+    return Call("GET /faculty/", "/faculty/?limit=20")
+
+
+def faculty_detail(ctx, rng):
+    return Call("GET /faculty/{faculty_id}", f"/faculty/{ctx.faculty(rng)}")
+
+
+def search_courses(ctx, rng):
+    return Call("GET /search/courses", f"/search/courses?q={rng.choice(SEARCH_TERMS)}")
+
+
+def search_students(ctx, rng):
+    return Call(
+        "GET /search/students", f"/search/students?q={rng.choice(SEARCH_TERMS)}"
+    )
+
+
+def students_by_name(ctx, rng):
+    return Call(
+        "GET /students/?name", f"/students/?name=Student {rng.randrange(10_000):04d}"
+    )
+
+
+def student_detail(ctx, rng):
+    return Call("GET /students/{student_id}", f"/students/{ctx.student(rng)}")
+
+
+def enroll(ctx, rng):
+    return Call(
+        "POST /enrollments/",
+        "/enrollments/",
+        # 429 is admission control shedding load, which is by design.
+        expected=(200, 409, 429),
+        kwargs={
+            "json": {"student_id": ctx.student(rng), "course_id": ctx.course(rng)}
+        },
+    )
+
+
+def enroll_bulk(ctx, rng):
+    course_id = ctx.course(rng)
+    items = [
+        {"student_id": ctx.student(rng), "course_id": course_id} for _ in range(25)
+    ]
+    return Call(
+        "POST /enrollments/bulk",
+        "/enrollments/bulk",
+        expected=(200, 429),
+        kwargs={"json": {"items": items}},
+    )
+
+
+def student_grades(ctx, rng):
+    return Call(
+        "GET /students/{student_id}/grades/", f"/students/{ctx.student(rng)}/grades/"
+    )
+
+
+def enrollments_by_student(ctx, rng):
+    return Call(
+        "GET /enrollments/filter/?student_id",
+        f"/enrollments/filter/?student_id={ctx.student(rng)}",
+    )
+
+
+def enrollments_by_course(ctx, rng):
+    return Call(
+        "GET /enrollments/filter/?course_id",
+        f"/enrollments/filter/?course_id={ctx.course(rng)}",
+    )
+
+
+def enrollment_detail(ctx, rng):
+    return Call(
+        "GET /enrollments/{enrollment_id}",
+        f"/enrollments/{ctx.enrollment(rng)}",
+        expected=(200, 404),
+    )
+
+
+def assign_grade(ctx, rng):
+    return Call(
+        "PUT /enrollments/{enrollment_id}/grade",
+        f"/enrollments/{ctx.enrollment(rng)}/grade",
+        expected=(200, 404),
+        kwargs={"json": {"grade": rng.choice(GRADES)}},
+        token=ctx.tokens["faculty"],
+    )
+
+
+def grade_section(ctx, rng):
+    # Random students: most are not in the section and come back not_enrolled.
+    items = [
+        {"student_id": ctx.student(rng), "grade": rng.choice(GRADES)}
+        for _ in range(100)
+    ]
+    return Call(
+        "PUT /courses/{course_id}/grades",
+        f"/courses/{ctx.course(rng)}/grades",
+        kwargs={"json": {"items": items}},
+        token=ctx.tokens["faculty"],
+    )
+
+
+def grade_report(ctx, rng):
+    return Call(
+        "GET /enrollments/reports/course/{course_id}/grades",
+        f"/enrollments/reports/course/{ctx.course(rng)}/grades",
+        token=ctx.tokens["faculty"],
+    )
+
+
+def grade_report_csv(ctx, rng):
+    return Call(
+        "GET /enrollments/reports/course/{course_id}/grades?format=csv",
+        f"/enrollments/reports/course/{ctx.course(rng)}/grades?format=csv",
+        token=ctx.tokens["faculty"],
+    )
+
+
+def list_users(ctx, rng):
+    return Call("GET /users/", "/users/", token=ctx.tokens["admin"])
+
+
+def pool_status(ctx, rng):
+    return Call("GET /admin/db/pool", "/admin/db/pool", token=ctx.tokens["admin"])
+
+
+def cache_stats(ctx, rng):
+    return Call("GET /admin/cache", "/admin/cache", token=ctx.tokens["admin"])
+
+
+def scrape_metrics(ctx, rng):
+    return Call("GET /metrics", "/metrics")
+
+
+# Scenario -> [(weight, call factory)].
+SCENARIOS = {
+    "login": [(9, login), (1, login_wrong_password)],
+    "catalog": [
+        (4, course_page),
+        (2, courses_by_faculty),
+        (3, course_detail),
+        (2, course_revalidate),
+        (1, faculty_page),
+        (2, faculty_detail),
+        (2, search_courses),
+        (1, search_students),
+        (1, students_by_name),
+        (1, student_detail),
+    ],
+    "registration": [
+        (6, enroll),
+        (1, enroll_bulk),
+        (2, student_grades),
+        (1, enrollments_by_student),
+        (2, course_detail),
+    ],
+    "grades": [
+        (6, assign_grade),
+        (1, grade_section),
+        (1, grade_report),
+        (1, grade_report_csv),
+        (2, enrollments_by_course),
+        (1, enrollment_detail),
+    ],
+    "admin": [
+        (1, list_users),
+        (2, pool_status),
+        (2, cache_stats),
+        (2, scrape_metrics),
+    ],
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def add(self, seconds: float, status, ok: bool) -> None:
+        self.latencies.append(seconds * 1000)
+        self.statuses[str(status)] += 1
+        self.errors += not ok
+
+    def summary(self) -> dict:
+        values = sorted(self.latencies)
+        return {
+            "count": len(values),
+            "errors": self.errors,
+            "statuses": dict(self.statuses),
+            "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "p99_ms": round(percentile(values, 99), 3),
+        }
+
+
+async def run_scenario(client, ctx, name, requests, concurrency, seed) -> dict:
+    import httpx
+
+    ops = SCENARIOS[name]
+    weights = [weight for weight, _ in ops]
+    factories = [factory for _, factory in ops]
+    stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+    remaining = requests
+
+    async def worker(rng: random.Random):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            call = rng.choices(factories, weights)[0](ctx, rng)
+            headers = dict(call.kwargs.pop("headers", {}))
+            if call.token:
+                headers["Authorization"] = f"Bearer {call.token}"
+            start = time.perf_counter()
+            try:
+                resp = await client.request(
+                    call.method, call.url, headers=headers, **call.kwargs
+                )
+                status = resp.status_code
+            except httpx.HTTPError as exc:
+                resp, status = None, type(exc).__name__
+            elapsed = time.perf_counter() - start
+            stats[call.endpoint].add(elapsed, status, status in call.expected)
+            if call.etag_for is not None and resp is not None:
+                ctx.etags[call.etag_for] = resp.headers.get("etag")
+
+    master = random.Random(seed)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(worker(random.Random(master.random())) for _ in range(concurrency))
+    )
+    duration = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": sum(s.errors for s in stats.values()),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(requests / duration, 1),
+        "endpoints": {key: stats[key].summary() for key in sorted(stats)},
+    }
+
+
+async def fetch_token(client, username: str) -> str:
+    resp = await client.post(
+        "/token", data={"username": username, "password": PASSWORD}
+    )
+    resp.raise_for_status()
+    return resp.json()["access_token"]
+
+
+async def run(args, scale: dict) -> dict:
+    import httpx
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        )
+    async with client:
+        ctx = Context(
+            scale=scale,
+            tokens={
+                "admin": await fetch_token(client, ADMIN_USER),
+                "faculty": await fetch_token(client, FACULTY_USER),
+            },
+        )
+        results = {}
+        for name in args.scenario or list(SCENARIOS):
+            results[name] = await run_scenario(
+                client, ctx, name, args.requests, args.concurrency, args.seed
+            )
+    if not args.base_url:
+        # ASGITransport skips the app's lifespan, which would close the pool.
+        from app.db.database import dispose_async_engine
+
+        await dispose_async_engine()
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Human-readable regressions of ``report`` against ``baseline``."""
+    regressions = []
+    for name, old in baseline.get("scenarios", {}).items():
+        new = report["scenarios"].get(name)
+        if new is None:
+            continue
+        if new["throughput_rps"] < old["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {old['throughput_rps']} -> "
+                f"{new['throughput_rps']} req/s"
+            )
+        for endpoint, old_stats in old["endpoints"].items():
+            new_stats = new["endpoints"].get(endpoint)
+            if new_stats is None:
+                continue
+            before, after = old_stats["p95_ms"], new_stats["p95_ms"]
+            if after > before * (1 + tolerance) and after - before > NOISE_FLOOR_MS:
+                regressions.append(
+                    f"{name}: {endpoint} p95 {before} -> {after} ms"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="smoke")
+    for key in PRESETS["default"]:
+        parser.add_argument(f"--{key}", type=int, help=f"Override the preset's {key}")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1_000, help="Per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--database-url", help="Default: a fresh temp SQLite file")
+    parser.add_argument("--base-url", help="Drive a running server over HTTP")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse seeded data")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    parser.add_argument("--baseline", help="Report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    if args.base_url and not (args.database_url or args.no_seed):
+        parser.error("--base-url needs the server's --database-url (or --no-seed)")
+
+    scale = dict(PRESETS[args.preset])
+    for key in scale:
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DATABASE_URL"] = (
+        args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    )
+
+    from app.db.init_db import init_db
+
+    init_db()
+    seed_report = None
+    if not args.no_seed:
+        seed_report = seed_database(scale, random.Random(args.seed))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "preset": args.preset,
+            "scale": scale,
+            "seed": seed_report,
+            "requests_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "target": args.base_url or "in-process",
+            "async_db": os.environ.get("ASYNC_DB", ""),
+        },
+        "scenarios": asyncio.run(run(args, scale)),
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.max_regression)
+        report["regressions"] = regressions
+        status = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Name/email search benchmark: the FTS5 trigram index against the old
+``ILIKE '%term%'`` scan.
+
+Seeds a throwaway SQLite database with ``--students`` rows (1M by default)
+and times the same filters both ways::
+
+    python -m tests.bench.bench_search --students 1000000 --repeat 20
+
+Prints per-query median/p95 latency in milliseconds as JSON.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def timed(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)], 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/search.db"
+
+    from sqlalchemy import insert, select
+
+    from app import models
+    from app.db import search
+    from app.db.database import SessionLocal, engine
+    from app.db.init_db import init_db
+
+    init_db()
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        search.drop_search_triggers(conn)
+        batch = []
+        for i in range(args.students):
+            batch.append(
+                {
+                    "name": f"Student {i:07d} Q{i % 977}",
+                    "email": f"s{i}@uni{i % 53}.edu",
+                }
+            )
+            if len(batch) == 50_000:
+                conn.execute(insert(models.Student), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(models.Student), batch)
+        search.rebuild_search_indexes(conn)
+    load_seconds = time.perf_counter() - start
+
+    # A rare term (few matches) and a common one (~0.1% of rows).
+    terms = {"rare": f"{args.students // 2:07d}", "common": "Q976"}
+    report = {
+        "students": args.students,
+        "load_seconds": round(load_seconds, 2),
+        "queries": {},
+    }
+    with SessionLocal() as db:
+        for label, term in terms.items():
+            def ilike_page():
+                db.scalars(
+                    select(models.Student)
+                    .where(models.Student.name.ilike(f"%{term}%"))
+                    .order_by(models.Student.id)
+                    .limit(args.page_size)
+                ).all()
+
+            def fts_page(mode=search.SearchMode.contains):
+                db.scalars(
+                    select(models.Student)
+                    .where(search.text_filter(models.Student, "name", term, mode))
+                    .order_by(models.Student.id)
+                    .limit(args.page_size)
+                ).all()
+
+            def ranked():
+                search.ranked_search(db, models.Student, term, limit=args.page_size)
+
+            report["queries"][label] = {
+                "term": term,
+                "ilike": timed(ilike_page, args.repeat),
+                "fts_contains": timed(fts_page, args.repeat),
+                "fts_ranked": timed(ranked, args.repeat),
+            }
+        report["queries"]["prefix"] = {
+            "term": "Student 00001",
+            "ilike": timed(
+                lambda: db.scalars(
+                    select(models.Student)
+                    .where(models.Student.name.ilike("Student 00001%"))
+                    .order_by(models.Student.id)
+                    .limit(args.page_size)
+                ).all(),
+                args.repeat,
+            ),
+            "fts_prefix": timed(
+                lambda: db.scalars(
+                    select(models.Student)
+                    .where(
+                        search.text_filter(
+                            models.Student,
+                            "name",
+                            "Student 00001",
+                            search.SearchMode.prefix,
+                        )
+                    )
+                    .order_by(models.Student.id)
+                    .limit(args.page_size)
+                ).all(),
+                args.repeat,
+            ),
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Startup-time benchmark: fresh interpreter -> ``import app.main`` -> first
+request served.
+
+Each run happens in its own subprocess against a throwaway SQLite file so
+import caches and an existing database do not flatter the numbers::
+
+    python -m tests.bench.bench_startup --runs 10 --max-ms 1500
+
+Prints a JSON summary; with ``--max-ms`` it exits non-zero when the median
+time to first response is above the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client_ready = time.perf_counter()
+response = TestClient(app).get("/")
+served = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (served - client_ready) * 1000,
+    "total_ms": ((served - start) - (client_ready - imported)) * 1000,
+}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(values: list[float]) -> dict:
+    return {
+        "min": round(min(values), 2),
+        "median": round(statistics.median(values), 2),
+        "max": round(max(values), 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="fail if the median import-to-first-response time exceeds this",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            env = dict(os.environ)
+            env.setdefault("SECRET_KEY", "bench")
+            env["DATABASE_URL"] = f"sqlite:///{tmp}/startup_{i}.db"
+            results.append(run_once(env))
+
+    report = {
+        "runs": args.runs,
+        **{
+            key: summarize([r[key] for r in results])
+            for key in ("import_ms", "first_request_ms", "total_ms")
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if args.max_ms is not None and report["total_ms"]["median"] > args.max_ms:
+        print(
+            f"startup regression: median {report['total_ms']['median']} ms "
+            f"> budget {args.max_ms} ms",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
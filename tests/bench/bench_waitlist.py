@@ -0,0 +1,248 @@
+"""
+Add/drop week benchmark: waitlist promotion throughput under concurrent drops.
+
+Seeds a throwaway SQLite database with ``--courses`` full sections of
+``--capacity`` seats, each with ``--queued`` students on its waitlist, then
+has ``--workers`` threads drop random enrollments (each drop promotes the
+head of that course's queue in the same transaction) while a share of the
+operations (``--add-ratio``) are new students enrolling or queueing::
+
+    python -m tests.bench.bench_waitlist --courses 200 --operations 20000
+    python -m tests.bench.bench_waitlist --workers 16 --add-ratio 0.5
+
+Prints throughput, promotions/sec and per-operation latency as JSON, then
+checks every course's invariants (the seat count matches its enrollments and
+stays within capacity, nobody is both enrolled and queued) and exits 1 if
+any is broken.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return round(samples[min(len(samples) - 1, int(len(samples) * pct))], 3)
+
+
+def seed(args, models, engine) -> tuple[list[int], list[int]]:
+    """Full courses with queues; returns (enrollment ids, spare student ids)."""
+    from sqlalchemy import insert, select
+
+    per_course = args.capacity + args.queued
+    # Every course draws from its own block of students, plus spares for adds.
+    students = args.courses * per_course + args.spare_students
+    with engine.begin() as conn:
+        conn.execute(insert(models.Faculty), [{"name": "Prof", "email": "p@x.edu"}])
+        conn.execute(
+            insert(models.Student),
+            [
+                {"name": f"Student {i:07d}", "email": f"s{i}@example.edu"}
+                for i in range(students)
+            ],
+        )
+        conn.execute(
+            insert(models.Course),
+            [
+                {
+                    "name": f"Section {i}",
+                    "credits": 3,
+                    "faculty_id": 1,
+                    "capacity": args.capacity,
+                    "enrolled_count": args.capacity,
+                }
+                for i in range(args.courses)
+            ],
+        )
+        enrollments, queued = [], []
+        for course in range(args.courses):
+            first = course * per_course + 1
+            for seat in range(args.capacity):
+                enrollments.append(
+                    {"student_id": first + seat, "course_id": course + 1}
+                )
+            for position in range(1, args.queued + 1):
+                queued.append(
+                    {
+                        "student_id": first + args.capacity + position - 1,
+                        "course_id": course + 1,
+                        "position": position,
+                    }
+                )
+        conn.execute(insert(models.Enrollment), enrollments)
+        if queued:
+            conn.execute(insert(models.Waitlist), queued)
+        enrollment_ids = conn.scalars(select(models.Enrollment.id)).all()
+    spares = list(range(args.courses * per_course + 1, students + 1))
+    return list(enrollment_ids), spares
+
+
+def check_invariants(db, models) -> list[str]:
+    from sqlalchemy import func, select
+
+    problems = []
+    counts = dict(
+        db.execute(
+            select(models.Enrollment.course_id, func.count()).group_by(
+                models.Enrollment.course_id
+            )
+        ).all()
+    )
+    for course_id, capacity, enrolled in db.execute(
+        select(models.Course.id, models.Course.capacity, models.Course.enrolled_count)
+    ):
+        actual = counts.get(course_id, 0)
+        if enrolled != actual:
+            problems.append(f"course {course_id}: enrolled_count {enrolled} != {actual}")
+        if capacity is not None and actual > capacity:
+            problems.append(f"course {course_id}: {actual} enrolled > {capacity}")
+    both = db.scalar(
+        select(func.count())
+        .select_from(models.Waitlist)
+        .join(
+            models.Enrollment,
+            (models.Enrollment.course_id == models.Waitlist.course_id)
+            & (models.Enrollment.student_id == models.Waitlist.student_id),
+        )
+    )
+    if both:
+        problems.append(f"{both} students are both enrolled and queued")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--queued", type=int, default=100)
+    parser.add_argument("--spare-students", type=int, default=5_000)
+    parser.add_argument("--operations", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--add-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/waitlist.db"
+    # Drops contend on the database write lock; give them room to queue.
+    os.environ.setdefault("SQLITE_BUSY_TIMEOUT_MS", "30000")
+    os.environ.setdefault("DB_POOL_SIZE", str(args.workers))
+
+    from sqlalchemy.exc import IntegrityError
+
+    from app import models, schemas
+    from app.crud import enrollment as enrollment_crud
+    from app.crud import waitlist as waitlist_crud
+    from app.db.database import SessionLocal, engine
+    from app.db.init_db import init_db
+    from app.db.slow_query import slow_query_log
+
+    init_db()
+    slow_query_log.threshold_ms = None
+    start = time.perf_counter()
+    enrollment_ids, spares = seed(args, models, engine)
+    seed_seconds = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    rng.shuffle(spares)
+    lock = threading.Lock()
+    remaining = [args.operations]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    outcomes: dict[str, int] = defaultdict(int)
+
+    def drop(db) -> str:
+        with lock:
+            if not enrollment_ids:
+                return "idle"
+            enrollment_id = enrollment_ids.pop(rng.randrange(len(enrollment_ids)))
+        db_enrollment = db.get(models.Enrollment, enrollment_id)
+        promoted = enrollment_crud.delete_enrollment(db, db_enrollment)
+        if promoted is None:
+            return "drop"
+        with lock:
+            enrollment_ids.append(promoted)
+        return "drop_promoted"
+
+    def add(db) -> str:
+        with lock:
+            if not spares:
+                return "idle"
+            student_id = spares.pop()
+            course_id = rng.randint(1, args.courses)
+        request = schemas.EnrollmentCreate(student_id=student_id, course_id=course_id)
+        try:
+            db_enrollment = enrollment_crud.create_enrollment(db, request)
+        except enrollment_crud.CourseFullError:
+            waitlist_crud.join_waitlist(db, request)
+            return "add_queued"
+        except IntegrityError:
+            return "add_conflict"
+        with lock:
+            enrollment_ids.append(db_enrollment.id)
+        return "add_enrolled"
+
+    def worker(worker_rng: random.Random) -> None:
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            operation = add if worker_rng.random() < args.add_ratio else drop
+            began = time.perf_counter()
+            with SessionLocal() as db:
+                outcome = operation(db)
+            elapsed_ms = (time.perf_counter() - began) * 1000
+            with lock:
+                outcomes[outcome] += 1
+                latencies[operation.__name__].append(elapsed_ms)
+
+    threads = [
+        threading.Thread(target=worker, args=(random.Random(args.seed + i),))
+        for i in range(args.workers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    with SessionLocal() as db:
+        problems = check_invariants(db, models)
+    promotions = outcomes["drop_promoted"]
+    report = {
+        "courses": args.courses,
+        "capacity": args.capacity,
+        "queued_per_course": args.queued,
+        "workers": args.workers,
+        "seed_seconds": round(seed_seconds, 2),
+        "seconds": round(seconds, 3),
+        "operations_per_second": round(args.operations / seconds, 1),
+        "promotions": promotions,
+        "promotions_per_second": round(promotions / seconds, 1),
+        "outcomes": dict(sorted(outcomes.items())),
+        "latency_ms": {
+            name: {
+                "p50": percentile(samples, 0.50),
+                "p95": percentile(samples, 0.95),
+                "p99": percentile(samples, 0.99),
+            }
+            for name, samples in sorted(latencies.items())
+        },
+        "invariant_violations": problems,
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
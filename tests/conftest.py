@@ -0,0 +1,24 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+
+def auth_headers(client: TestClient, role: str) -> dict:
+    """Register a user with ``role`` through ``client`` and return its token."""
+    username = f"{role}_{uuid.uuid4().hex[:8]}"
+    resp = client.post(
+        "/users/",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "secret123",
+            "role": role,
+        },
+    )
+    assert resp.status_code == 201
+    token_resp = client.post(
+        "/token",
+        data={"username": username, "password": "secret123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {token_resp.json()['access_token']}"}
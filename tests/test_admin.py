@@ -0,0 +1,125 @@
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core import profiler
+from app.db.database import engine
+from app.db.slow_query import slow_query_log
+from app.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+def unique_value(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}"
+
+
+def test_pool_status_admin_only():
+    assert (
+        client.get("/admin/db/pool", headers=auth_headers(client, "student")).status_code
+        == 403
+    )
+    resp = client.get("/admin/db/pool", headers=auth_headers(client, "admin"))
+    assert resp.status_code == 200
+    data = resp.json()
+    for key in ("checked_out", "overflow", "checkouts", "max_wait_ms"):
+        assert key in data
+    assert data["checkouts"] > 0
+
+
+def test_sqlite_connections_use_wal():
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+
+def test_slow_query_log_captures_route_and_plan(monkeypatch):
+    headers = auth_headers(client, "admin")
+    denied = client.get("/admin/db/slow-queries", headers=auth_headers(client, "student"))
+    assert denied.status_code == 403
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    monkeypatch.setattr(slow_query_log, "explain", True)
+    monkeypatch.setattr(slow_query_log, "size", 10_000)
+    assert client.delete("/admin/db/slow-queries", headers=headers).status_code == 204
+
+    client.get("/students/", params={"name": "zz", "limit": 5})
+    entries = client.get("/admin/db/slow-queries", headers=headers).json()["entries"]
+    durations = [entry["duration_ms"] for entry in entries]
+    assert durations == sorted(durations, reverse=True)
+
+    listing = [
+        entry
+        for entry in entries
+        if entry["route"] == "/students/" and "FROM students" in entry["statement"]
+    ]
+    assert listing
+    assert "zz" in listing[0]["parameters"]
+    assert listing[0]["plan"]
+
+
+def burn_cpu(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_for_seconds_returns_collapsed_stacks():
+    headers = auth_headers(client, "admin")
+    stop = threading.Event()
+    worker = threading.Thread(target=burn_cpu, args=(stop,))
+    worker.start()
+    try:
+        resp = client.post(
+            "/admin/profile", params={"seconds": 0.3, "interval_ms": 2}, headers=headers
+        )
+    finally:
+        stop.set()
+        worker.join()
+    assert resp.status_code == 200
+    assert int(resp.headers["x-profile-samples"]) > 0
+    lines = resp.text.splitlines()
+    assert any("tests.test_admin:burn_cpu" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+    assert profiler.current_session() is None
+
+
+def test_profile_next_requests_to_route():
+    headers = auth_headers(client, "admin")
+    student_id = client.post(
+        "/students/",
+        json={"name": "Profiled", "email": f"{unique_value('prof')}@example.com"},
+    ).json()["id"]
+    result = {}
+
+    def run_profile():
+        result["resp"] = client.post(
+            "/admin/profile",
+            params={"route": "/students/{student_id}", "requests": 2, "timeout": 10},
+            headers=headers,
+        )
+
+    runner = threading.Thread(target=run_profile)
+    runner.start()
+    deadline = time.monotonic() + 5
+    while profiler.current_session() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    busy = client.post("/admin/profile", params={"seconds": 1}, headers=headers)
+    assert busy.status_code == 409
+    client.get("/students/")
+    for _ in range(2):
+        client.get(f"/students/{student_id}")
+    runner.join(10)
+
+    assert result["resp"].status_code == 200
+    assert result["resp"].headers["x-profile-requests"] == "2"
+
+
+def test_profile_rejects_unknown_route():
+    resp = client.post(
+        "/admin/profile", params={"route": "/nope/{x}"}, headers=auth_headers(client, "admin")
+    )
+    assert resp.status_code == 404
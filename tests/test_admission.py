@@ -0,0 +1,102 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController
+from app.main import app
+
+client = TestClient(app)
+
+
+def unique_email(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}@example.com"
+
+
+def test_full_queue_is_refused_with_retry_after():
+    async def scenario():
+        controller = AdmissionController(
+            writers=1, queue_size=1, per_user=5, timeout=5.0
+        )
+        await controller.acquire("a")
+        waiter = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as refused:
+            await controller.acquire("c")
+        controller.release(0.01)
+        await waiter
+        return controller, refused.value
+
+    controller, refused = asyncio.run(scenario())
+    assert refused.status_code == 429
+    assert int(refused.headers["Retry-After"]) >= 1
+    assert controller.stats()["rejected"] == 1
+    assert (controller.active, controller.queued) == (1, 0)
+
+
+def test_waiting_slots_are_shared_round_robin():
+    async def scenario():
+        controller = AdmissionController(
+            writers=1, queue_size=10, per_user=3, timeout=5.0
+        )
+        served = []
+
+        async def request(key: str):
+            async with controller.slot(key):
+                served.append(key)
+                await asyncio.sleep(0)
+
+        await controller.acquire("holder")
+        tasks = [
+            asyncio.create_task(request(key)) for key in ("a", "a", "a", "b", "c")
+        ]
+        await asyncio.sleep(0)
+        # A fourth request from "a" exceeds its share of the queue.
+        with pytest.raises(HTTPException):
+            await controller.acquire("a")
+        controller.release(0.01)
+        await asyncio.gather(*tasks)
+        return controller, served
+
+    controller, served = asyncio.run(scenario())
+    assert served == ["a", "b", "c", "a", "a"]
+    assert (controller.active, controller.queued) == (0, 0)
+
+
+def test_queue_timeout_gives_up_and_leaves_queue_clean():
+    async def scenario():
+        controller = AdmissionController(
+            writers=1, queue_size=10, per_user=5, timeout=0.01
+        )
+        await controller.acquire("a")
+        with pytest.raises(HTTPException) as refused:
+            await controller.acquire("b")
+        controller.release(0.01)
+        return controller, refused.value
+
+    controller, refused = asyncio.run(scenario())
+    assert refused.status_code == 429
+    assert controller.stats()["timed_out"] == 1
+    assert (controller.active, controller.queued) == (0, 0)
+
+
+def test_enrollment_writes_are_admitted():
+    student_id = client.post(
+        "/students/", json={"name": "Admitted", "email": unique_email("admit")}
+    ).json()["id"]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Admit", "email": unique_email("admitprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Gate 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+
+    resp = client.post(
+        "/enrollments/", json={"student_id": student_id, "course_id": course_id}
+    )
+    assert resp.status_code == 200
+    metrics = client.get("/metrics").text
+    assert "admission_admitted_total" in metrics
+    assert "\nadmission_active 0\n" in metrics
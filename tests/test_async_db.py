@@ -0,0 +1,118 @@
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import courses, enrollments, faculty, students, users
+from app.core.error_handlers import register_error_handlers
+from app.db.init_db import init_db
+from tests.conftest import auth_headers
+
+ASYNC_MODULES = (students, faculty, courses, enrollments)
+
+# The async routers alone, plus users for tokens: nothing falls back to sync.
+async_app = FastAPI()
+for module in ASYNC_MODULES:
+    async_app.include_router(module.async_router)
+async_app.include_router(users.router)
+async_app.include_router(users.auth_router)
+register_error_handlers(async_app)
+init_db()
+
+client = TestClient(async_app)
+
+
+def unique_email(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}@example.com"
+
+
+def test_every_write_route_has_an_async_twin():
+    for module in ASYNC_MODULES:
+        writes = {
+            (route.path, method)
+            for route in module.router.routes
+            for method in route.methods
+            if method != "GET"
+        }
+        twins = {
+            (route.path, method)
+            for route in module.async_router.routes
+            for method in route.methods
+        }
+        assert writes <= twins, module.__name__
+
+
+def test_async_write_routes():
+    admin = auth_headers(client, "admin")
+    grader = auth_headers(client, "faculty")
+    student_ids = [
+        client.post(
+            "/students/", json={"name": "Async", "email": unique_email("astu")}
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Async", "email": unique_email("afac")}
+    ).json()["id"]
+    renamed = client.put(
+        f"/faculty/{faculty_id}",
+        json={"name": "Prof Renamed", "email": unique_email("afac")},
+    )
+    assert renamed.json()["name"] == "Prof Renamed"
+    course = {
+        "name": "Async 101",
+        "credits": 3,
+        "capacity": 1,
+        "faculty_id": faculty_id,
+    }
+    course_id = client.post("/courses/", json=course).json()["id"]
+
+    enrolled = client.post(
+        "/enrollments/", json={"student_id": student_ids[0], "course_id": course_id}
+    )
+    assert enrolled.status_code == 200
+    full = client.post(
+        "/enrollments/", json={"student_id": student_ids[1], "course_id": course_id}
+    )
+    assert (full.status_code, full.json()["detail"]) == (409, "Course is full")
+    queued = client.post(
+        "/enrollments/?waitlist=true",
+        json={"student_id": student_ids[1], "course_id": course_id},
+    )
+    assert queued.status_code == 202
+
+    graded = client.put(
+        f"/enrollments/{enrolled.json()['id']}/grade",
+        json={"grade": "B"},
+        headers=grader,
+    )
+    assert graded.json()["grade"] == "B"
+    batch = client.put(
+        f"/courses/{course_id}/grades",
+        json={"items": [{"student_id": student_ids[0], "grade": "A"}]},
+        headers=grader,
+    )
+    assert batch.json()["updated"] == 1
+
+    # Raising the capacity promotes the queued student.
+    updated = client.put(f"/courses/{course_id}", json={**course, "capacity": 2})
+    assert updated.json()["enrolled_count"] == 2
+    bulk = client.post(
+        "/enrollments/bulk",
+        json={"items": [{"student_id": student_ids[2], "course_id": course_id}]},
+    )
+    assert bulk.json()["results"][0]["status"] == "course_full"
+
+    # Dropping frees the seat; deletes need an admin.
+    drop = f"/enrollments/{enrolled.json()['id']}"
+    assert client.delete(drop).status_code == 401
+    assert client.delete(drop, headers=admin).status_code == 204
+    student = client.put(
+        f"/students/{student_ids[2]}",
+        json={"name": "Async Renamed", "email": unique_email("astu")},
+    )
+    assert student.json()["name"] == "Async Renamed"
+    deleted = client.delete(f"/students/{student_ids[2]}", headers=admin)
+    assert deleted.status_code == 204
+    assert client.get(f"/students/{student_ids[2]}").status_code == 404
+    assert client.get(f"/courses/{course_id}").json()["enrolled_count"] == 1
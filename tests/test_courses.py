@@ -1,8 +1,17 @@
+import fnmatch
 import uuid
 
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from app.api import courses
+from app.core.cache import RedisCache
+from app import models
+from app.crud import catalog
+from app.crud import course as course_crud
+from app.db.database import SessionLocal
 from app.main import app
+from tests.conftest import auth_headers
 
 client = TestClient(app)
 
@@ -26,3 +35,258 @@ def test_create_course():
     assert data["name"] == "Science"
     assert data["faculty_id"] == faculty_id
 
+
+def test_async_course_routes():
+    faculty_id = client.post(
+        "/faculty/",
+        json={"name": "Prof Async", "email": unique_email("asyncfac")},
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/",
+        json={"name": "Async Science", "credits": 4, "faculty_id": faculty_id},
+    ).json()["id"]
+
+    async_app = FastAPI()
+    async_app.include_router(courses.async_router)
+    with TestClient(async_app) as async_client:
+        resp = async_client.get(f"/courses/{course_id}")
+        assert resp.status_code == 200
+        assert resp.json()["name"] == "Async Science"
+
+        listing = async_client.get(f"/courses/?faculty_id={faculty_id}")
+        assert listing.status_code == 200
+        assert [c["id"] for c in listing.json()["items"]] == [course_id]
+
+        assert async_client.get("/courses/999999999").status_code == 404
+
+
+def test_course_list_fast_path_keeps_schema():
+    faculty_id = client.post(
+        "/faculty/",
+        json={"name": "Prof Fast", "email": unique_email("fastfac")},
+    ).json()["id"]
+    client.post(
+        "/courses/", json={"name": "Fast 101", "credits": 2, "faculty_id": faculty_id}
+    )
+    listing = client.get(f"/courses/?faculty_id={faculty_id}")
+    assert listing.status_code == 200
+    assert listing.json()["items"] == [
+        {
+            "name": "Fast 101",
+            "credits": 2,
+            "capacity": None,
+            "id": listing.json()["items"][0]["id"],
+            "faculty_id": faculty_id,
+            "enrolled_count": 0,
+            "seats_remaining": None,
+        }
+    ]
+
+    schema = app.openapi()["paths"]["/courses/"]["get"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/CourseList"
+    }
+
+
+def test_course_conditional_get():
+    faculty_id = client.post(
+        "/faculty/",
+        json={"name": "Prof ETag", "email": unique_email("etagfac")},
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "ETag 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+
+    for url in (f"/courses/{course_id}", f"/courses/?faculty_id={faculty_id}"):
+        first = client.get(url)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+    item_etag = client.get(f"/courses/{course_id}").headers["etag"]
+    list_etag = client.get(f"/courses/?faculty_id={faculty_id}").headers["etag"]
+    client.put(
+        f"/courses/{course_id}",
+        json={"name": "ETag 102", "credits": 3, "faculty_id": faculty_id},
+    )
+    for url, stale in (
+        (f"/courses/{course_id}", item_etag),
+        (f"/courses/?faculty_id={faculty_id}", list_etag),
+    ):
+        fresh = client.get(url, headers={"If-None-Match": stale})
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != stale
+
+
+def test_list_etag_changes_when_an_id_is_reused():
+    faculty_id = client.post(
+        "/faculty/",
+        json={"name": "Prof Reuse", "email": unique_email("reusefac")},
+    ).json()["id"]
+    url = f"/courses/?faculty_id={faculty_id}"
+    first = client.post(
+        "/courses/", json={"name": "Reuse 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()
+    etag = client.get(url).headers["etag"]
+
+    # Without AUTOINCREMENT, SQLite hands the deleted highest id out again, so
+    # count, max id and version sum of the list all come back unchanged.
+    client.delete(f"/courses/{first['id']}", headers=auth_headers(client, "admin"))
+    second = client.post(
+        "/courses/", json={"name": "Reuse 201", "credits": 4, "faculty_id": faculty_id}
+    ).json()
+    assert second["id"] == first["id"]
+
+    fresh = client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["items"][0]["name"] == "Reuse 201"
+
+
+class FakeRedis:
+    """Just enough of redis-py for RedisCache (no expiry)."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, name):
+        return self.store.get(name)
+
+    def set(self, name, value, px=None):
+        self.store[name] = value.encode()
+
+    def delete(self, *names):
+        for name in names:
+            self.store.pop(name, None)
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.store) if fnmatch.fnmatch(key, match)]
+
+
+def _exercise_catalog_cache():
+    faculty_id = client.post(
+        "/faculty/",
+        json={"name": "Prof Cache", "email": unique_email("cachefac")},
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Cache 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+
+    hits = catalog.catalog_cache.stats()["hits"]
+    assert client.get(f"/courses/{course_id}").json()["name"] == "Cache 101"
+    assert client.get(f"/courses/{course_id}").json()["name"] == "Cache 101"
+    assert catalog.catalog_cache.stats()["hits"] > hits
+
+    client.put(
+        f"/courses/{course_id}",
+        json={"name": "Cache 102", "credits": 3, "faculty_id": faculty_id},
+    )
+    assert client.get(f"/courses/{course_id}").json()["name"] == "Cache 102"
+    return course_id
+
+
+def test_catalog_cache_invalidated_by_writes():
+    course_id = _exercise_catalog_cache()
+    client.delete(f"/courses/{course_id}", headers=auth_headers(client, "admin"))
+    assert client.get(f"/courses/{course_id}").status_code == 404
+
+
+def test_catalog_fill_racing_an_invalidation_is_not_cached(monkeypatch):
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Race", "email": unique_email("racefac")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Race 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+    catalog.invalidate(models.Course, course_id)
+
+    with SessionLocal() as db:
+        load = db.execute
+
+        def execute(*args, **kwargs):
+            row = load(*args, **kwargs)
+            # An enrollment commits and invalidates after the SELECT.
+            catalog.invalidate(models.Course, course_id)
+            return row
+
+        monkeypatch.setattr(db, "execute", execute)
+        assert course_crud.get_course_cached(db, course_id)["name"] == "Race 101"
+    assert catalog.catalog_cache.get(f"courses:{course_id}") is None
+
+
+def test_catalog_cache_redis_backend(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(
+        catalog, "catalog_cache", RedisCache(redis, ttl=60, prefix="catalog:")
+    )
+    course_id = _exercise_catalog_cache()
+    assert f"catalog:courses:{course_id}" in redis.store
+    catalog.catalog_cache.clear()
+    assert redis.store == {}
+
+
+def test_batch_grade_entry():
+    student_ids = [
+        client.post(
+            "/students/", json={"name": "Graded", "email": unique_email("graded")}
+        ).json()["id"]
+        for _ in range(4)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Grades", "email": unique_email("gradeprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Term 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+    enrollment_ids = [
+        client.post(
+            "/enrollments/", json={"student_id": student_id, "course_id": course_id}
+        ).json()["id"]
+        for student_id in student_ids[:3]
+    ]
+    url = f"/courses/{course_id}/grades"
+    faculty = auth_headers(client, "faculty")
+
+    resp = client.put(
+        url,
+        json={
+            "items": [
+                {"student_id": student_ids[0], "grade": "A"},
+                {"enrollment_id": enrollment_ids[1], "grade": "B-"},
+                {"student_id": student_ids[2], "grade": "C"},
+                {"student_id": student_ids[0], "grade": "F"},
+                {"student_id": student_ids[3], "grade": "A"},
+            ]
+        },
+        headers=faculty,
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == 3
+    assert [r["status"] for r in body["results"]] == [
+        "updated",
+        "updated",
+        "updated",
+        "duplicate",
+        "not_enrolled",
+    ]
+    assert body["results"][1]["student_id"] == student_ids[1]
+    grades = {
+        row["student_id"]: row["grade"]
+        for row in client.get(f"/enrollments/filter/?course_id={course_id}").json()
+    }
+    assert grades == {student_ids[0]: "A", student_ids[1]: "B-", student_ids[2]: "C"}
+
+    for bad in (
+        {"student_id": student_ids[0], "grade": "E"},
+        {"student_id": student_ids[0], "enrollment_id": enrollment_ids[0], "grade": "A"},
+        {"grade": "A"},
+    ):
+        assert client.put(url, json={"items": [bad]}, headers=faculty).status_code == 422
+    student = auth_headers(client, "student")
+    items = {"items": [{"student_id": student_ids[0], "grade": "A"}]}
+    assert client.put(url, json=items, headers=student).status_code == 403
+    assert client.put("/courses/0/grades", json=items, headers=faculty).status_code == 404
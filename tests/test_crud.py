@@ -0,0 +1,154 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app import schemas
+from app.crud import course as course_crud
+from app.crud import enrollment as enrollment_crud
+from app.crud import faculty as faculty_crud
+from app.crud import student as student_crud
+from app.crud import user as user_crud
+from app.crud import waitlist as waitlist_crud
+from app.db.database import SessionLocal, engine
+from app.db import init_db as init_db_module
+from app.db.init_db import init_db
+from app.models import Base
+
+
+def unique_email(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}@example.com"
+
+
+@contextmanager
+def statements():
+    """Collect the SQL statements sent to the database inside the block."""
+    sent: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield sent
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def db():
+    init_db()
+    with SessionLocal() as session:
+        yield session
+
+
+def test_creates_and_updates_are_one_statement(db):
+    with statements() as sent:
+        student = student_crud.create_student(
+            db, schemas.StudentCreate(name="Once", email=unique_email("once"))
+        )
+    assert len(sent) == 1
+    assert student.id is not None and student.name == "Once"
+
+    with statements() as sent:
+        faculty = faculty_crud.create_faculty(
+            db, schemas.FacultyCreate(name="Prof Once", email=unique_email("once"))
+        )
+    assert len(sent) == 1
+    assert faculty.version == 1
+
+    course_in = schemas.CourseCreate(
+        name="Once 101", credits=3, capacity=10, faculty_id=faculty.id
+    )
+    with statements() as sent:
+        course = course_crud.create_course(db, course_in)
+    assert len(sent) == 1
+    assert (course.enrolled_count, course.seats_remaining) == (0, 10)
+
+    with statements() as sent:
+        course = course_crud.update_course(
+            db, course, course_in.model_copy(update={"name": "Once 102"})
+        )
+    assert len(sent) == 1
+    assert (course.name, course.version) == ("Once 102", 2)
+
+    with statements() as sent:
+        user = user_crud.create_user(
+            db,
+            schemas.UserCreate(
+                username=f"once_{uuid.uuid4().hex[:8]}",
+                email=unique_email("once"),
+                password="secret123",
+                role="student",
+            ),
+            password_hash="not-a-real-hash",
+        )
+        user_crud.update_role(db, user, "faculty")
+    assert len(sent) == 2
+    assert (user.role, user.is_active) == ("faculty", True)
+
+
+def test_enrollment_writes_skip_the_read_back(db):
+    student = student_crud.create_student(
+        db, schemas.StudentCreate(name="Seat", email=unique_email("seat"))
+    )
+    faculty = faculty_crud.create_faculty(
+        db, schemas.FacultyCreate(name="Prof Seat", email=unique_email("seat"))
+    )
+    course = course_crud.create_course(
+        db,
+        schemas.CourseCreate(name="Seat 101", credits=3, capacity=1, faculty_id=faculty.id),
+    )
+    request = schemas.EnrollmentCreate(student_id=student.id, course_id=course.id)
+
+    # The seat claim and the INSERT; nothing is read back.
+    with statements() as sent:
+        enrollment = enrollment_crud.create_enrollment(db, request)
+    assert [statement.split()[0] for statement in sent] == ["UPDATE", "INSERT"]
+    assert enrollment.id is not None and enrollment.grade is None
+
+    with statements() as sent:
+        enrollment = enrollment_crud.update_grade(
+            db, enrollment, schemas.GradeAssign(grade="B")
+        )
+    assert len(sent) == 1
+    assert enrollment.grade == "B"
+
+    other = student_crud.create_student(
+        db, schemas.StudentCreate(name="Queue", email=unique_email("queue"))
+    )
+    # The INSERT, then the head lookup and seat claim that would hand a seat
+    # freed since the failed claim to the queue.
+    with statements() as sent:
+        entry = waitlist_crud.join_waitlist(
+            db, schemas.EnrollmentCreate(student_id=other.id, course_id=course.id)
+        )
+        assert entry.position == 1
+    assert [statement.split()[0] for statement in sent] == [
+        "INSERT",
+        "SELECT",
+        "UPDATE",
+    ]
+
+
+def test_duplicate_enrollments_block_startup(tmp_path, monkeypatch):
+    # A database from before the unique index, holding a duplicate enrollment.
+    old = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=old)
+    with old.begin() as conn:
+        conn.execute(text("DROP INDEX ix_enrollments_student_course"))
+        conn.execute(
+            text(
+                "INSERT INTO enrollments (student_id, course_id) "
+                "VALUES (1, 1), (1, 1)"
+            )
+        )
+    monkeypatch.setattr(init_db_module, "engine", old)
+
+    with pytest.raises(RuntimeError, match="ix_enrollments_student_course"):
+        init_db_module.create_missing_indexes()
+    with old.connect() as conn:
+        indexes = conn.execute(text("PRAGMA index_list(enrollments)")).all()
+    assert "ix_enrollments_student_course" not in {row[1] for row in indexes}
+    old.dispose()
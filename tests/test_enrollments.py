@@ -1,8 +1,10 @@
+import json
 import uuid
 
 from fastapi.testclient import TestClient
 
 from app.main import app
+from tests.conftest import auth_headers
 
 client = TestClient(app)
 
@@ -40,3 +42,163 @@ def test_create_course_and_enrollment():
     assert data["student_id"] == student_resp.json()["id"]
     assert data["course_id"] == course_resp.json()["id"]
 
+
+def test_bulk_enrollment_reports_per_row_outcomes():
+    student_ids = [
+        client.post(
+            "/students/",
+            json={"name": "Bulk Student", "email": unique_email("bulk")},
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Bulk Prof", "email": unique_email("bulkprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Bulk 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+    already = client.post(
+        "/enrollments/", json={"student_id": student_ids[0], "course_id": course_id}
+    )
+    assert already.status_code == 200
+
+    resp = client.post(
+        "/enrollments/bulk",
+        json={
+            "items": [
+                {"student_id": student_ids[0], "course_id": course_id},
+                {"student_id": student_ids[1], "course_id": course_id},
+                {"student_id": student_ids[1], "course_id": course_id},
+                {"student_id": student_ids[2], "course_id": 999999999},
+                {"student_id": 999999999, "course_id": course_id},
+                {"student_id": student_ids[2], "course_id": course_id},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == 2
+    assert [r["status"] for r in data["results"]] == [
+        "duplicate",
+        "created",
+        "duplicate",
+        "course_not_found",
+        "student_not_found",
+        "created",
+    ]
+    enrollment_id = data["results"][1]["enrollment_id"]
+    fetched = client.get(f"/enrollments/{enrollment_id}").json()
+    assert fetched["student_id"] == student_ids[1]
+    assert fetched["course_id"] == course_id
+
+
+def test_duplicate_enrollment_conflicts():
+    student_id = client.post(
+        "/students/", json={"name": "Twice", "email": unique_email("twice")}
+    ).json()["id"]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Twice", "email": unique_email("twiceprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Again 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+    payload = {"student_id": student_id, "course_id": course_id}
+
+    assert client.post("/enrollments/", json=payload).status_code == 200
+    resp = client.post("/enrollments/", json=payload)
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "Student is already enrolled in this course"
+
+
+def test_course_capacity_is_enforced_and_seats_freed():
+    student_ids = [
+        client.post(
+            "/students/", json={"name": "Seated", "email": unique_email("seat")}
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Seats", "email": unique_email("seatprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/",
+        json={"name": "Small 101", "credits": 3, "capacity": 2, "faculty_id": faculty_id},
+    ).json()["id"]
+
+    first = client.post(
+        "/enrollments/", json={"student_id": student_ids[0], "course_id": course_id}
+    )
+    assert first.status_code == 200
+    course = client.get(f"/courses/{course_id}").json()
+    assert (course["enrolled_count"], course["seats_remaining"]) == (1, 1)
+
+    # A rejected duplicate must not keep the seat it claimed.
+    dup = client.post(
+        "/enrollments/", json={"student_id": student_ids[0], "course_id": course_id}
+    )
+    assert dup.status_code == 409
+    assert client.post(
+        "/enrollments/", json={"student_id": student_ids[1], "course_id": course_id}
+    ).status_code == 200
+    full = client.post(
+        "/enrollments/", json={"student_id": student_ids[2], "course_id": course_id}
+    )
+    assert full.status_code == 409
+    assert full.json()["detail"] == "Course is full"
+    assert client.get(f"/courses/{course_id}").json()["seats_remaining"] == 0
+
+    client.delete(f"/enrollments/{first.json()['id']}", headers=auth_headers(client, "admin"))
+    assert client.get(f"/courses/{course_id}").json()["seats_remaining"] == 1
+
+    bulk = client.post(
+        "/enrollments/bulk",
+        json={
+            "items": [
+                {"student_id": student_ids[2], "course_id": course_id},
+                {"student_id": student_ids[0], "course_id": course_id},
+            ]
+        },
+    )
+    assert [r["status"] for r in bulk.json()["results"]] == ["created", "course_full"]
+    course = client.get(f"/courses/{course_id}").json()
+    assert (course["enrolled_count"], course["seats_remaining"]) == (2, 0)
+
+
+def test_course_grades_report_streams_csv_and_ndjson():
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Report", "email": unique_email("report")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Report 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+    student_ids = []
+    for i in range(3):
+        student_id = client.post(
+            "/students/",
+            json={"name": f"Reported {i}", "email": unique_email("reported")},
+        ).json()["id"]
+        client.post(
+            "/enrollments/", json={"student_id": student_id, "course_id": course_id}
+        )
+        student_ids.append(student_id)
+    headers = auth_headers(client, "faculty")
+    url = f"/enrollments/reports/course/{course_id}/grades"
+
+    csv_resp = client.get(f"{url}?format=csv", headers=headers)
+    assert csv_resp.status_code == 200
+    assert csv_resp.headers["content-type"].startswith("text/csv")
+    lines = csv_resp.text.strip().splitlines()
+    assert lines[0] == (
+        "student_id,student_name,student_email,course_id,course_name,grade"
+    )
+    assert len(lines) == 4
+    assert lines[1].startswith(f"{student_ids[0]},Reported 0,")
+
+    ndjson_resp = client.get(f"{url}?format=ndjson", headers=headers)
+    assert ndjson_resp.status_code == 200
+    rows = [json.loads(line) for line in ndjson_resp.text.splitlines()]
+    assert [row["student_id"] for row in rows] == student_ids
+    assert all(row["course_name"] == "Report 101" for row in rows)
+
+    json_resp = client.get(url, headers=headers)
+    assert json_resp.json()["total_students"] == 3
@@ -2,6 +2,8 @@ import uuid
 
 from fastapi.testclient import TestClient
 
+from app.crud import faculty as faculty_crud
+from app.db.database import SessionLocal
 from app.main import app
 
 client = TestClient(app)
@@ -22,3 +24,25 @@ def test_create_and_fetch_faculty():
     assert resp2.status_code == 200
     assert resp2.json()["name"] == "Test Faculty"
 
+
+
+def test_concurrent_faculty_update_is_a_conflict(monkeypatch):
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Race", "email": unique_email("race")}
+    ).json()["id"]
+    update = faculty_crud.update_faculty
+
+    def lose_race_then_update(db, db_faculty, faculty):
+        # A second PUT commits between this request's read and its write.
+        with SessionLocal() as other:
+            faculty_crud.get_faculty(other, faculty_id).name = "Prof Winner"
+            other.commit()
+        return update(db, db_faculty, faculty)
+
+    monkeypatch.setattr(faculty_crud, "update_faculty", lose_race_then_update)
+    resp = client.put(
+        f"/faculty/{faculty_id}",
+        json={"name": "Prof Loser", "email": unique_email("race")},
+    )
+    assert resp.status_code == 409
+    assert client.get(f"/faculty/{faculty_id}").json()["name"] == "Prof Winner"
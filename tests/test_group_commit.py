@@ -0,0 +1,161 @@
+import threading
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.core.config import settings
+from app.crud import catalog
+from app.crud import enrollment as enrollment_crud
+from app.crud import student as student_crud
+from app.db import group_commit
+from app.db.database import SessionLocal, engine
+from app.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+def unique_email(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}@example.com"
+
+
+@pytest.fixture
+def committer():
+    writer = group_commit.GroupCommitter(SessionLocal, max_batch=64, max_delay=0.05)
+    yield writer
+    writer.stop()
+
+
+def test_concurrent_writes_share_commits(committer):
+    duplicate = unique_email("dup")
+    payloads = [
+        schemas.StudentCreate(name=f"Batched {i}", email=unique_email("batch"))
+        for i in range(20)
+    ] + [
+        schemas.StudentCreate(name="Dup A", email=duplicate),
+        schemas.StudentCreate(name="Dup B", email=duplicate),
+    ]
+    results: dict[int, object] = {}
+    start = threading.Barrier(len(payloads))
+
+    def write(index: int) -> None:
+        start.wait()
+        try:
+            results[index] = committer.run(student_crud.create_student, payloads[index])
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [
+        threading.Thread(target=write, args=(i,)) for i in range(len(payloads))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    students = [results[i] for i in range(20)]
+    assert [student.name for student in students] == [p.name for p in payloads[:20]]
+    assert len({student.id for student in students}) == 20
+    # Exactly one of the two duplicates lost, without failing anyone else.
+    outcomes = [results[20], results[21]]
+    assert sum(isinstance(outcome, IntegrityError) for outcome in outcomes) == 1
+    assert committer.operations == len(payloads)
+    assert committer.batches < len(payloads)
+    with SessionLocal() as db:
+        assert student_crud.get_student(db, students[-1].id).name == "Batched 19"
+
+
+def test_write_routes_in_group_commit_mode(monkeypatch):
+    monkeypatch.setattr(settings, "GROUP_COMMIT_ENABLED", True)
+    before = group_commit.writer.operations
+    try:
+        student_id = client.post(
+            "/students/", json={"name": "Grouped", "email": unique_email("group")}
+        ).json()["id"]
+        faculty_id = client.post(
+            "/faculty/", json={"name": "Prof Group", "email": unique_email("gprof")}
+        ).json()["id"]
+        course_id = client.post(
+            "/courses/",
+            json={"name": "Batch 101", "credits": 3, "faculty_id": faculty_id},
+        ).json()["id"]
+        payload = {"student_id": student_id, "course_id": course_id}
+
+        enrolled = client.post("/enrollments/", json=payload)
+        assert enrolled.status_code == 200
+        duplicate = client.post("/enrollments/", json=payload)
+        assert duplicate.status_code == 409
+        graded = client.put(
+            f"/enrollments/{enrolled.json()['id']}/grade",
+            json={"grade": "A"},
+            headers=auth_headers(client, "faculty"),
+        )
+        assert graded.status_code == 200
+        assert graded.json()["grade"] == "A"
+        course = client.get(f"/courses/{course_id}").json()
+        assert course["enrolled_count"] == 1
+    finally:
+        group_commit.writer.stop()
+    # Student, enrollment, duplicate enrollment and grade; not the setup calls.
+    assert group_commit.writer.operations - before == 4
+
+
+def test_waiting_caller_does_not_hold_a_pool_connection(tmp_path, monkeypatch):
+    # The writer's own connection is separate from the request pool.
+    assert group_commit.writer.session_factory.kw["bind"] is not engine
+
+    # Worst case: caller and writer share a pool with a single connection.
+    tiny = create_engine(
+        f"sqlite:///{tmp_path}/tiny.db",
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=2,
+    )
+    models.Base.metadata.create_all(tiny)
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=tiny)
+    writer = group_commit.GroupCommitter(factory, max_batch=8, max_delay=0.01)
+    monkeypatch.setattr(group_commit, "writer", writer)
+    monkeypatch.setattr(settings, "GROUP_COMMIT_ENABLED", True)
+    try:
+        with factory() as db:
+            db.execute(text("SELECT 1"))  # the request has its connection
+            student = group_commit.run_write(
+                db,
+                student_crud.create_student,
+                schemas.StudentCreate(name="Tiny", email=unique_email("tiny")),
+            )
+            assert db.get(models.Student, student.id).name == "Tiny"
+    finally:
+        writer.stop()
+        tiny.dispose()
+
+
+def test_cache_invalidated_only_after_the_batch_commits(committer, monkeypatch):
+    student_id = client.post(
+        "/students/", json={"name": "Cached", "email": unique_email("cached")}
+    ).json()["id"]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Cached", "email": unique_email("cprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/", json={"name": "Cache 101", "credits": 3, "faculty_id": faculty_id}
+    ).json()["id"]
+    seen = []
+
+    def invalidate(model, row_id):
+        # What a reader refilling the cache right now would load.
+        with SessionLocal() as other:
+            seen.append(other.get(model, row_id).enrolled_count)
+
+    monkeypatch.setattr(catalog, "invalidate", invalidate)
+    committer.run(
+        enrollment_crud.create_enrollment,
+        schemas.EnrollmentCreate(student_id=student_id, course_id=course_id),
+    )
+    assert seen == [1]
@@ -0,0 +1,53 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def unique_email(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}@example.com"
+
+
+def sample(body: str, name: str, **labels) -> float:
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    prefix = f"{name}{{{wanted}}} " if labels else f"{name} "
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    raise AssertionError(f"no sample {prefix!r}")
+
+
+def test_metrics_record_route_templates_and_db_work():
+    student_id = client.post(
+        "/students/",
+        json={"name": "Metric Student", "email": unique_email("metric")},
+    ).json()["id"]
+    labels = {"method": "GET", "route": "/students/{student_id}"}
+    try:
+        body = client.get("/metrics").text
+        seen = sample(body, "http_request_db_queries_count", **labels)
+    except AssertionError:
+        seen = 0
+
+    for _ in range(3):
+        assert client.get(f"/students/{student_id}").status_code == 200
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+
+    # Series are keyed by the route template, never the concrete path.
+    assert f'route="/students/{student_id}"' not in body
+    assert sample(body, "http_request_db_queries_count", **labels) == seen + 3
+    assert sample(body, "http_request_db_queries_sum", **labels) >= 3
+    assert sample(body, "http_response_size_bytes_sum", **labels) > 0
+    latency = sample(
+        body, "http_request_duration_seconds_bucket", **labels, status=200, le="+Inf"
+    )
+    assert latency >= 3
+    # The scrape itself is in flight while the page is rendered.
+    assert sample(body, "http_requests_in_flight") == 1
+    assert "# TYPE cache_hits_total counter" in body
@@ -0,0 +1,115 @@
+import json
+import random
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.db import search
+from app.tools import seed
+
+
+@pytest.fixture
+def seed_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/seed.db")
+    models.Base.metadata.create_all(engine)
+    enabled = set(search._enabled_tables)
+    search.install_search_indexes(engine)
+    yield engine
+    engine.dispose()
+    # install_search_indexes() resets module state the app database relies on.
+    search._enabled_tables.clear()
+    search._enabled_tables.update(enabled)
+
+
+def count(engine, model) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(model))
+
+
+def test_generate_loads_rows_and_rebuilds_indexes(seed_engine):
+    counts = {
+        "users": 3,
+        "faculty": 2,
+        "courses": 4,
+        "students": 10,
+        "enrollments": 25,
+    }
+    rows = seed.generate_rows(counts, random.Random(1))
+    report = seed.load(seed_engine, rows, batch_size=7)
+
+    assert report["total_rows"] == sum(counts.values())
+    assert report["tables"]["enrollments"]["rows"] == 25
+    assert count(seed_engine, models.Enrollment) == 25
+    assert count(seed_engine, models.Student) == 10
+    with seed_engine.connect() as conn:
+        enrolled = conn.scalar(select(func.sum(models.Course.enrolled_count)))
+    assert enrolled == 25
+
+    index_names = {
+        index["name"] for index in inspect(seed_engine).get_indexes("enrollments")
+    }
+    assert "ix_enrollments_student_course" in index_names
+    with seed_engine.connect() as conn:
+        hits = conn.scalars(
+            text("SELECT rowid FROM students_fts WHERE name LIKE '%Student 0000003%'")
+        ).all()
+    assert hits == [4]
+
+
+def test_ingest_csv_and_ndjson(seed_engine, tmp_path):
+    faculty = tmp_path / "faculty.csv"
+    faculty.write_text("name,email\nProf A,a@example.edu\n")
+    courses = tmp_path / "courses.csv"
+    courses.write_text("name,credits,faculty_id\nAlgebra,3,1\nPhysics,4,1\n")
+    students = tmp_path / "students.ndjson"
+    students.write_text(
+        "\n".join(
+            json.dumps({"name": f"S{i}", "email": f"s{i}@example.edu"})
+            for i in range(3)
+        )
+    )
+    enrollments = tmp_path / "enrollments.csv"
+    enrollments.write_text("student_id,course_id,grade\n1,1,A\n2,2,\n3,1,B\n")
+
+    sources = seed.parse_sources(
+        [
+            f"faculty={faculty}",
+            f"courses={courses}",
+            f"students={students}",
+            f"enrollments={enrollments}",
+        ]
+    )
+    seed.load(seed_engine, sources)
+
+    with seed_engine.connect() as conn:
+        rows = conn.execute(
+            select(
+                models.Enrollment.student_id,
+                models.Enrollment.course_id,
+                models.Enrollment.grade,
+            ).order_by(models.Enrollment.id)
+        ).all()
+        credits = conn.scalar(
+            select(models.Course.credits).where(models.Course.id == 2)
+        )
+    assert [tuple(row) for row in rows] == [(1, 1, "A"), (2, 2, None), (3, 1, "B")]
+    assert credits == 4
+
+
+def test_duplicate_rows_roll_back_the_whole_load(seed_engine, tmp_path):
+    students = tmp_path / "students.csv"
+    students.write_text("name,email\nA,dup@example.edu\nB,dup@example.edu\n")
+
+    with pytest.raises(IntegrityError):
+        seed.load(seed_engine, seed.parse_sources([f"students={students}"]))
+    assert count(seed_engine, models.Student) == 0
+    assert "ix_students_id" in {
+        index["name"] for index in inspect(seed_engine).get_indexes("students")
+    }
+    with seed_engine.connect() as conn:
+        triggers = conn.scalars(
+            text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        ).all()
+    assert "students_fts_ai" in triggers
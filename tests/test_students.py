@@ -1,7 +1,10 @@
 import uuid
+from contextlib import contextmanager
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
+from app.db.database import engine
 from app.main import app
 
 client = TestClient(app)
@@ -49,6 +52,11 @@ def test_students_pagination_and_total():
     assert len(data["items"]) == 2
 
 
+
+def test_list_rejects_a_limit_below_one():
+    for limit in (0, -1):
+        assert client.get(f"/students/?limit={limit}").status_code == 422
+
 def test_students_filter_by_name():
     name = "FilterTestStudent"
     email = f"{unique_value('filter')}@example.com"
@@ -63,3 +71,118 @@ def test_students_filter_by_name():
     names = [item["name"] for item in data["items"]]
     assert any(entry == "FilterTestStudent" for entry in names)
 
+
+
+def test_students_cursor_pagination():
+    marker = unique_value("Cursor")
+    created_ids = []
+    for _ in range(5):
+        resp = client.post(
+            "/students/",
+            json={"name": marker, "email": f"{unique_value('cursor')}@example.com"},
+        )
+        assert resp.status_code == 201
+        created_ids.append(resp.json()["id"])
+
+    first = client.get(f"/students/?name={marker}&limit=2&include_total=true")
+    assert first.status_code == 200
+    data = first.json()
+    assert data["total"] == 5
+    assert data["next_cursor"]
+
+    seen = [item["id"] for item in data["items"]]
+    cursor = data["next_cursor"]
+    while cursor:
+        page = client.get(f"/students/?name={marker}&limit=2&cursor={cursor}")
+        assert page.status_code == 200
+        page_data = page.json()
+        assert page_data["total"] is None
+        seen.extend(item["id"] for item in page_data["items"])
+        cursor = page_data["next_cursor"]
+
+    assert seen == created_ids
+
+    bad = client.get("/students/?cursor=not-a-cursor")
+    assert bad.status_code == 400
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_student_grades_query_count_is_constant():
+    student_id = client.post(
+        "/students/",
+        json={
+            "name": "Grades Student",
+            "email": f"{unique_value('grades')}@example.com",
+        },
+    ).json()["id"]
+    faculty_id = client.post(
+        "/faculty/",
+        json={
+            "name": "Grades Prof",
+            "email": f"{unique_value('gradesfac')}@example.com",
+        },
+    ).json()["id"]
+
+    def enroll_in_new_course(name):
+        course_id = client.post(
+            "/courses/", json={"name": name, "credits": 3, "faculty_id": faculty_id}
+        ).json()["id"]
+        resp = client.post(
+            "/enrollments/", json={"student_id": student_id, "course_id": course_id}
+        )
+        assert resp.status_code == 200
+
+    enroll_in_new_course("Course 1")
+    with count_queries() as few:
+        resp = client.get(f"/students/{student_id}/grades/")
+    assert len(resp.json()) == 1
+
+    for i in range(2, 6):
+        enroll_in_new_course(f"Course {i}")
+    with count_queries() as many:
+        resp = client.get(f"/students/{student_id}/grades/")
+    grades = resp.json()
+    assert [g["course_name"] for g in grades] == [f"Course {i}" for i in range(1, 6)]
+    assert len(many) == len(few) == 1
+
+
+def test_student_search_modes_and_ranking():
+    marker = uuid.uuid4().hex[:6]
+    names = [f"Zed{marker} Alpha", f"Alpha Zed{marker}", f"Nomatch {marker[:2]}"]
+    for name in names:
+        resp = client.post(
+            "/students/",
+            json={"name": name, "email": f"{unique_value('search')}@example.com"},
+        )
+        assert resp.status_code == 201
+
+    contains = client.get(f"/students/?name=zed{marker}&include_total=true").json()
+    assert sorted(s["name"] for s in contains["items"]) == sorted(names[:2])
+
+    prefix = client.get(f"/students/?name=Zed{marker}&match=prefix").json()
+    assert [s["name"] for s in prefix["items"]] == [names[0]]
+
+    ranked = client.get(f"/search/students?q=Zed{marker}").json()
+    assert sorted(s["name"] for s in ranked) == sorted(names[:2])
+
+    # Renames are picked up by the index.
+    student_id = ranked[0]["id"]
+    client.put(
+        f"/students/{student_id}",
+        json={"name": "Renamed", "email": f"{unique_value('search')}@example.com"},
+    )
+    ranked = client.get(f"/search/students?q=Zed{marker}").json()
+    assert student_id not in [s["id"] for s in ranked]
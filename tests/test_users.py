@@ -122,3 +122,97 @@ def test_update_user_profile_unauthorized():
     assert update_resp.status_code == 403
     assert "Not allowed to update profile" in update_resp.json()["detail"]
 
+
+
+def test_disable_revokes_cached_principal():
+    def register_and_login(role):
+        username = unique_value(role)
+        resp = client.post(
+            "/users/",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": "secret123",
+                "role": role,
+            },
+        )
+        assert resp.status_code == 201
+        token_resp = client.post(
+            "/token",
+            data={"username": username, "password": "secret123"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        token = token_resp.json()["access_token"]
+        return resp.json()["id"], {"Authorization": f"Bearer {token}"}
+
+    user_id, user_headers = register_and_login("student")
+    _, admin_headers = register_and_login("admin")
+
+    # Second call is served from the principal cache.
+    for _ in range(2):
+        resp = client.patch(f"/users/{user_id}", json={}, headers=user_headers)
+        assert resp.status_code == 200
+
+    resp = client.post(f"/users/{user_id}/disable", headers=admin_headers)
+    assert resp.status_code == 200
+    resp = client.patch(f"/users/{user_id}", json={}, headers=user_headers)
+    assert resp.status_code == 401
+
+    resp = client.post(f"/users/{user_id}/enable", headers=admin_headers)
+    assert resp.status_code == 200
+    resp = client.patch(f"/users/{user_id}", json={}, headers=user_headers)
+    assert resp.status_code == 200
+
+    stats = client.get("/admin/cache", headers=admin_headers).json()["principals"]
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 1
+
+
+def test_lookup_racing_a_revocation_is_not_cached(monkeypatch):
+    from app.core import security
+    from app.db.database import SessionLocal
+
+    username = unique_value("race")
+    client.post(
+        "/users/",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "secret123",
+            "role": "student",
+        },
+    )
+    token = client.post(
+        "/token",
+        data={"username": username, "password": "secret123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    ).json()["access_token"]
+
+    with SessionLocal() as db:
+        load = db.query
+
+        def query(*entities):
+            # The revocation commits while the lookup is in flight.
+            security.invalidate_principal(username)
+            return load(*entities)
+
+        monkeypatch.setattr(db, "query", query)
+        assert security.get_current_user(token, db).username == username
+    assert security.principal_cache.get(username) is None
+
+
+def test_password_hashing_sheds_load_when_pool_is_full(monkeypatch):
+    from app.core import security
+
+    monkeypatch.setattr(security, "_hash_slots", security.threading.Semaphore(0))
+    resp = client.post(
+        "/users/",
+        json={
+            "username": unique_value("shed"),
+            "email": f"{unique_value('shed')}@example.com",
+            "password": "secret123",
+            "role": "student",
+        },
+    )
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
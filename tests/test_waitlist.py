@@ -0,0 +1,183 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.crud import enrollment as enrollment_crud
+from app.crud import waitlist as waitlist_crud
+from app.db.database import SessionLocal
+from app.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+def unique_email(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}@example.com"
+
+
+def enrolled_students(course_id: int) -> list[int]:
+    resp = client.get(f"/enrollments/filter/?course_id={course_id}")
+    return sorted(row["student_id"] for row in resp.json())
+
+
+def test_waitlist_promotes_in_order():
+    student_ids = [
+        client.post(
+            "/students/", json={"name": "Queued", "email": unique_email("queue")}
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Queue", "email": unique_email("queueprof")}
+    ).json()["id"]
+    course = {"name": "Popular 101", "credits": 3, "capacity": 1}
+    course_id = client.post(
+        "/courses/", json={**course, "faculty_id": faculty_id}
+    ).json()["id"]
+
+    first = client.post(
+        "/enrollments/?waitlist=true",
+        json={"student_id": student_ids[0], "course_id": course_id},
+    )
+    assert first.status_code == 200
+    for student_id in student_ids[1:]:
+        queued = client.post(
+            "/enrollments/?waitlist=true",
+            json={"student_id": student_id, "course_id": course_id},
+        )
+        assert queued.status_code == 202
+        assert queued.json()["student_id"] == student_id
+    again = client.post(
+        "/enrollments/?waitlist=true",
+        json={"student_id": student_ids[2], "course_id": course_id},
+    )
+    assert again.status_code == 409
+    assert again.json()["detail"] == "Student is already on the waitlist for this course"
+
+    queue = client.get(f"/waitlist/course/{course_id}").json()
+    assert [entry["student_id"] for entry in queue] == student_ids[1:]
+
+    # Dropping hands the seat to the head of the queue.
+    client.delete(f"/enrollments/{first.json()['id']}", headers=auth_headers(client, "admin"))
+    assert enrolled_students(course_id) == [student_ids[1]]
+    queue = client.get(f"/waitlist/course/{course_id}").json()
+    assert [entry["student_id"] for entry in queue] == [student_ids[2]]
+    assert client.get(f"/courses/{course_id}").json()["enrolled_count"] == 1
+
+    # So does raising the capacity.
+    updated = client.put(
+        f"/courses/{course_id}",
+        json={**course, "capacity": 2, "faculty_id": faculty_id},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["enrolled_count"] == 2
+    assert enrolled_students(course_id) == student_ids[1:]
+    assert client.get(f"/waitlist/course/{course_id}").json() == []
+
+
+def test_leave_waitlist():
+    student_ids = [
+        client.post(
+            "/students/", json={"name": "Leaver", "email": unique_email("leave")}
+        ).json()["id"]
+        for _ in range(2)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Leave", "email": unique_email("leaveprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/",
+        json={"name": "Tiny 101", "credits": 3, "capacity": 1, "faculty_id": faculty_id},
+    ).json()["id"]
+    enrollment_id = client.post(
+        "/enrollments/", json={"student_id": student_ids[0], "course_id": course_id}
+    ).json()["id"]
+    entry = client.post(
+        "/enrollments/?waitlist=true",
+        json={"student_id": student_ids[1], "course_id": course_id},
+    ).json()
+
+    admin = auth_headers(client, "admin")
+    assert client.delete(f"/waitlist/{entry['id']}").status_code == 401
+    assert client.delete(f"/waitlist/{entry['id']}", headers=admin).status_code == 204
+    client.delete(f"/enrollments/{enrollment_id}", headers=admin)
+    assert enrolled_students(course_id) == []
+    assert client.get(f"/courses/{course_id}").json()["seats_remaining"] == 1
+
+
+def test_seat_freed_while_joining_goes_to_the_joiner(monkeypatch):
+    student_ids = [
+        client.post(
+            "/students/", json={"name": "Racer", "email": unique_email("racer")}
+        ).json()["id"]
+        for _ in range(2)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Racer", "email": unique_email("racerprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/",
+        json={"name": "Race 101", "credits": 3, "capacity": 1, "faculty_id": faculty_id},
+    ).json()["id"]
+    enrollment_id = client.post(
+        "/enrollments/", json={"student_id": student_ids[0], "course_id": course_id}
+    ).json()["id"]
+
+    join = waitlist_crud.join_waitlist
+
+    def drop_then_join(db, entry):
+        # The only enrolled student drops after this request's seat claim
+        # failed, while the queue is still empty.
+        with SessionLocal() as other:
+            enrollment_crud.delete_enrollment(
+                other, enrollment_crud.get_enrollment(other, enrollment_id)
+            )
+        return join(db, entry)
+
+    monkeypatch.setattr(waitlist_crud, "join_waitlist", drop_then_join)
+    resp = client.post(
+        "/enrollments/?waitlist=true",
+        json={"student_id": student_ids[1], "course_id": course_id},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["student_id"] == student_ids[1]
+    assert enrolled_students(course_id) == [student_ids[1]]
+    assert client.get(f"/waitlist/course/{course_id}").json() == []
+
+
+def test_deleted_students_are_not_promoted():
+    student_ids = [
+        client.post(
+            "/students/", json={"name": "Gone", "email": unique_email("gone")}
+        ).json()["id"]
+        for _ in range(2)
+    ]
+    faculty_id = client.post(
+        "/faculty/", json={"name": "Prof Gone", "email": unique_email("goneprof")}
+    ).json()["id"]
+    course_id = client.post(
+        "/courses/",
+        json={"name": "Gone 101", "credits": 3, "capacity": 1, "faculty_id": faculty_id},
+    ).json()["id"]
+    enrollment_id = client.post(
+        "/enrollments/", json={"student_id": student_ids[0], "course_id": course_id}
+    ).json()["id"]
+    client.post(
+        "/enrollments/?waitlist=true",
+        json={"student_id": student_ids[1], "course_id": course_id},
+    )
+    # An entry left behind by a student deleted before entries were cleaned up.
+    with SessionLocal() as db:
+        db.add(models.Waitlist(course_id=course_id, student_id=10**9, position=0))
+        db.commit()
+
+    admin = auth_headers(client, "admin")
+    deleted = client.delete(f"/students/{student_ids[1]}", headers=admin)
+    assert deleted.status_code == 204
+    queue = client.get(f"/waitlist/course/{course_id}").json()
+    assert [entry["student_id"] for entry in queue] == [10**9]
+
+    client.delete(f"/enrollments/{enrollment_id}", headers=admin)
+    assert enrolled_students(course_id) == []
+    assert client.get(f"/courses/{course_id}").json()["seats_remaining"] == 1